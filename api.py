@@ -0,0 +1,311 @@
+"""
+로컬 JSON API 서버: 환자 수 집계, 오믹스 조합 조회, Sample ID 리스트
+
+다른 내부 도구가 화면을 긁거나 Excel 파일을 요청하지 않고 직접 조회하도록 Streamlit 앱과 나란히 실행하는 HTTP 서버입니다.
+Streamlit 앱과 같은 core 엔진과 디스크 아티팩트(메모리 매핑 스냅샷, 조합 인덱스, 사전 계산 테이블)를 사용합니다.
+
+- 응답은 JSON(기본) 또는 Arrow IPC stream(?format=arrow 또는 Accept: application/vnd.apache.arrow.stream)
+- ETag는 데이터 버전 + 요청 경로/조건으로 정해지므로 데이터 파일이 바뀌기 전까지 같은 요청은 같은 ETag
+- If-None-Match가 현재 ETag와 같으면 데이터를 읽거나 계산하지 않고 304 응답
+
+엔드포인트 (GET):
+  /api/version                                   현재 데이터 버전
+  /api/counts?kind=cohort&name=PRISM[&Omics=SNP]  환자 수 집계 테이블 (kind: cohort, cohort_biologics, omics, combination)
+  /api/combination?project=PRISM&feature=SNP (Whole blood)[&feature=...][&patients=1]
+                                                 선택한 feature를 모두 가진 환자 수 (project, feature는 여러 번 지정 가능)
+  /api/sample-ids?project=PRISM[&patient_prefix=08-][&visit=Visit 1][&column=SNP (Whole blood)]
+                                                 Sample ID 리스트
+
+이름(name, project)이 데이터에 없으면 404, 파라미터가 잘못되었으면 400으로 응답합니다.
+인증이 없으므로 루프백 주소(127.0.0.1, localhost)에만 바인딩할 수 있습니다.
+
+사용 예:
+  python api.py --port 8502
+  curl -i "http://127.0.0.1:8502/api/counts?kind=cohort&name=PRISM"
+"""
+import argparse
+import hashlib
+import ipaddress
+import json
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pyarrow as pa
+
+from core.combination import compute_combination_index, format_feature, mask_to_patients, query_combination
+from core.datastore import (
+    SnapshotPublishError, get_current_pointer, get_data_version, load_or_build_artifact, load_or_build_report_table,
+    load_snapshot, read_current_data
+)
+from core.reports import filter_sample_id_pivot, get_sample_id_index_cols, list_report_jobs
+from core.settings import TIMING_LOG_FILE
+from core.timing import bind_context, start_timing_log
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+COUNT_KINDS = ["cohort", "cohort_biologics", "omics", "combination"]
+RESPONSE_CACHE_SIZE = 256
+
+
+class ApiError(Exception):
+    """잘못된 요청 (HTTP 상태 코드와 메시지)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+#############################################
+# 엔진 (데이터 버전별로 한 번만 로드)
+#############################################
+_engine = {"lock": threading.Lock(), "data_version": None, "df": None, "combination_index": None, "responses": OrderedDict()}
+
+
+def get_engine():
+    """현재 데이터 버전의 스냅샷과 응답 캐시. 데이터 파일이 바뀌면 새 버전을 열고 이전 응답 캐시는 버림"""
+    try:
+        pointer = get_current_pointer()
+    except SnapshotPublishError:
+        # 스냅샷을 저장하지 못했으면 원본을 직접 읽어 사용
+        pointer = {"data_version": get_data_version(), "source_sha256": None}
+    if pointer is None:
+        raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "데이터 파일이 없습니다.")
+    with _engine["lock"]:
+        if _engine["data_version"] != pointer["data_version"]:
+            if pointer["source_sha256"] is None:
+                df, data_version = read_current_data()
+            else:
+                df, data_version = load_snapshot(pointer["data_version"], pointer["source_sha256"]), pointer["data_version"]
+            _engine.update(
+                data_version=data_version,
+                df=df,
+                combination_index=None,
+                responses=OrderedDict(),
+            )
+        return _engine
+
+
+def get_combination_index(engine):
+    with engine["lock"]:
+        if engine["combination_index"] is None:
+            df = engine["df"]
+            engine["combination_index"] = load_or_build_artifact(
+                engine["data_version"], "combination_index", lambda: compute_combination_index(df)
+            )
+        return engine["combination_index"]
+
+
+#############################################
+# 엔드포인트
+#############################################
+def _one(params, key, required=True):
+    values = params.get(key, [])
+    if not values:
+        if required:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"'{key}' 파라미터가 필요합니다.")
+        return None
+    return values[-1]
+
+
+def handle_version(engine, params):
+    return {"data_version": engine["data_version"], "rows": len(engine["df"])}
+
+
+def handle_counts(engine, params):
+    kind = _one(params, "kind")
+    if kind not in COUNT_KINDS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"kind는 {', '.join(COUNT_KINDS)} 중 하나여야 합니다.")
+    name = _one(params, "name")
+    if (kind, name) not in list_report_jobs(engine["df"]):
+        raise ApiError(HTTPStatus.NOT_FOUND, f"데이터에 없는 이름입니다: {name}")
+    table = load_or_build_report_table(engine["df"], engine["data_version"], kind, name)
+    # 나머지 파라미터는 테이블 컬럼 값 필터 (예: Omics=SNP)
+    for column, values in params.items():
+        if column in ("kind", "name", "format"):
+            continue
+        if column not in table.columns:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"알 수 없는 필터 컬럼입니다: {column}")
+        table = table[table[column].astype(str).isin(values)]
+    return table
+
+
+def handle_combination(engine, params):
+    projects = params.get("project", [])
+    labels = params.get("feature", [])
+    if not projects or not labels:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "'project'와 'feature' 파라미터가 필요합니다.")
+    index = get_combination_index(engine)
+    unknown = [project for project in projects if project not in index["project_masks"]]
+    if unknown:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"데이터에 없는 프로젝트입니다: {', '.join(unknown)}")
+    feature_ids = {format_feature(feature): i for i, feature in enumerate(index["features"])}
+    unknown = [label for label in labels if label not in feature_ids]
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"알 수 없는 feature입니다: {', '.join(unknown)}")
+    result = query_combination(index, [feature_ids[label] for label in labels], projects)
+    response = {"projects": projects, "features": labels, "total": result["total"], "by_project": result["by_project"]}
+    if _one(params, "patients", required=False) in ("1", "true"):
+        response["patients"] = [{"Project": project, "PatientID": patient} for project, patient in mask_to_patients(index, result["mask"])]
+    return response
+
+
+def handle_sample_ids(engine, params):
+    project = _one(params, "project")
+    if ("sample_id", project) not in list_report_jobs(engine["df"]):
+        raise ApiError(HTTPStatus.NOT_FOUND, f"데이터에 없는 프로젝트입니다: {project}")
+    index_cols = get_sample_id_index_cols(project)
+    pivot = load_or_build_report_table(engine["df"], engine["data_version"], "sample_id", project)
+    columns = params.get("column", [])
+    unknown = [column for column in columns if column not in pivot.columns]
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"알 수 없는 컬럼입니다: {', '.join(unknown)}")
+    return filter_sample_id_pivot(
+        pivot, index_cols, patient_prefix=_one(params, "patient_prefix", required=False) or "",
+        visits=params.get("visit"), columns=columns
+    )
+
+
+ROUTES = {
+    "/api/version": handle_version,
+    "/api/counts": handle_counts,
+    "/api/combination": handle_combination,
+    "/api/sample-ids": handle_sample_ids,
+}
+
+
+#############################################
+# 응답 인코딩
+#############################################
+def encode_result(result, fmt):
+    """(본문 bytes, Content-Type). DataFrame은 JSON 레코드 배열 또는 Arrow IPC stream"""
+    if fmt == "arrow":
+        if isinstance(result, dict):
+            raise ApiError(HTTPStatus.NOT_ACCEPTABLE, "이 엔드포인트는 JSON으로만 응답합니다.")
+        table = pa.Table.from_pandas(result.reset_index(drop=True), preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), ARROW_MIME
+    if isinstance(result, dict):
+        body = json.dumps(result, ensure_ascii=False, default=str)
+    else:
+        body = result.to_json(orient="records", date_format="iso", force_ascii=False)
+    return body.encode("utf-8"), "application/json; charset=utf-8"
+
+
+def make_etag(data_version, path, params, fmt):
+    """데이터 버전 + 경로 + 정렬된 파라미터 + 형식으로 정해지는 ETag"""
+    request_key = json.dumps([path, sorted((k, sorted(v)) for k, v in params.items()), fmt], ensure_ascii=False)
+    return f'"{data_version}-{hashlib.sha256(request_key.encode()).hexdigest()[:16]}"'
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "OmicsDataAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        handler = ROUTES.get(url.path.rstrip("/"))
+        if handler is None:
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": f"없는 경로입니다: {url.path}"})
+        params = {}
+        for key, value in parse_qsl(url.query, keep_blank_values=True):
+            params.setdefault(key, []).append(value)
+        fmt = "arrow" if _one(params, "format", required=False) == "arrow" or ARROW_MIME in self.headers.get("Accept", "") else "json"
+
+        try:
+            # 데이터 버전은 파일 (mtime, size) 기준 캐시된 해시이므로 304 판단에는 데이터를 읽지 않음
+            data_version = get_data_version()
+            if data_version is None:
+                raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "데이터 파일이 없습니다.")
+            etag = make_etag(data_version, url.path.rstrip("/"), params, fmt)
+            if _etag_matches(self.headers.get("If-None-Match"), etag):
+                return self._send(HTTPStatus.NOT_MODIFIED, None, None, etag)
+
+            engine = get_engine()
+            bind_context(session="api", data_version=engine["data_version"])
+            etag = make_etag(engine["data_version"], url.path.rstrip("/"), params, fmt)
+            with engine["lock"]:
+                cached = engine["responses"].get(etag)
+                if cached is not None:
+                    engine["responses"].move_to_end(etag)
+            if cached is None:
+                cached = encode_result(handler(engine, params), fmt)
+                with engine["lock"]:
+                    engine["responses"][etag] = cached
+                    while len(engine["responses"]) > RESPONSE_CACHE_SIZE:
+                        engine["responses"].popitem(last=False)
+            body, content_type = cached
+            self._send(HTTPStatus.OK, body, content_type, etag)
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _send(self, status, body, content_type, etag=None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            # 캐시해도 되지만 사용할 때마다 ETag로 다시 확인
+            self.send_header("Cache-Control", "no-cache")
+        if body is not None:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def _send_json(self, status, obj):
+        self._send(status, json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def log_message(self, format, *args):
+        # 요청마다 표준 오류에 쓰지 않음
+        pass
+
+
+def is_loopback(host):
+    """localhost 또는 127.0.0.0/8 주소인지 (서버는 IPv4로만 바인딩)"""
+    try:
+        return host == "localhost" or ipaddress.IPv4Address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def create_server(host="127.0.0.1", port=8502):
+    """
+    서버 객체 생성 (port=0이면 빈 포트 사용, server.server_address로 확인). serve_forever()로 실행
+    인증 없이 Sample ID/환자 ID를 응답하므로 루프백이 아닌 주소이면 ValueError
+    """
+    if not is_loopback(host):
+        raise ValueError(f"인증이 없는 API이므로 루프백 주소(127.0.0.1, localhost)에만 바인딩할 수 있습니다: {host}")
+    return ThreadingHTTPServer((host, port), ApiHandler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오믹스 데이터 현황 로컬 JSON API 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩 주소 (기본: 127.0.0.1). 루프백 주소만 허용")
+    parser.add_argument("--port", type=int, default=8502, help="포트 (기본: 8502)")
+    args = parser.parse_args(argv)
+    if not is_loopback(args.host):
+        parser.error(f"인증이 없는 API이므로 루프백 주소(127.0.0.1, localhost)에만 바인딩할 수 있습니다: {args.host}")
+    start_timing_log(TIMING_LOG_FILE)
+    server = create_server(args.host, args.port)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
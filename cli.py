@@ -0,0 +1,211 @@
+"""
+명령줄 도구: Streamlit 없이 데이터 파일의 유효성 검사, 환자 수 집계, Sample ID 리스트 내보내기
+
+app.py와 같은 core 패키지 모듈(data_loader, validation_rules, reports)을 사용하므로 화면과 같은 결과를 냅니다.
+결과는 표준 출력에 JSON으로 쓰고, 종료 코드로 성공 여부를 알립니다.
+  0: 성공 (validate는 오류 레코드 없음)
+  1: validate에서 오류 레코드 발견, verify-artifacts에서 손상되었거나 원본과 맞지 않는 아티팩트 발견
+  2: 잘못된 인자, 파일을 읽을 수 없음(손상된 파일 포함), 필수 컬럼 누락
+
+사용 예:
+  python cli.py validate data/clinical_data.xlsx
+  python cli.py validate lims_export.csv --config config.json --details 20 --valid-output valid.parquet
+  python cli.py counts data/clinical_data.xlsx --kind cohort --name PRISM
+  python cli.py sample-ids data/clinical_data.xlsx --project PRISM --output PRISM_Sample_ID.xlsx
+  python cli.py export data/clinical_data.xlsx --output export_all.zip --format csv
+  python cli.py verify-artifacts
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from core.artifacts import list_artifacts, read_artifact_meta, read_version_pointer, verify_artifact
+from core.data_loader import read_data_file
+from core.reports import (
+    EXPORT_FORMATS, encode_dataframe, list_report_jobs, select_report_rows,
+    build_report_table, build_sample_id_pivot, get_sample_id_index_cols, build_report_bundle
+)
+from core.settings import ARTIFACT_DIR
+from core.validation_rules import load_rules, rules_key, validate
+
+EXIT_OK = 0
+EXIT_INVALID = 1
+EXIT_ERROR = 2
+
+CHECKS = ["invalid_visit", "invalid_omics_tissue", "invalid_project", "duplicate_data", "invalid_biologics"]
+
+
+def _records(df, limit=None):
+    """DataFrame을 JSON으로 쓸 수 있는 레코드 목록으로 변환 (날짜는 ISO 문자열, NaN은 null)"""
+    if limit is not None:
+        df = df.head(limit)
+    return json.loads(df.to_json(orient="records", date_format="iso", force_ascii=False))
+
+
+def _format_for(path, fmt):
+    """--format이 없으면 출력 파일 확장자로 형식 결정"""
+    if fmt:
+        return fmt
+    for name, info in sorted(EXPORT_FORMATS.items(), key=lambda item: -len(item[1]["ext"])):
+        if path.lower().endswith("." + info["ext"]):
+            return name
+    raise ValueError(f"출력 형식을 알 수 없습니다: {path} (--format으로 지정)")
+
+
+def _load(args):
+    started = time.perf_counter()
+    df = read_data_file(args.file)
+    return df, round(time.perf_counter() - started, 3)
+
+
+def cmd_validate(args):
+    df, read_seconds = _load(args)
+    rules = load_rules(args.config)
+    started = time.perf_counter()
+    report = validate(df, rules)
+    result = {
+        "file": args.file,
+        "rows": len(df),
+        "rules_version": rules["version"],
+        "rules_key": rules_key(rules),
+        "checks": {name: len(report[name]) for name in CHECKS},
+        "valid_rows": len(report["valid"]),
+        "read_seconds": read_seconds,
+        "validate_seconds": round(time.perf_counter() - started, 3),
+    }
+    result["ok"] = not any(result["checks"].values())
+    if args.details:
+        result["details"] = {name: _records(report[name], args.details) for name in CHECKS if len(report[name])}
+    if args.valid_output:
+        encode_dataframe(report["valid"], _format_for(args.valid_output, args.format), args.valid_output)
+        result["valid_output"] = args.valid_output
+    return result, EXIT_OK if result["ok"] else EXIT_INVALID
+
+
+def _valid_subset(df, args):
+    """--valid-only이면 유효성 검사를 통과한 행만 사용"""
+    return validate(df, load_rules(args.config))["valid"] if args.valid_only else df
+
+
+def cmd_counts(args):
+    df, read_seconds = _load(args)
+    df = _valid_subset(df, args)
+    jobs = [
+        (kind, name) for kind, name in list_report_jobs(df)
+        if kind != "sample_id" and (args.kind is None or kind == args.kind) and (args.name is None or name == args.name)
+    ]
+    if not jobs:
+        raise ValueError("조건에 맞는 집계 테이블이 없습니다.")
+    tables = [
+        {"kind": kind, "name": name, "rows": _records(build_report_table(kind, name, select_report_rows(df, kind, name)))}
+        for kind, name in jobs
+    ]
+    return {"file": args.file, "rows": len(df), "read_seconds": read_seconds, "tables": tables}, EXIT_OK
+
+
+def cmd_sample_ids(args):
+    df, read_seconds = _load(args)
+    df = _valid_subset(df, args)
+    project_df = df[df["Project"] == args.project]
+    if project_df.empty:
+        raise ValueError(f"프로젝트 '{args.project}'의 데이터가 없습니다.")
+    table = build_sample_id_pivot(project_df, get_sample_id_index_cols(args.project))
+    result = {"file": args.file, "project": args.project, "read_seconds": read_seconds, "table_rows": len(table)}
+    if args.output:
+        encode_dataframe(table, _format_for(args.output, args.format), args.output)
+        result["output"] = args.output
+    else:
+        result["rows"] = _records(table)
+    return result, EXIT_OK
+
+
+def cmd_export(args):
+    df, read_seconds = _load(args)
+    df = _valid_subset(df, args)
+    fmt = args.format or "xlsx"
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    entries = build_report_bundle(df, args.output, fmt=fmt, max_workers=args.workers)
+    files = sorted(entries, key=lambda entry: entry["file"])
+    return {"file": args.file, "output": args.output, "format": fmt, "read_seconds": read_seconds, "files": files}, EXIT_OK
+
+
+def cmd_verify_artifacts(args):
+    """게시된 데이터 버전의 모든 아티팩트 파일 전체 해시를 메타 정보와 비교"""
+    started = time.perf_counter()
+    pointer = read_version_pointer(args.artifact_dir)
+    if pointer is None:
+        raise ValueError(f"게시된 데이터 버전이 없습니다: {args.artifact_dir}")
+    artifact_dir = os.path.join(args.artifact_dir, pointer["data_version"])
+    artifacts = []
+    for name in list_artifacts(artifact_dir):
+        meta = read_artifact_meta(artifact_dir, name) or {}
+        artifacts.append({
+            "name": name,
+            "ok": verify_artifact(artifact_dir, name, pointer["source_sha256"], full=True) is not None,
+            "bytes": sum(entry["size"] for entry in meta.get("files", [])),
+        })
+    result = {
+        "data_version": pointer["data_version"],
+        "artifacts": artifacts,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    return result, EXIT_OK if all(artifact["ok"] for artifact in artifacts) else EXIT_INVALID
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="임상 데이터 파일 유효성 검사 및 집계 (Streamlit 불필요)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub, valid_only=True):
+        sub.add_argument("file", help="데이터 파일 (.xlsx, .csv, .parquet, .feather)")
+        sub.add_argument("--config", default="config.json", help="유효성 검사 규칙이 저장된 설정 파일 (기본: config.json)")
+        sub.add_argument("--format", choices=list(EXPORT_FORMATS), help="출력 파일 형식 (기본: 확장자로 결정)")
+        if valid_only:
+            sub.add_argument("--valid-only", action="store_true", help="유효성 검사를 통과한 행만 사용")
+
+    sub = subparsers.add_parser("validate", help="유효성 검사 (오류가 있으면 종료 코드 1)")
+    add_common(sub, valid_only=False)
+    sub.add_argument("--details", type=int, default=0, metavar="N", help="항목별 오류 레코드를 최대 N개 포함")
+    sub.add_argument("--valid-output", help="유효한 행을 저장할 파일")
+    sub.set_defaults(func=cmd_validate)
+
+    sub = subparsers.add_parser("counts", help="코호트별/오믹스별 환자 수, 오믹스 조합 집계")
+    add_common(sub)
+    sub.add_argument("--kind", choices=["cohort", "cohort_biologics", "omics", "combination"], help="테이블 종류 (기본: 전체)")
+    sub.add_argument("--name", help="프로젝트 또는 오믹스 이름 (기본: 전체)")
+    sub.set_defaults(func=cmd_counts)
+
+    sub = subparsers.add_parser("sample-ids", help="프로젝트별 Sample ID 리스트")
+    add_common(sub)
+    sub.add_argument("--project", required=True, help="프로젝트 (예: PRISM)")
+    sub.add_argument("--output", help="저장할 파일 (없으면 JSON으로 출력)")
+    sub.set_defaults(func=cmd_sample_ids)
+
+    sub = subparsers.add_parser("export", help="전체 집계 테이블과 Sample ID 리스트를 zip으로 내보내기")
+    add_common(sub)
+    sub.add_argument("--output", required=True, help="zip 파일 경로")
+    sub.add_argument("--workers", type=int, help="작업자 프로세스 수 (기본: CPU 수)")
+    sub.set_defaults(func=cmd_export)
+
+    sub = subparsers.add_parser("verify-artifacts", help="게시된 아티팩트 파일 전체 해시 확인 (손상되면 종료 코드 1)")
+    sub.add_argument("--artifact-dir", default=ARTIFACT_DIR, help=f"아티팩트 디렉토리 (기본: {ARTIFACT_DIR})")
+    sub.set_defaults(func=cmd_verify_artifacts)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        result, code = args.func(args)
+    except Exception as e:
+        # 손상된 파일(zipfile.BadZipFile 등) 포함 읽기/처리 실패는 모두 JSON 오류와 종료 코드 2
+        result, code = {"error": str(e), "type": type(e).__name__}, EXIT_ERROR
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2, default=str)
+    sys.stdout.write("\n")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+데이터 엔진: 데이터 파일 읽기, 유효성 검사, 집계, 내보내기, 사전 계산
+
+Streamlit에 의존하지 않으므로 웹 화면(app.py, views), 명령줄 도구(cli.py), 작업자 프로세스에서 같은 코드를 사용합니다.
+무거운 모듈을 필요할 때만 읽도록 여기서는 하위 모듈을 import 하지 않습니다.
+"""
@@ -0,0 +1,233 @@
+"""
+데이터 버전별 파생 결과(아티팩트) 저장소
+
+데이터 스냅샷, 유효성 검사 결과, 조합/검색 인덱스 등 원본 Excel에서 계산한 결과를
+data/artifacts/<data_version>/ 아래에 저장해 두고, 프로세스 재시작 후에도 다시 계산하지 않고 읽습니다.
+각 아티팩트 옆의 <name>.meta.json에 원본 파일 해시와 아티팩트 파일의 크기/수정 시각/해시를 저장 시 한 번 기록하고,
+읽을 때는 크기와 수정 시각만 비교합니다. 파일 전체 해시는 야간 사전 계산과 cli.py verify-artifacts에서 확인합니다.
+
+DataFrame은 Arrow IPC 파일, 숫자 배열은 .npy로 저장하고 메모리 매핑으로 읽으므로
+같은 호스트의 여러 Streamlit 프로세스가 페이지 캐시의 한 복사본을 공유합니다.
+그 외 값(조합 인덱스의 환자 bitset, 검색 인덱스의 키 사전 등)은 pickle로 저장되어 프로세스마다 따로 읽습니다.
+현재 게시된 버전은 CURRENT.json 포인터 파일이 가리키며, 게시는 파일 잠금 아래에서 포인터 교체로 끝납니다.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 아티팩트 저장 방식이 바뀌면 올려서 이전 결과를 무효화
+ARTIFACT_SCHEMA_VERSION = 2
+POINTER_FILE = "CURRENT.json"
+LOCK_FILE = ".publish.lock"
+
+
+def file_sha256(path):
+    """파일 전체 sha256 (16진수 문자열)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _is_mappable_array(value):
+    return isinstance(value, np.ndarray) and value.dtype != object
+
+
+def _write_arrow(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_arrow(path):
+    # 메모리 매핑된 버퍼를 그대로 사용. split_blocks=True이면 컬럼마다 블록을 따로 두어 결측값이 없는 숫자/날짜 컬럼은 복사하지 않고
+    # (기본값은 같은 dtype 컬럼을 한 블록으로 합치며 복사), 문자열 컬럼은 pandas 3부터 Arrow 기반이라 복사하지 않음 (requirements.txt에서 pandas>=3).
+    # 결측값이 있는 숫자/날짜 컬럼(예: 변환에 실패한 Date)은 NaN/NaT로 채우며 복사됩니다.
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all().to_pandas(split_blocks=True)
+
+
+def save_artifact(artifact_dir, name, obj, source_sha256):
+    """
+    obj를 artifact_dir/name으로 저장합니다.
+    - DataFrame: name.arrow (Arrow IPC)
+    - 숫자 ndarray를 값으로 가진 dict: 배열은 name.<key>.npy, 나머지는 name.pkl
+    - 그 외: name.pkl (pickle)
+    모든 파일을 임시 이름으로 쓴 뒤 교체하고, 마지막으로 메타 파일을 교체하므로 읽는 쪽은 완성된 결과만 봅니다.
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    written = []
+
+    def write(file_name, key, writer):
+        tmp_path = os.path.join(artifact_dir, file_name + suffix)
+        writer(tmp_path)
+        written.append((file_name, key, tmp_path))
+
+    try:
+        if isinstance(obj, pd.DataFrame):
+            fmt = "arrow"
+            write(f"{name}.arrow", None, lambda path: _write_arrow(obj, path))
+        elif isinstance(obj, dict) and any(_is_mappable_array(value) for value in obj.values()):
+            fmt = "bundle"
+            rest = {key: value for key, value in obj.items() if not _is_mappable_array(value)}
+            write(f"{name}.pkl", None, lambda path: _dump_pickle(rest, path))
+            for key, value in obj.items():
+                if _is_mappable_array(value):
+                    # np.save는 확장자가 없으면 .npy를 붙이므로 파일 객체로 기록
+                    write(f"{name}.{key}.npy", key, lambda path, value=value: _save_npy(value, path))
+        else:
+            fmt = "pickle"
+            write(f"{name}.pkl", None, lambda path: _dump_pickle(obj, path))
+
+        meta = {
+            "name": name,
+            "format": fmt,
+            "files": [
+                {
+                    "file": file_name, "key": key, "size": os.path.getsize(tmp_path),
+                    # 이름 교체(os.replace)는 수정 시각을 바꾸지 않으므로 임시 파일의 값을 기록
+                    "mtime_ns": os.stat(tmp_path).st_mtime_ns, "sha256": file_sha256(tmp_path)
+                }
+                for file_name, key, tmp_path in written
+            ],
+            "source_sha256": source_sha256,
+            "schema_version": ARTIFACT_SCHEMA_VERSION,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        meta_path = os.path.join(artifact_dir, f"{name}.meta.json")
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        written.append((f"{name}.meta.json", None, meta_path + suffix))
+
+        for file_name, _, tmp_path in written:
+            os.replace(tmp_path, os.path.join(artifact_dir, file_name))
+        return meta
+    finally:
+        for _, _, tmp_path in written:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def _dump_pickle(obj, path):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _save_npy(array, path):
+    with open(path, "wb") as f:
+        np.save(f, array)
+
+
+def read_artifact_meta(artifact_dir, name):
+    """메타 정보. 없으면 None"""
+    meta_path = os.path.join(artifact_dir, f"{name}.meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def verify_artifact(artifact_dir, name, source_sha256, full=False):
+    """
+    원본 해시, 스키마 버전, 각 파일의 크기와 수정 시각이 메타 정보와 모두 일치하면 메타 정보를 반환하고,
+    하나라도 다르면 None을 반환합니다. 수정 시각이 다르거나(복사 등) full=True이면 파일 전체 sha256을 비교합니다.
+    """
+    meta = read_artifact_meta(artifact_dir, name)
+    if meta is None:
+        return None
+    if meta.get("source_sha256") != source_sha256 or meta.get("schema_version") != ARTIFACT_SCHEMA_VERSION:
+        return None
+    for entry in meta["files"]:
+        file_path = os.path.join(artifact_dir, entry["file"])
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if stat.st_size != entry["size"]:
+            return None
+        if (full or stat.st_mtime_ns != entry.get("mtime_ns")) and file_sha256(file_path) != entry["sha256"]:
+            return None
+    return meta
+
+
+def list_artifacts(artifact_dir):
+    """디렉토리에 메타 파일이 있는 아티팩트 이름 목록"""
+    if not os.path.isdir(artifact_dir):
+        return []
+    return sorted(file_name[:-len(".meta.json")] for file_name in os.listdir(artifact_dir) if file_name.endswith(".meta.json"))
+
+
+def load_artifact(artifact_dir, name, source_sha256):
+    """무결성 확인을 통과한 아티팩트를 읽습니다 (Arrow/.npy는 메모리 매핑). 없거나 손상/불일치이면 None"""
+    meta = verify_artifact(artifact_dir, name, source_sha256)
+    if meta is None:
+        return None
+    try:
+        paths = {entry["key"]: os.path.join(artifact_dir, entry["file"]) for entry in meta["files"]}
+        if meta["format"] == "arrow":
+            return _read_arrow(paths[None])
+        with open(paths.pop(None), "rb") as f:
+            obj = pickle.load(f)
+        for key, path in paths.items():
+            obj[key] = np.load(path, mmap_mode="r")
+        return obj
+    except Exception:
+        return None
+
+
+#############################################
+# 버전 포인터 (게시된 스냅샷 교체)
+#############################################
+@contextlib.contextmanager
+def publish_lock(root):
+    """같은 호스트의 프로세스 사이에서 게시 작업을 직렬화하는 파일 잠금"""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def read_version_pointer(root):
+    """현재 게시된 버전 {"data_version", "source_sha256", "published_at"}. 없으면 None"""
+    try:
+        with open(os.path.join(root, POINTER_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_version_pointer(root, data_version, source_sha256):
+    """포인터 파일을 원자적으로 교체하여 새 버전을 게시"""
+    pointer = {
+        "data_version": data_version,
+        "source_sha256": source_sha256,
+        "published_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    path = os.path.join(root, POINTER_FILE)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pointer, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return pointer
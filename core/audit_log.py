@@ -0,0 +1,182 @@
+"""
+비동기 감사(접근) 로그
+
+페이지 조회, 파일 내보내기, 데이터 업로드, 사용자 변경 등의 이벤트를 메모리 큐에 넣기만 하고
+(화면 갱신을 막지 않음) 백그라운드 스레드가 모아서 파일에 기록합니다.
+- JSONL(기본): 크기가 max_bytes를 넘으면 audit.jsonl -> audit.jsonl.1 -> ... 순으로 회전
+  (크기 확인, 회전, 추가를 audit.jsonl.lock 파일 잠금 아래에서 하므로 여러 프로세스가 같은 파일에 기록해도 됨)
+- SQLite: 경로 확장자가 .db/.sqlite이면 events 테이블에 기록
+큐 크기가 max_queue를 넘으면 새 이벤트는 버리고 개수만 셉니다 (메모리 상한).
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def _is_sqlite(path):
+    return path.endswith((".db", ".sqlite"))
+
+
+def start_audit_writer(path, max_queue=10000, flush_interval=1.0, max_bytes=10 * 1024 * 1024, backup_count=5):
+    """백그라운드 기록 스레드를 시작하고 writer 상태 dict를 반환합니다. log_event에 넘겨 사용합니다."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer = {
+        "path": path,
+        "queue": queue.Queue(maxsize=max_queue),
+        "dropped": 0,
+        "written": 0,
+        "flush_interval": flush_interval,
+        "max_bytes": max_bytes,
+        "backup_count": backup_count,
+        "lock": threading.Lock(),
+    }
+    threading.Thread(target=_writer_loop, args=(writer,), daemon=True).start()
+    atexit.register(flush_events, writer)
+    return writer
+
+
+def log_event(writer, event):
+    """이벤트(dict)를 큐에 추가. 큐가 가득 차면 버리고 dropped만 증가"""
+    try:
+        writer["queue"].put_nowait(event)
+    except queue.Full:
+        with writer["lock"]:
+            writer["dropped"] += 1
+
+
+def _drain(writer):
+    events = []
+    while True:
+        try:
+            events.append(writer["queue"].get_nowait())
+        except queue.Empty:
+            return events
+
+
+def flush_events(writer):
+    """큐에 쌓인 이벤트를 즉시 기록. 기록에 실패한 이벤트는 dropped로 셉니다."""
+    with writer["lock"]:
+        events = _drain(writer)
+        if not events:
+            return
+        try:
+            if _is_sqlite(writer["path"]):
+                _write_sqlite(writer["path"], events)
+            else:
+                _write_jsonl(writer, events)
+            writer["written"] += len(events)
+        except (OSError, sqlite3.Error):
+            writer["dropped"] += len(events)
+
+
+def _writer_loop(writer):
+    while True:
+        # flush_interval 동안 모인 이벤트를 한 번에 기록
+        time.sleep(writer["flush_interval"])
+        flush_events(writer)
+
+
+#############################################
+# 백엔드별 기록
+#############################################
+@contextmanager
+def _file_lock(path):
+    """같은 호스트의 프로세스 사이에서 로그 파일 회전/추가를 직렬화하는 파일 잠금 (path.lock)"""
+    with open(f"{path}.lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _rotate(path, backup_count):
+    for i in range(backup_count - 1, 0, -1):
+        if os.path.exists(f"{path}.{i}"):
+            os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
+
+
+def _write_jsonl(writer, events):
+    path = writer["path"]
+    lines = "".join(json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in events)
+    # 다른 프로세스가 먼저 회전했으면 잠금을 얻은 뒤의 크기로 다시 판단
+    with _file_lock(path):
+        if os.path.exists(path) and os.path.getsize(path) >= writer["max_bytes"]:
+            _rotate(path, writer["backup_count"])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("CREATE TABLE IF NOT EXISTS events (ts TEXT, user TEXT, action TEXT, detail TEXT)")
+    return conn
+
+
+def _write_sqlite(path, events):
+    with closing(_connect(path)) as conn, conn:
+        conn.executemany(
+            "INSERT INTO events (ts, user, action, detail) VALUES (?, ?, ?, ?)",
+            [
+                (event.get("ts"), event.get("user"), event.get("action"),
+                 json.dumps({k: v for k, v in event.items() if k not in ("ts", "user", "action")}, ensure_ascii=False, default=str))
+                for event in events
+            ]
+        )
+
+
+#############################################
+# 조회
+#############################################
+def read_events(path, limit=1000, user=None, action=None, text=None):
+    """
+    최근 이벤트부터 최대 limit개 반환. user/action은 일치, text는 이벤트 JSON에 포함된 문자열로 필터링합니다.
+    JSONL은 회전된 파일(.1, .2, ...)까지 최신 순으로 읽습니다.
+    """
+    def match(event, raw):
+        return ((user is None or event.get("user") == user)
+                and (action is None or event.get("action") == action)
+                and (not text or text.lower() in raw.lower()))
+
+    events = []
+    if _is_sqlite(path):
+        if not os.path.exists(path):
+            return events
+        with closing(_connect(path)) as conn:
+            for ts, event_user, event_action, detail in conn.execute("SELECT ts, user, action, detail FROM events ORDER BY rowid DESC"):
+                event = {"ts": ts, "user": event_user, "action": event_action, **json.loads(detail)}
+                if match(event, f"{event_user} {event_action} {detail}"):
+                    events.append(event)
+                    if len(events) >= limit:
+                        break
+        return events
+
+    files = [path] + [f"{path}.{i}" for i in range(1, 100) if os.path.exists(f"{path}.{i}")]
+    for file_path in files:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        for raw in reversed(lines):
+            try:
+                event = json.loads(raw)
+            except ValueError:
+                continue
+            if match(event, raw):
+                events.append(event)
+                if len(events) >= limit:
+                    return events
+    return events
@@ -0,0 +1,251 @@
+"""
+오믹스 조합 인덱스 (환자 bitset)와 조합 검색
+"""
+import heapq
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.timing import timing_span
+
+
+def _positions_to_mask(positions, n_bits):
+    """환자 위치 배열을 하나의 정수 bitset으로 변환"""
+    bits = np.zeros(n_bits, dtype=bool)
+    bits[positions] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def compute_combination_index(df):
+    """
+    (Omics, Tissue) feature별로 해당 샘플을 가진 환자 집합을 bitset(int)으로 저장합니다.
+    환자는 (Project, PatientID) 순으로 정렬되어 있어 각 프로젝트는 연속된 bit 구간을 차지합니다.
+    """
+    with timing_span("cube", kind="combination_index", rows=len(df)) as span:
+        index = _compute_combination_index(df)
+        span["patients"] = len(index["patients"])
+    return index
+
+
+def _compute_combination_index(df):
+    pairs = df[["Project", "PatientID", "Omics", "Tissue"]].drop_duplicates()
+    patient_keys = pairs["Project"] + "\x1f" + pairs["PatientID"]
+    patient_cat = pd.Categorical(patient_keys)
+    n_patients = len(patient_cat.categories)
+    pairs = pairs.assign(_pos=patient_cat.codes)
+
+    features = []
+    masks = []
+    signatures = np.zeros(n_patients, dtype=np.int64)
+    for (omics, tissue), positions in pairs.groupby(["Omics", "Tissue"])["_pos"]:
+        positions = np.unique(positions.to_numpy())
+        if len(features) == 63:
+            signatures = signatures.astype(object)
+        signatures[positions] |= 1 << len(features)
+        features.append((omics, tissue))
+        masks.append(_positions_to_mask(positions, n_patients))
+
+    # 프로젝트별 bit 구간 [start, stop)과 구간 마스크
+    patients = [tuple(key.split("\x1f", 1)) for key in patient_cat.categories]
+    project_names, starts, sizes = np.unique(
+        np.array([project for project, _ in patients], dtype=object), return_index=True, return_counts=True
+    )
+    project_bounds = {}
+    project_masks = {}
+    for project, start, size in zip(project_names, starts.tolist(), sizes.tolist()):
+        project_bounds[project] = (start, start + size)
+        project_masks[project] = ((1 << size) - 1) << start
+
+    return {
+        "patients": patients,
+        "features": features,
+        "masks": masks,
+        "signatures": signatures,
+        "project_bounds": project_bounds,
+        "project_masks": project_masks,
+    }
+
+
+def format_feature(feature):
+    """(Omics, Tissue) feature를 "Omics (Tissue)" 형태의 라벨로 변환"""
+    return f"{feature[0]} ({feature[1]})"
+
+
+def get_scope_mask(index, projects):
+    """프로젝트 하나 또는 여러 프로젝트의 bit 구간을 합친 마스크 반환"""
+    if isinstance(projects, str):
+        projects = [projects]
+    scope = 0
+    for project in projects:
+        scope |= index["project_masks"].get(project, 0)
+    return scope
+
+
+def mask_to_patients(index, mask):
+    """bitset에 포함된 환자를 (Project, PatientID) 리스트로 변환"""
+    n_patients = len(index["patients"])
+    packed = np.frombuffer(mask.to_bytes((n_patients + 7) // 8, "little"), dtype=np.uint8)
+    positions = np.flatnonzero(np.unpackbits(packed, bitorder="little")[:n_patients])
+    return [index["patients"][pos] for pos in positions]
+
+
+def query_combination(index, feature_ids, projects):
+    """
+    선택한 feature를 모두 가진 환자를 여러 프로젝트에 걸쳐 한 번에 계산합니다.
+    반환값: {"mask": 환자 bitset, "total": 통합 환자 수, "by_project": {project: 환자 수}}
+    """
+    if isinstance(projects, str):
+        projects = [projects]
+    result = get_scope_mask(index, projects)
+    for i in feature_ids:
+        result &= index["masks"][i]
+    by_project = {
+        project: (result & index["project_masks"][project]).bit_count()
+        for project in projects
+        if project in index["project_masks"]
+    }
+    return {"mask": result, "total": result.bit_count(), "by_project": by_project}
+
+
+def get_top_intersections(index, projects, top_k=15, min_degree=1, mode="inclusive"):
+    """
+    프로젝트(하나 또는 여러 개) 내 (Omics, Tissue) feature 조합 중 환자 수 상위 top_k개를 반환합니다.
+    mode="inclusive": 조합의 모든 feature를 가진 환자 수 (다른 feature 보유 여부 무관)
+    mode="exact": 정확히 해당 feature 조합만 가진 환자 수
+    반환값: [(환자 수, (feature index, ...)), ...] 환자 수 내림차순
+    """
+    scope = get_scope_mask(index, projects)
+    candidates = [
+        (i, mask & scope)
+        for i, mask in enumerate(index["masks"])
+        if mask & scope
+    ]
+    if not candidates:
+        return []
+
+    if mode == "exact":
+        # 동일한 feature signature를 가진 환자 수 집계
+        if isinstance(projects, str):
+            projects = [projects]
+        bounds = [index["project_bounds"][project] for project in projects if project in index["project_bounds"]]
+        signatures, counts = np.unique(
+            np.concatenate([index["signatures"][start:stop] for start, stop in bounds]), return_counts=True
+        )
+        results = []
+        for signature, count in zip(signatures.tolist(), counts.tolist()):
+            members = tuple(i for i, _ in candidates if signature >> i & 1)
+            if len(members) >= min_degree:
+                results.append((count, members))
+        results.sort(key=lambda x: (-x[0], len(x[1]), x[1]))
+        return results[:top_k]
+
+    # inclusive: 환자 수가 큰 feature부터 깊이 우선 탐색
+    # 교집합 크기는 feature가 늘어날수록 줄어들기 때문에 현재 k번째 값보다 작아지면 가지치기
+    candidates.sort(key=lambda x: -x[1].bit_count())
+    heap = []
+
+    def visit(start, members, current):
+        for pos in range(start, len(candidates)):
+            i, mask = candidates[pos]
+            combined = current & mask if members else mask
+            count = combined.bit_count()
+            if count == 0:
+                continue
+            if len(heap) >= top_k and count <= heap[0][0]:
+                continue
+            new_members = members + (i,)
+            if len(new_members) >= min_degree:
+                item = (count, tuple(sorted(new_members)))
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heapreplace(heap, item)
+            visit(pos + 1, new_members, combined)
+
+    visit(0, (), 0)
+    return sorted(heap, key=lambda x: (-x[0], len(x[1]), x[1]))
+
+
+def optimize_feature_set(index, projects, k, must_include=(), top_n=5, time_limit=2.0, exact_max_k=8):
+    """
+    k개의 (Omics, Tissue) feature를 필수로 요구할 때 환자 수가 가장 많은 조합을 찾습니다.
+    must_include의 feature는 항상 포함되며, 나머지 feature는 greedy로 초기 해를 구한 뒤
+    추가로 골라야 할 feature 수가 exact_max_k 이하이면 branch-and-bound로 정확한 상위 top_n을 탐색합니다.
+    time_limit(초)를 넘기면 그때까지의 최선 결과를 반환합니다.
+    반환값: {"results": [(환자 수, (feature index, ...)), ...], "exact": bool, "elapsed": float}
+    """
+    started = time.perf_counter()
+    must_include = tuple(sorted(set(must_include)))
+    remaining = k - len(must_include)
+    if remaining < 0:
+        raise ValueError("필수 포함 feature 수가 k보다 많습니다.")
+
+    base = get_scope_mask(index, projects)
+    for i in must_include:
+        base &= index["masks"][i]
+    if remaining == 0 or not base:
+        return {"results": [(base.bit_count(), must_include)], "exact": True, "elapsed": time.perf_counter() - started}
+
+    candidates = [
+        (i, mask & base)
+        for i, mask in enumerate(index["masks"])
+        if i not in must_include and mask & base
+    ]
+    candidates.sort(key=lambda x: -x[1].bit_count())
+    if len(candidates) < remaining:
+        return {"results": [], "exact": True, "elapsed": time.perf_counter() - started}
+
+    heap = []
+    seen = set()
+
+    def record(count, members):
+        members = tuple(sorted(must_include + members))
+        if members in seen:
+            return
+        item = (count, members)
+        if len(heap) < top_n:
+            heapq.heappush(heap, item)
+            seen.add(members)
+        elif item > heap[0]:
+            seen.discard(heapq.heapreplace(heap, item)[1])
+            seen.add(members)
+
+    # greedy: 교집합이 가장 큰 feature를 하나씩 추가
+    current, chosen = base, ()
+    pool = list(candidates)
+    for _ in range(remaining):
+        best = max(pool, key=lambda x: (current & x[1]).bit_count())
+        pool.remove(best)
+        current &= best[1]
+        chosen += (best[0],)
+    record(current.bit_count(), chosen)
+
+    # branch-and-bound: 교집합 크기가 현재 top_n번째 값 이하이면 하위 조합은 볼 필요 없음
+    exact = remaining <= exact_max_k
+    if exact:
+        deadline = started + time_limit
+        timed_out = False
+
+        def visit(start, members, current):
+            nonlocal timed_out
+            need = remaining - len(members)
+            for pos in range(start, len(candidates) - need + 1):
+                if timed_out or time.perf_counter() > deadline:
+                    timed_out = True
+                    return
+                i, mask = candidates[pos]
+                combined = current & mask
+                count = combined.bit_count()
+                if len(heap) >= top_n and count <= heap[0][0]:
+                    continue
+                if need == 1:
+                    record(count, members + (i,))
+                else:
+                    visit(pos + 1, members + (i,), combined)
+
+        visit(0, (), base)
+        exact = not timed_out
+
+    results = sorted((item for item in heap if item[0] > 0), key=lambda x: (-x[0], x[1]))
+    return {"results": results, "exact": exact, "elapsed": time.perf_counter() - started}
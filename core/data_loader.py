@@ -0,0 +1,73 @@
+"""
+임상 데이터 파일 읽기
+
+웹 화면(app.py, views)과 명령줄 도구(cli.py)가 같은 방식으로 원본 파일을 읽고 정리하도록 Streamlit에 의존하지 않는 함수만 모아 둔 모듈입니다.
+Excel(.xlsx/.xls) 외에 CSV, Parquet, Feather/Arrow 파일도 읽을 수 있습니다 (대용량 파일은 Excel보다 빠름).
+Excel은 python-calamine이 설치되어 있으면 calamine 엔진으로, 없으면 openpyxl로 읽습니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.timing import timing_span
+
+REQUIRED_COLUMNS = ["Project", "PatientID", "Visit", "Omics", "Tissue", "SampleID", "Date", "Biologics"]
+TEXT_COLUMNS = ["Project", "PatientID", "Visit", "Omics", "Tissue", "SampleID"]
+
+
+def _excel_engine():
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return None
+
+
+def _source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, "name", "") or ""
+
+
+def read_raw_file(source):
+    """확장자에 따라 파일(경로 또는 파일 객체)을 그대로 읽음. 확장자를 알 수 없으면 Excel로 읽음"""
+    name = _source_name(source).lower()
+    if name.endswith((".csv", ".csv.gz", ".tsv")):
+        return pd.read_csv(source, sep="\t" if name.endswith(".tsv") else ",", dtype={col: str for col in TEXT_COLUMNS})
+    if name.endswith(".parquet"):
+        return pd.read_parquet(source)
+    if name.endswith((".feather", ".arrow")):
+        return pd.read_feather(source)
+    return pd.read_excel(source, engine=_excel_engine())
+
+
+def clean_data(df):
+    """필수 컬럼 확인 후 문자열 공백 제거, Visit 표기 통일, 날짜 변환. 필수 컬럼이 없으면 ValueError"""
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"데이터 파일에 필수 컬럼이 누락되었습니다. 필요한 컬럼: {', '.join(REQUIRED_COLUMNS)}")
+
+    # Project, PatientID, Visit, Omics, Tissue, SampleID 열의 양쪽 공백 제거
+    for col in TEXT_COLUMNS:
+        df[col] = df[col].astype(str).str.strip()
+
+    # Biologics는 원래 NaN을 보존한 채로 strip만 수행
+    df["Biologics"] = df["Biologics"].astype(str).str.strip().replace({"nan": np.nan})
+
+    # Visit 열 변환: "V1" -> "Visit 1", "V2" -> "Visit 2", ...
+    visit = df["Visit"]
+    df["Visit"] = visit.where(~visit.str.startswith("V"), "Visit " + visit.str[1:])
+
+    # 날짜 형식 변환
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df
+
+
+def read_data_file(source):
+    """데이터 파일(경로 또는 파일 객체)을 읽어 정리된 DataFrame 반환. 필수 컬럼이 없으면 ValueError"""
+    with timing_span("read", source=os.path.basename(_source_name(source)) or None) as span:
+        df = read_raw_file(source)
+        span["rows"] = len(df)
+    with timing_span("normalize", rows=len(df)):
+        return clean_data(df)
@@ -0,0 +1,189 @@
+"""
+데이터 스냅샷과 버전별 파생 결과
+
+원본 데이터 파일을 Arrow 스냅샷으로 게시하고, 파일 내용 해시로 데이터 버전을 정하며,
+버전별 아티팩트(유효성 검사 결과, 인덱스 등)를 디스크에서 읽거나 계산하여 저장합니다.
+Streamlit에 의존하지 않으므로 스케줄러 스레드와 명령줄 도구에서도 사용합니다.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+
+from core.settings import ARTIFACT_DIR, CONFIG_FILE, DATA_FILE
+from core.data_loader import REQUIRED_COLUMNS, read_data_file
+from core.validation_rules import load_rules, rules_key, validate
+from core.reports import build_report_table, load_report_table, select_report_rows
+from core.artifacts import (
+    file_sha256, load_artifact, publish_lock, read_version_pointer, save_artifact, verify_artifact,
+    write_version_pointer
+)
+
+
+#############################################
+# 데이터 스냅샷 게시
+#############################################
+# 스냅샷 저장에 실패한 원본 해시 -> 실패 시각. 그동안은 매 실행마다 원본을 다시 파싱하지 않음
+PUBLISH_RETRY_SECONDS = 60
+_publish_failures = {}
+
+
+class SnapshotPublishError(RuntimeError):
+    """원본은 읽었지만 스냅샷을 저장하지 못함 (디스크 부족 등). read_current_data()로 원본을 직접 읽어 사용"""
+
+
+def _snapshot_frame(df):
+    """
+    Arrow 스냅샷으로 저장할 수 있도록 필수 컬럼 외의 object 컬럼(숫자와 문자가 섞인 메모 등)을 문자열로 변환.
+    결측값은 그대로 둡니다.
+    """
+    for col in df.columns:
+        if col not in REQUIRED_COLUMNS and df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def publish_data_snapshot(full_verify=False):
+    """
+    원본 Excel을 읽어 Arrow 스냅샷을 만들고 버전 포인터(CURRENT.json)를 교체합니다.
+    여러 프로세스가 동시에 호출해도 파일 잠금으로 한 번만 파싱하며, 이미 게시된 버전이면 포인터만 반환합니다.
+    full_verify=True이면 게시된 스냅샷 파일 전체 해시까지 확인하고 다르면 다시 만듭니다 (야간 사전 계산).
+    Streamlit API를 사용하지 않으므로 스케줄러 스레드에서도 호출할 수 있습니다.
+    """
+    with publish_lock(ARTIFACT_DIR):
+        with open(DATA_FILE, "rb") as f:
+            content = f.read()
+        source_sha256 = hashlib.sha256(content).hexdigest()
+        data_version = source_sha256[:16]
+        pointer = read_version_pointer(ARTIFACT_DIR)
+        snapshot_ok = verify_artifact(get_artifact_dir(data_version), "snapshot", source_sha256, full=full_verify) is not None
+        if pointer is not None and pointer["source_sha256"] == source_sha256 and snapshot_ok:
+            return pointer
+        if not snapshot_ok:
+            df = _snapshot_frame(read_data_file(io.BytesIO(content)))
+            try:
+                save_artifact(get_artifact_dir(data_version), "snapshot", df, source_sha256)
+            except Exception as e:
+                _publish_failures[source_sha256] = time.monotonic()
+                raise SnapshotPublishError(f"데이터 스냅샷을 저장하지 못했습니다: {e}") from e
+            _publish_failures.pop(source_sha256, None)
+        return write_version_pointer(ARTIFACT_DIR, data_version, source_sha256)
+
+
+def get_current_pointer():
+    """
+    현재 원본 파일의 게시된 버전 포인터. 게시된 스냅샷이 원본과 다르면 다시 게시합니다.
+    데이터 파일이 없으면 None, 읽을 수 없으면 ValueError 등 예외, 스냅샷을 저장하지 못하면 SnapshotPublishError
+    """
+    if not os.path.exists(DATA_FILE):
+        return None
+    # 게시된 스냅샷이 현재 원본과 같으면 Excel을 다시 파싱하지 않음
+    pointer = read_version_pointer(ARTIFACT_DIR)
+    source_sha256 = get_source_hash()
+    if pointer is None or pointer["source_sha256"] != source_sha256:
+        failed_at = _publish_failures.get(source_sha256)
+        if failed_at is not None and time.monotonic() - failed_at < PUBLISH_RETRY_SECONDS:
+            raise SnapshotPublishError("데이터 스냅샷 저장에 실패하여 잠시 후 다시 시도합니다.")
+        pointer = publish_data_snapshot()
+    return pointer
+
+
+def read_current_data():
+    """
+    스냅샷을 게시하지 않고 원본 파일을 직접 읽어 (DataFrame, 데이터 버전) 반환.
+    스냅샷 게시에 실패했을 때(디스크 부족 등) 화면에서 데이터를 계속 보여주기 위해 사용합니다.
+    """
+    with open(DATA_FILE, "rb") as f:
+        content = f.read()
+    return _snapshot_frame(read_data_file(io.BytesIO(content))), hashlib.sha256(content).hexdigest()[:16]
+
+
+def load_snapshot(data_version, source_sha256):
+    """게시된 스냅샷을 메모리 매핑으로 엽니다. 손상되었거나 정리된 경우 다시 게시"""
+    df = load_artifact(get_artifact_dir(data_version), "snapshot", source_sha256)
+    if df is None:
+        pointer = publish_data_snapshot()
+        df = load_artifact(get_artifact_dir(pointer["data_version"]), "snapshot", pointer["source_sha256"])
+    return df
+
+
+_hash_cache = {}
+_hash_lock = threading.Lock()
+
+
+def get_source_hash():
+    """데이터 파일 전체 sha256. (mtime, size)가 같으면 해시를 다시 계산하지 않습니다 (프로세스 내 캐시)."""
+    if not os.path.exists(DATA_FILE):
+        return None
+    stat = os.stat(DATA_FILE)
+    key = (DATA_FILE, stat.st_mtime_ns, stat.st_size)
+    with _hash_lock:
+        if key in _hash_cache:
+            return _hash_cache[key]
+    source_sha256 = file_sha256(DATA_FILE)
+    with _hash_lock:
+        _hash_cache.clear()
+        _hash_cache[key] = source_sha256
+    return source_sha256
+
+
+def get_data_version():
+    """
+    데이터 파일 내용 기반 버전 문자열. 파일이 바뀌면 값이 달라지므로 파생 데이터 캐시 키로 사용합니다.
+    """
+    source_sha256 = get_source_hash()
+    return source_sha256[:16] if source_sha256 is not None else None
+
+
+def get_artifact_dir(data_version):
+    """데이터 버전별 사전 계산 결과(아티팩트) 디렉토리"""
+    return os.path.join(ARTIFACT_DIR, data_version)
+
+
+def load_or_build_artifact(data_version, name, build):
+    """
+    버전별 아티팩트를 디스크에서 읽고(원본 해시/파일 해시 확인), 없거나 손상되었으면 build()로 계산하여 저장합니다.
+    data_version이 현재 원본 파일과 다르면 저장하지 않고 계산만 합니다.
+    """
+    source_sha256 = get_source_hash()
+    if source_sha256 is None or source_sha256[:16] != data_version:
+        return build()
+    artifact_dir = get_artifact_dir(data_version)
+    obj = load_artifact(artifact_dir, name, source_sha256)
+    if obj is None:
+        obj = build()
+        try:
+            save_artifact(artifact_dir, name, obj, source_sha256)
+        except OSError:
+            pass
+    return obj
+
+
+#############################################
+# 유효성 검사
+#############################################
+def get_validation_rules():
+    """현재 유효성 검사 규칙. 다른 프로세스에서 저장한 규칙도 다음 실행 때 반영됨"""
+    return load_rules(CONFIG_FILE)
+
+
+def compute_validation_report(df, rules=None):
+    """유효성 검사 결과 전체: 항목별 오류 레코드와 유효한 데이터"""
+    return validate(df, rules or get_validation_rules())
+
+
+def validation_artifact_name(rules):
+    """규칙이 바뀌면 유효성 검사 결과만 다시 계산되도록 규칙 식별자를 아티팩트 이름에 포함"""
+    return f"validation_{rules_key(rules)}"
+
+
+#############################################
+# 대시보드 테이블
+#############################################
+def load_or_build_report_table(df, data_version, kind, name):
+    """대시보드 테이블. 사전 계산 결과(Parquet)가 있으면 읽고, 없으면 계산"""
+    table = load_report_table(os.path.join(get_artifact_dir(data_version), "reports"), kind, name)
+    if table is None:
+        table = build_report_table(kind, name, select_report_rows(df, kind, name))
+    return table
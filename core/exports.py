@@ -0,0 +1,69 @@
+"""
+다운로드 파일 디스크 캐시와 전체 내보내기 파일 경로
+"""
+import hashlib
+import json
+import os
+import threading
+
+from core.settings import EXPORT_BUNDLE_DIR, EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_BYTES
+from core.reports import EXPORT_FORMATS, encode_dataframe
+from core.datastore import get_data_version
+
+
+#############################################
+# 내보내기 (다운로드 파일 생성 및 캐시)
+#############################################
+def _evict_export_cache():
+    """캐시 크기가 EXPORT_CACHE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (LRU)"""
+    entries = []
+    with os.scandir(EXPORT_CACHE_DIR) as it:
+        for entry in it:
+            # "."으로 시작하는 파일은 생성 중인 임시 파일
+            if entry.is_file() and not entry.name.startswith("."):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= EXPORT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def get_export_file(df, fmt, params):
+    """
+    내보내기 파일 경로를 반환합니다. (data_version, params, fmt)가 같으면 디스크 캐시의 파일을 재사용하고,
+    없으면 새로 생성한 뒤 캐시 크기를 정리합니다. params에는 df 내용을 결정하는 화면 조건을 모두 넣어야 합니다.
+    """
+    cache_key = hashlib.sha256(
+        json.dumps({"data_version": get_data_version(), "params": params, "format": fmt}, sort_keys=True, default=str).encode()
+    ).hexdigest()[:24]
+    ext = EXPORT_FORMATS[fmt]["ext"]
+    file_path = os.path.join(EXPORT_CACHE_DIR, f"{cache_key}.{ext}")
+    if os.path.exists(file_path):
+        # 최근 사용 시각 갱신 (LRU 기준)
+        os.utime(file_path)
+        return file_path
+
+    os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+    tmp_file = os.path.join(EXPORT_CACHE_DIR, f".{cache_key}.{os.getpid()}.{threading.get_ident()}.{ext}")
+    try:
+        encode_dataframe(df, fmt, tmp_file)
+        os.replace(tmp_file, file_path)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    _evict_export_cache()
+    return file_path
+
+
+#############################################
+# 전체 내보내기
+#############################################
+def get_bundle_path(data_version, fmt):
+    """데이터 버전과 형식별 전체 내보내기 zip 경로"""
+    return os.path.join(EXPORT_BUNDLE_DIR, f"export_all_{data_version}_{fmt.replace('.', '_')}.zip")
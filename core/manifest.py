@@ -0,0 +1,180 @@
+"""
+샘플 파일 경로 매니페스트와 디스크 스캔
+
+샘플 경로 규칙(SAMPLE_ROOT/Project/PatientID/Visit/Omics/Tissue/SampleID)에 따른 매니페스트를 만들고,
+예상 경로가 실제 디스크에 있는지 디렉토리 단위로 스캔하여 결과를 SCAN_CACHE_FILE에 저장합니다.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from core.settings import SAMPLE_ROOT, SCAN_CACHE_FILE
+
+
+MANIFEST_COLUMNS = ["Project", "PatientID", "Visit", "Omics", "Tissue", "SampleID"]
+
+
+def build_path_manifest(df):
+    """
+    샘플별 파일 경로 매니페스트 생성
+    실제 환경에서는 각 조직의 파일이 저장된 위치(서버 경로 등)를 구성 규칙에 맞춰서 반환하도록 구현합니다.
+    여기서는 예시로 SAMPLE_ROOT/Project/PatientID/Visit/Omics/Tissue/SampleID 구조로 생성하며,
+    경로 컬럼은 행 반복 없이 문자열 컬럼 결합 한 번으로 계산합니다.
+    """
+    manifest = df[MANIFEST_COLUMNS].astype(str)
+    manifest = manifest.assign(
+        Path=SAMPLE_ROOT + "/" + manifest["Project"].str.cat(
+            [manifest[col] for col in MANIFEST_COLUMNS[1:]], sep="/"
+        )
+    )
+    return manifest.reset_index(drop=True)
+
+
+def get_sample_paths(df):
+    """PatientID_Visit_Omics_Tissue key -> 파일 경로 사전 (같은 key가 여러 개면 마지막 샘플 경로)"""
+    manifest = build_path_manifest(df)
+    keys = manifest["PatientID"].str.cat([manifest["Visit"], manifest["Omics"], manifest["Tissue"]], sep="_")
+    return dict(zip(keys, manifest["Path"]))
+
+
+def write_path_manifest(manifest, file_path, fmt="tsv", chunk_size=100000):
+    """
+    매니페스트를 chunk 단위로 파일에 기록 (전체 문자열을 메모리에 만들지 않음)
+    fmt="tsv": 헤더 포함 탭 구분 텍스트, fmt="json": 레코드 배열
+    """
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "json":
+            f.write("[")
+        for start in range(0, len(manifest), chunk_size):
+            chunk = manifest.iloc[start:start + chunk_size]
+            if fmt == "json":
+                if start:
+                    f.write(",")
+                f.write(chunk.to_json(orient="records", force_ascii=False)[1:-1])
+            else:
+                chunk.to_csv(f, sep="\t", index=False, header=(start == 0), lineterminator="\n")
+        if fmt == "json":
+            f.write("]")
+        elif len(manifest) == 0:
+            f.write("\t".join(manifest.columns) + "\n")
+
+
+#############################################
+# 샘플 파일 디스크 스캔
+#############################################
+def _scan_directory(directory, cached):
+    """
+    디렉토리 하나를 스캔하여 {"mtime_ns": ..., "files": {이름: [size, mtime]}} 반환 (없으면 None)
+    디렉토리 mtime이 캐시와 같으면 파일 목록이 바뀌지 않은 것으로 보고 캐시를 그대로 사용합니다.
+    """
+    try:
+        dir_mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return directory, None
+    if cached is not None and cached.get("mtime_ns") == dir_mtime:
+        return directory, cached
+
+    files = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue
+                files[entry.name] = [info.st_size, info.st_mtime]
+    except OSError:
+        return directory, None
+    return directory, {"mtime_ns": dir_mtime, "files": files}
+
+
+def read_scan_cache():
+    """마지막 스캔 결과. 스캔한 적이 없으면 None"""
+    if not os.path.exists(SCAN_CACHE_FILE):
+        return None
+    with open(SCAN_CACHE_FILE, "r") as f:
+        return json.load(f)
+
+
+def get_scan_version():
+    """스캔 캐시 파일의 mtime (디스크 현황 집계 캐시 키)"""
+    return os.stat(SCAN_CACHE_FILE).st_mtime_ns if os.path.exists(SCAN_CACHE_FILE) else None
+
+
+def annotate_disk_status(manifest, scan_cache):
+    """매니페스트에 스캔 결과(OnDisk, Size, MTime) 컬럼을 붙입니다. 디스크 I/O 없이 캐시만 조회"""
+    directories = (scan_cache or {}).get("directories", {})
+    files_df = pd.DataFrame(
+        [
+            (directory, name, size, mtime)
+            for directory, entry in directories.items()
+            for name, (size, mtime) in entry["files"].items()
+        ],
+        columns=["_dir", "_name", "Size", "MTime"]
+    )
+    split = manifest["Path"].str.rsplit("/", n=1)
+    keyed = manifest.assign(_dir=split.str[0], _name=split.str[1])
+    merged = keyed.merge(files_df, on=["_dir", "_name"], how="left")
+    merged["OnDisk"] = merged["Size"].notna()
+    merged["MTime"] = pd.to_datetime(merged["MTime"], unit="s")
+    return merged.drop(columns=["_dir", "_name"])
+
+
+def scan_sample_files(manifest, max_workers=16, progress_callback=None):
+    """
+    매니페스트의 예상 경로가 실제 디스크에 있는지 스레드 풀로 확인합니다.
+    경로를 디렉토리 단위로 묶어 디렉토리마다 한 번만 스캔하고, 결과는 SCAN_CACHE_FILE에 저장하여
+    다음 스캔에서는 mtime이 바뀐 디렉토리만 다시 읽습니다.
+    """
+    previous = read_scan_cache() or {}
+    cached_dirs = previous.get("directories", {})
+    directories = manifest["Path"].str.rsplit("/", n=1).str[0].unique().tolist()
+
+    scanned = dict(cached_dirs)
+    rescanned = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_scan_directory, d, cached_dirs.get(d)) for d in directories]
+        for done, future in enumerate(as_completed(futures), start=1):
+            directory, entry = future.result()
+            if entry is None:
+                scanned.pop(directory, None)
+            else:
+                rescanned += entry is not cached_dirs.get(directory)
+                scanned[directory] = entry
+            if progress_callback is not None and (done % 200 == 0 or done == len(futures)):
+                progress_callback(done, len(futures))
+
+    scan_cache = {
+        "root": SAMPLE_ROOT,
+        "scanned_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "rescanned_directories": rescanned,
+        "directories": scanned,
+    }
+    tmp_file = SCAN_CACHE_FILE + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(scan_cache, f)
+    os.replace(tmp_file, SCAN_CACHE_FILE)
+    return annotate_disk_status(manifest, scan_cache)
+
+
+def count_disk_patients(df, scan_cache, with_biologics=False):
+    """(Project, Omics, Tissue[, Biologics])별 디스크에 파일이 있는 환자 수"""
+    status = annotate_disk_status(build_path_manifest(df), scan_cache)
+    keys = ["Project", "Omics", "Tissue"]
+    if with_biologics:
+        status["Biologics"] = df["Biologics"].to_numpy()
+        keys.append("Biologics")
+    return status[status["OnDisk"]].groupby(keys)["PatientID"].nunique()
+
+
+def add_disk_count_column(result_df, disk_counts, **fixed):
+    """집계 테이블의 Total 옆에 디스크에 파일이 있는 환자 수(On disk) 컬럼 추가"""
+    if result_df.empty:
+        return result_df
+    key_df = result_df.assign(**fixed)[list(disk_counts.index.names)]
+    counts = disk_counts.reindex(pd.MultiIndex.from_frame(key_df)).fillna(0).astype(int).to_numpy()
+    result_df.insert(result_df.columns.get_loc("Total") + 1, "On disk", counts)
+    return result_df
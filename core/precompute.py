@@ -0,0 +1,116 @@
+"""
+사전 계산 (데이터 변경 시 및 야간 작업)
+
+스케줄러 스레드에서 실행되므로 Streamlit API를 사용하지 않습니다.
+"""
+import os
+import shutil
+import time
+from datetime import datetime
+
+from core.settings import ARTIFACT_DIR, DATA_FILE, EXPORT_BUNDLE_DIR, PRECOMPUTE_TIME
+from core.artifacts import load_artifact, save_artifact, verify_artifact
+from core.reports import build_report_bundle, has_report_tables, save_report_tables
+from core.datastore import (
+    compute_validation_report, get_artifact_dir, get_validation_rules, publish_data_snapshot,
+    validation_artifact_name
+)
+from core.exports import get_bundle_path
+from core.combination import compute_combination_index
+from core.search import compute_search_index
+from core.timing import bind_context
+
+
+def _ping_self():
+    import requests
+    try:
+        requests.get("http://localhost:8501")
+    except:
+        pass
+
+
+def run_scheduler(state):
+    """keepalive 호출, 데이터 변경 감지(1분마다), 야간 사전 계산을 실행하는 스케줄러 루프 (백그라운드 스레드)"""
+    import schedule
+    schedule.every(1440).minutes.do(_ping_self)  # 하루마다 호출
+    # 데이터 변경 감지 (1분마다) 및 야간 사전 계산
+    schedule.every(1).minutes.do(run_precompute, state)
+    schedule.every().day.at(PRECOMPUTE_TIME).do(run_precompute, state, nightly=True)
+    while True:
+        schedule.run_pending()
+        time.sleep(1)
+
+
+def _prune_artifacts(data_version, validation_name):
+    """현재 버전이 아닌 사전 계산 결과, 현재 규칙이 아닌 유효성 검사 결과와 전체 내보내기 파일 삭제"""
+    if os.path.isdir(ARTIFACT_DIR):
+        for name in os.listdir(ARTIFACT_DIR):
+            path = os.path.join(ARTIFACT_DIR, name)
+            if os.path.isdir(path) and name != data_version and not name.startswith("tmp"):
+                # 다른 프로세스가 매핑 중인 파일은 삭제 후에도 매핑이 끝날 때까지 유지됨
+                shutil.rmtree(path, ignore_errors=True)
+    artifact_dir = get_artifact_dir(data_version)
+    if os.path.isdir(artifact_dir):
+        for name in os.listdir(artifact_dir):
+            if name.startswith("validation") and not name.startswith(validation_name + "."):
+                os.remove(os.path.join(artifact_dir, name))
+    if os.path.isdir(EXPORT_BUNDLE_DIR):
+        for name in os.listdir(EXPORT_BUNDLE_DIR):
+            if name.startswith("export_all_") and f"_{data_version}_" not in name:
+                os.remove(os.path.join(EXPORT_BUNDLE_DIR, name))
+
+
+def run_precompute(state, nightly=False):
+    """
+    현재 데이터 파일 버전의 아티팩트(스냅샷, 유효성 검사 결과, 조합/검색 인덱스), 대시보드 테이블(Parquet)과
+    전체 내보내기 zip(xlsx)을 디스크에 미리 만듭니다.
+    스케줄러 스레드에서 호출되므로 Streamlit API를 사용하지 않습니다. 파일 (mtime, size)가 그대로이면
+    바로 반환하고, 야간 실행(nightly=True)에서는 아티팩트 파일 전체 해시를 확인하여 누락되거나 손상된 결과를
+    다시 만들고 이전 버전 결과를 정리합니다.
+    """
+    if not os.path.exists(DATA_FILE):
+        return None
+    stat = os.stat(DATA_FILE)
+    if not nightly and state["source_stat"] == (stat.st_mtime_ns, stat.st_size):
+        return state["data_version"]
+    if not state["lock"].acquire(blocking=False):
+        return None
+    try:
+        bind_context(session="nightly" if nightly else "precompute")
+        pointer = publish_data_snapshot(full_verify=nightly)
+        source_sha256 = pointer["source_sha256"]
+        data_version = pointer["data_version"]
+        bind_context(data_version=data_version)
+        artifact_dir = get_artifact_dir(data_version)
+        reports_dir = os.path.join(artifact_dir, "reports")
+        bundle_path = get_bundle_path(data_version, "xlsx")
+        rules = get_validation_rules()
+        validation_name = validation_artifact_name(rules)
+        artifact_builders = {
+            validation_name: lambda df: compute_validation_report(df, rules),
+            "combination_index": compute_combination_index,
+            "search_index": compute_search_index,
+        }
+        missing = [name for name in artifact_builders if verify_artifact(artifact_dir, name, source_sha256, full=nightly) is None]
+        if missing or not has_report_tables(reports_dir) or not os.path.exists(bundle_path):
+            df = load_artifact(artifact_dir, "snapshot", source_sha256)
+            for name, build in artifact_builders.items():
+                if name in missing:
+                    save_artifact(artifact_dir, name, build(df), source_sha256)
+            if not has_report_tables(reports_dir):
+                save_report_tables(df, reports_dir, data_version=data_version)
+            if not os.path.exists(bundle_path):
+                os.makedirs(EXPORT_BUNDLE_DIR, exist_ok=True)
+                build_report_bundle(df, bundle_path, fmt="xlsx", data_version=data_version)
+        if nightly:
+            _prune_artifacts(data_version, validation_name)
+        state.update(
+            source_stat=(stat.st_mtime_ns, stat.st_size), data_version=data_version,
+            finished_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), error=None
+        )
+        return data_version
+    except Exception as e:
+        state["error"] = str(e)
+        return None
+    finally:
+        state["lock"].release()
@@ -0,0 +1,335 @@
+"""
+대시보드 집계 테이블과 내보내기 파일 생성
+
+views의 각 페이지와 "전체 내보내기" 작업자 프로세스가 같은 집계 결과를 쓰도록
+Streamlit에 의존하지 않는 함수만 모아 둔 모듈입니다.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from core.timing import get_worker_initargs, init_worker, timing_span
+
+EXPORT_FORMATS = {
+    "xlsx": {"label": "Excel (.xlsx)", "ext": "xlsx", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+    "csv": {"label": "CSV (.csv)", "ext": "csv", "mime": "text/csv"},
+    "csv.gz": {"label": "CSV gzip (.csv.gz)", "ext": "csv.gz", "mime": "application/gzip"},
+    "parquet": {"label": "Parquet (.parquet)", "ext": "parquet", "mime": "application/vnd.apache.parquet"},
+    "feather": {"label": "Feather (.feather)", "ext": "feather", "mime": "application/octet-stream"},
+}
+
+
+def get_export_formats():
+    """사용 가능한 내보내기 형식 (Parquet/Feather는 pyarrow가 설치된 경우에만)"""
+    try:
+        import pyarrow  # noqa: F401
+        return list(EXPORT_FORMATS)
+    except ImportError:
+        return [fmt for fmt in EXPORT_FORMATS if fmt not in ("parquet", "feather")]
+
+
+def encode_dataframe(df, fmt, file_path):
+    """데이터프레임을 지정한 형식의 파일로 기록"""
+    with timing_span("export", fmt=fmt, rows=len(df)) as span:
+        _encode_dataframe(df, fmt, file_path)
+        span["bytes"] = os.path.getsize(file_path)
+
+
+def _encode_dataframe(df, fmt, file_path):
+    if fmt == "xlsx":
+        with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
+            df.to_excel(writer, index=False)
+    elif fmt == "csv":
+        # Excel에서 한글이 깨지지 않도록 BOM 포함
+        df.to_csv(file_path, index=False, encoding="utf-8-sig")
+    elif fmt == "csv.gz":
+        df.to_csv(file_path, index=False, compression="gzip")
+    elif fmt in ("parquet", "feather"):
+        # 컬럼명은 문자열이어야 함 (MultiIndex 컬럼은 공백으로 연결)
+        out = df.reset_index(drop=True)
+        out.columns = [" ".join(map(str, col)) if isinstance(col, tuple) else str(col) for col in out.columns]
+        if fmt == "parquet":
+            out.to_parquet(file_path, index=False)
+        else:
+            out.to_feather(file_path)
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+
+#############################################
+# 환자 수 집계 테이블
+#############################################
+def _visit_count_table(df, row_keys):
+    """row_keys별 Visit 컬럼 환자 수 + 전체 Visit 환자 수(Total) 테이블"""
+    visit_list = sorted(df["Visit"].unique())
+    counts = (
+        df.groupby(row_keys + ["Visit"])["PatientID"].nunique()
+        .unstack("Visit", fill_value=0)
+        .reindex(columns=visit_list, fill_value=0)
+    )
+    counts["Total"] = df.groupby(row_keys)["PatientID"].nunique()
+    counts.columns.name = None
+    return counts.reset_index()
+
+
+def build_cohort_count_table(project_df, with_biologics=False):
+    """코호트(프로젝트)별 현황: (Omics, Tissue[, Biologics])별 Visit별 환자 수"""
+    row_keys = ["Omics", "Tissue", "Biologics"] if with_biologics else ["Omics", "Tissue"]
+    return _visit_count_table(project_df, row_keys)
+
+
+def build_omics_count_table(omics_df):
+    """오믹스별 현황: (Tissue, Project)별 Visit별 환자 수"""
+    return _visit_count_table(omics_df, ["Tissue", "Project"])
+
+
+def build_combination_summary(project_df):
+    """환자별로 보유한 오믹스 종류 조합과 해당 조합의 환자 수"""
+    combinations = (
+        project_df[["PatientID", "Omics"]].drop_duplicates()
+        .sort_values(["PatientID", "Omics"])
+        .groupby("PatientID")["Omics"].agg(" + ".join)
+        .reindex(project_df["PatientID"].unique())
+    )
+    # 동률인 조합은 처음 등장한 순서 유지
+    summary = combinations.value_counts(sort=False).rename_axis("오믹스 조합").reset_index(name="환자 수")
+    return summary.sort_values(by="환자 수", ascending=False, kind="stable")
+
+
+#############################################
+# 샘플 ID 피벗
+#############################################
+def build_sample_id_pivot(df, index_cols):
+    """
+    (index_cols..., "Omics (Tissue)") 별 SampleID를 ", "로 이어 붙인 wide 테이블을 만듭니다.
+    pivot_table(aggfunc=lambda)와 같은 결과를 한 번의 정렬과 한 번의 그룹 문자열 결합으로 계산합니다.
+    """
+    with timing_span("pivot", rows=len(df)) as span:
+        pivot = _build_sample_id_pivot(df, index_cols)
+        span["table_rows"] = len(pivot)
+    return pivot
+
+
+def _build_sample_id_pivot(df, index_cols):
+    keys = list(index_cols) + ["Omics_Tissue"]
+    work = df[list(index_cols) + ["Omics", "Tissue", "SampleID"]].dropna(subset=list(index_cols))
+    work = work.assign(
+        Omics_Tissue=work["Omics"].astype(str) + " (" + work["Tissue"].astype(str) + ")",
+        SampleID=work["SampleID"].astype(str)
+    ).sort_values(keys, kind="stable")
+
+    # 대부분의 셀은 샘플이 하나이므로 중복 키만 문자열 결합
+    duplicated = work.duplicated(keys, keep=False)
+    single = work.loc[~duplicated].set_index(keys)["SampleID"]
+    joined = work.loc[duplicated].groupby(keys, sort=False)["SampleID"].agg(", ".join)
+    cells = pd.concat([single, joined]) if len(joined) else single
+
+    pivot = cells.unstack("Omics_Tissue").sort_index().sort_index(axis=1)
+    return pivot.reset_index()
+
+
+def get_sample_id_index_cols(project):
+    """PRISM은 Biologics까지 포함한 행 기준으로 샘플 ID를 나열"""
+    if project == "PRISM":
+        return ["PatientID", "Biologics", "Visit"]
+    return ["PatientID", "Visit"]
+
+
+def filter_sample_id_pivot(pivot, index_cols, patient_prefix="", visits=None, columns=None):
+    """
+    샘플 ID wide 테이블을 서버에서 필터링합니다.
+    pivot은 PatientID 기준으로 정렬되어 있으므로 PatientID 앞부분 검색은 이진 탐색으로 구간만 잘라냅니다.
+    columns를 지정하면 해당 Omics (Tissue) 컬럼만 남기고, 선택 컬럼에 샘플이 하나도 없는 행은 제외합니다.
+    """
+    if patient_prefix:
+        patient_ids = pivot["PatientID"].to_numpy(dtype=object)
+        start = np.searchsorted(patient_ids, patient_prefix, side="left")
+        stop = np.searchsorted(patient_ids, patient_prefix + "\U0010ffff", side="left")
+        pivot = pivot.iloc[start:stop]
+    if visits:
+        pivot = pivot[pivot["Visit"].isin(visits)]
+    if columns:
+        pivot = pivot[list(index_cols) + list(columns)]
+        pivot = pivot[pivot[list(columns)].notna().any(axis=1)]
+    return pivot
+
+
+#############################################
+# 전체 내보내기 묶음
+#############################################
+def select_report_rows(df, kind, name):
+    """테이블 종류에 해당하는 입력 행 (오믹스별 현황은 Omics, 나머지는 Project 기준)"""
+    if kind == "omics":
+        return df[df["Omics"] == name]
+    return df[df["Project"] == name]
+
+
+def list_report_jobs(df):
+    """
+    전체 내보내기에 포함할 테이블 목록: [(종류, 이름)]
+    대시보드의 코호트별/오믹스별 환자 수, 오믹스 조합 요약, 샘플 ID 리스트를 모두 포함합니다.
+    """
+    jobs = []
+    for project in sorted(df["Project"].unique()):
+        jobs.append(("cohort", project))
+        if project == "PRISM":
+            jobs.append(("cohort_biologics", project))
+        jobs.append(("combination", project))
+        jobs.append(("sample_id", project))
+    for omics in sorted(df["Omics"].unique()):
+        jobs.append(("omics", omics))
+    return jobs
+
+
+REPORT_FILE_NAMES = {
+    "cohort": "cohort/Proejcts_{name}_patient_counts",
+    "cohort_biologics": "cohort/Proejcts_{name}_biologics_patient_counts",
+    "omics": "omics/Omics_{name}_patient_counts",
+    "combination": "combination/{name}_omics_combinations",
+    "sample_id": "sample_id/{name}_Sample_ID",
+}
+
+
+def build_report_table(kind, name, df):
+    """종류별 테이블 생성 (Sample ID 피벗은 pivot, 나머지 집계 테이블은 cube 단계로 시간 기록)"""
+    if kind == "sample_id":
+        return build_sample_id_pivot(df, get_sample_id_index_cols(name))
+    with timing_span("cube", kind=kind, name=name, rows=len(df)) as span:
+        if kind == "cohort":
+            table = build_cohort_count_table(df)
+        elif kind == "cohort_biologics":
+            table = build_cohort_count_table(df, with_biologics=True)
+        elif kind == "omics":
+            table = build_omics_count_table(df)
+        elif kind == "combination":
+            table = build_combination_summary(df)
+        else:
+            raise ValueError(f"알 수 없는 테이블 종류입니다: {kind}")
+        span["table_rows"] = len(table)
+    return table
+
+
+def report_file_name(kind, name, fmt):
+    """zip 안의 테이블 경로 (예: cohort/Proejcts_PRISM_patient_counts.xlsx)"""
+    return REPORT_FILE_NAMES[kind].format(name=name.replace("/", "_")) + "." + EXPORT_FORMATS[fmt]["ext"]
+
+
+def _report_process_pool(max_workers):
+    """
+    테이블 작업자 프로세스 풀. 호출하는 쪽이 스레드(백그라운드 작업, 기록 writer)를 쓰고 있으므로
+    fork하면 다른 스레드가 잡고 있던 잠금이 자식에서 풀리지 않을 수 있어 spawn으로 시작합니다.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker, initargs=get_worker_initargs()
+    )
+
+
+def _write_report(kind, name, df, fmt, out_dir):
+    """작업자 프로세스: 테이블을 만들어 out_dir에 기록하고 (zip 내 경로, 파일 경로, 행 수) 반환"""
+    table = build_report_table(kind, name, df)
+    arcname = report_file_name(kind, name, fmt)
+    file_path = os.path.join(out_dir, arcname.replace("/", "__"))
+    encode_dataframe(table, fmt, file_path)
+    return kind, name, arcname, file_path, len(table)
+
+
+def build_report_bundle(df, zip_path, fmt="xlsx", data_version=None, max_workers=None, progress_callback=None):
+    """
+    list_report_jobs의 모든 테이블을 작업자 프로세스에서 병렬로 생성하여 zip_path 하나로 묶습니다.
+    완료된 파일은 임시 디렉토리에서 zip으로 바로 옮겨 담고, manifest.json에 목록을 기록합니다.
+    progress_callback(완료 수, 전체 수)가 주어지면 테이블이 끝날 때마다 호출합니다.
+    """
+    jobs = list_report_jobs(df)
+    out_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(zip_path)))
+    tmp_zip = f"{zip_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    entries = []
+    try:
+        with zipfile.ZipFile(tmp_zip, "w", compression=zipfile.ZIP_DEFLATED) as bundle, \
+                _report_process_pool(max_workers) as executor:
+            futures = [
+                executor.submit(_write_report, kind, name, select_report_rows(df, kind, name), fmt, out_dir)
+                for kind, name in jobs
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                kind, name, arcname, file_path, n_rows = future.result()
+                bundle.write(file_path, arcname=arcname)
+                os.remove(file_path)
+                entries.append({"type": kind, "name": name, "file": arcname, "rows": n_rows})
+                if progress_callback is not None:
+                    progress_callback(done, len(jobs))
+
+            bundle.writestr("manifest.json", json.dumps({
+                "data_version": data_version,
+                "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "format": fmt,
+                "files": sorted(entries, key=lambda x: x["file"]),
+            }, ensure_ascii=False, indent=2))
+        os.replace(tmp_zip, zip_path)
+        return entries
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        if os.path.exists(tmp_zip):
+            os.remove(tmp_zip)
+
+
+#############################################
+# 사전 계산 테이블 저장/로드
+#############################################
+REPORT_INDEX_FILE = "reports.json"
+
+
+def save_report_tables(df, out_dir, data_version=None, max_workers=None):
+    """
+    list_report_jobs의 모든 테이블을 Parquet으로 out_dir에 저장합니다.
+    임시 디렉토리에 모두 기록한 뒤 이름을 바꾸므로 out_dir에는 완성된 결과만 나타납니다.
+    """
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent)
+    try:
+        with _report_process_pool(max_workers) as executor:
+            futures = [
+                executor.submit(_write_report, kind, name, select_report_rows(df, kind, name), "parquet", tmp_dir)
+                for kind, name in list_report_jobs(df)
+            ]
+            entries = []
+            for future in as_completed(futures):
+                kind, name, _, file_path, n_rows = future.result()
+                entries.append({"type": kind, "name": name, "file": os.path.basename(file_path), "rows": n_rows})
+
+        with open(os.path.join(tmp_dir, REPORT_INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "data_version": data_version,
+                "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "files": sorted(entries, key=lambda x: x["file"]),
+            }, f, ensure_ascii=False, indent=2)
+
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+        os.replace(tmp_dir, out_dir)
+        return entries
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def has_report_tables(out_dir):
+    """save_report_tables가 끝까지 완료된 디렉토리인지 확인"""
+    return os.path.exists(os.path.join(out_dir, REPORT_INDEX_FILE))
+
+
+def load_report_table(out_dir, kind, name):
+    """저장된 테이블을 읽습니다. 없으면 None"""
+    file_path = os.path.join(out_dir, report_file_name(kind, name, "parquet").replace("/", "__"))
+    if not has_report_tables(out_dir) or not os.path.exists(file_path):
+        return None
+    return pd.read_parquet(file_path)
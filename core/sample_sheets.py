@@ -0,0 +1,176 @@
+"""
+오믹스별 파이프라인 샘플시트 생성
+
+core.manifest의 샘플 경로 매니페스트(build_path_manifest 결과)를 받아 오믹스 항목마다
+고정된 스키마의 CSV/TSV 샘플시트를 만들고 하나의 zip으로 묶습니다.
+ProcessPoolExecutor 작업자가 import 할 수 있도록 Streamlit에 의존하지 않는 별도 모듈로 둡니다.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import string
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# 컬럼 값은 매니페스트 컬럼({Project}, {PatientID}, {Visit}, {Omics}, {Tissue}, {SampleID}, {Path})을
+# 사용하는 템플릿 문자열입니다. FASTQ 등 파일명은 샘플 경로 아래의 명명 규칙을 따릅니다.
+SAMPLE_SHEET_SCHEMAS = {
+    "Bulk Exome RNA-seq": {
+        "sep": ",",
+        "columns": {
+            "sample": "{SampleID}",
+            "fastq_1": "{Path}/{SampleID}_R1.fastq.gz",
+            "fastq_2": "{Path}/{SampleID}_R2.fastq.gz",
+            "strandedness": "auto",
+        },
+    },
+    "Bulk Total RNA-seq": {
+        "sep": ",",
+        "columns": {
+            "sample": "{SampleID}",
+            "fastq_1": "{Path}/{SampleID}_R1.fastq.gz",
+            "fastq_2": "{Path}/{SampleID}_R2.fastq.gz",
+            "strandedness": "auto",
+        },
+    },
+    "scRNA-seq": {
+        "sep": ",",
+        "columns": {
+            "sample": "{SampleID}",
+            "fastq_1": "{Path}/{SampleID}_R1.fastq.gz",
+            "fastq_2": "{Path}/{SampleID}_R2.fastq.gz",
+            "expected_cells": "",
+        },
+    },
+    "miRNA": {
+        "sep": ",",
+        "columns": {
+            "sample": "{SampleID}",
+            "fastq_1": "{Path}/{SampleID}.fastq.gz",
+        },
+    },
+    "Methylation": {
+        "sep": ",",
+        "columns": {
+            "Sample_Name": "{SampleID}",
+            "Sample_Group": "{Project}",
+            "Patient": "{PatientID}",
+            "Visit": "{Visit}",
+            "Tissue": "{Tissue}",
+            "Basename": "{Path}/{SampleID}",
+        },
+    },
+    "SNP": {
+        "sep": "\t",
+        "columns": {
+            "FID": "{Project}",
+            "IID": "{PatientID}",
+            "sample_id": "{SampleID}",
+            "path": "{Path}",
+        },
+    },
+    "Protein": {
+        "sep": "\t",
+        "columns": {
+            "sample_id": "{SampleID}",
+            "subject_id": "{PatientID}",
+            "project": "{Project}",
+            "visit": "{Visit}",
+            "tissue": "{Tissue}",
+            "file": "{Path}",
+        },
+    },
+    "Metabolites": {
+        "sep": "\t",
+        "columns": {
+            "sample_id": "{SampleID}",
+            "subject_id": "{PatientID}",
+            "project": "{Project}",
+            "visit": "{Visit}",
+            "tissue": "{Tissue}",
+            "file": "{Path}",
+        },
+    },
+}
+
+
+def sample_sheet_file_name(omics):
+    """zip 안의 샘플시트 파일명 (예: Bulk_Exome_RNA-seq_samplesheet.csv)"""
+    ext = "tsv" if SAMPLE_SHEET_SCHEMAS[omics]["sep"] == "\t" else "csv"
+    return f"{omics.replace(' ', '_')}_samplesheet.{ext}"
+
+
+def _render_template(manifest, template):
+    """템플릿 문자열을 행 반복 없이 컬럼 문자열 결합으로 계산"""
+    result = pd.Series("", index=manifest.index, dtype=object)
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            result = result + literal
+        if field:
+            result = result + manifest[field].astype(str)
+    return result
+
+
+def build_sample_sheet(manifest, omics):
+    """한 오믹스의 샘플시트 DataFrame 생성"""
+    schema = SAMPLE_SHEET_SCHEMAS[omics]
+    rows = manifest[manifest["Omics"] == omics].sort_values(["Project", "PatientID", "Visit", "SampleID"])
+    return pd.DataFrame({
+        column: _render_template(rows, template)
+        for column, template in schema["columns"].items()
+    })
+
+
+def _write_sample_sheet(omics, manifest, out_dir):
+    """작업자 프로세스: 샘플시트를 out_dir에 기록하고 (omics, 파일 경로, 행 수) 반환"""
+    sheet = build_sample_sheet(manifest, omics)
+    file_path = os.path.join(out_dir, sample_sheet_file_name(omics))
+    sheet.to_csv(file_path, sep=SAMPLE_SHEET_SCHEMAS[omics]["sep"], index=False, lineterminator="\n")
+    return omics, file_path, len(sheet)
+
+
+def build_sample_sheet_bundle(manifest, zip_path, max_workers=None):
+    """
+    매니페스트에 포함된 오믹스별 샘플시트를 작업자 프로세스에서 병렬로 만들고 zip_path에 묶습니다.
+    각 샘플시트는 임시 디렉토리에 파일로 기록된 뒤 zip에 순서대로 스트리밍되므로
+    전체 결과를 메모리에 올리지 않습니다. 반환값: {오믹스: 행 수}
+    """
+    omics_list = [omics for omics in SAMPLE_SHEET_SCHEMAS if (manifest["Omics"] == omics).any()]
+    out_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(zip_path)))
+    tmp_zip = f"{zip_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        counts = {}
+        if omics_list:
+            workers = min(len(omics_list), max_workers or os.cpu_count() or 1)
+            # 백그라운드 스레드에서 호출될 수 있으므로 fork 대신 spawn (다른 스레드의 잠금이 자식에 복사되지 않도록)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [
+                    executor.submit(_write_sample_sheet, omics, manifest[manifest["Omics"] == omics], out_dir)
+                    for omics in omics_list
+                ]
+                results = [future.result() for future in futures]
+        else:
+            results = []
+
+        with zipfile.ZipFile(tmp_zip, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+            for omics, file_path, n_rows in results:
+                bundle.write(file_path, arcname=os.path.basename(file_path))
+                counts[omics] = n_rows
+            bundle.writestr("manifest.json", json.dumps({
+                "sample_sheets": [
+                    {"omics": omics, "file": os.path.basename(file_path), "rows": n_rows}
+                    for omics, file_path, n_rows in results
+                ],
+                "skipped_omics": sorted(set(manifest["Omics"]) - set(SAMPLE_SHEET_SCHEMAS)),
+            }, ensure_ascii=False, indent=2))
+        os.replace(tmp_zip, zip_path)
+        return counts
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        if os.path.exists(tmp_zip):
+            os.remove(tmp_zip)
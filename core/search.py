@@ -0,0 +1,108 @@
+"""
+샘플 검색 인덱스 (SampleID/PatientID의 완전 일치, 앞부분 일치, 부분 문자열 검색)
+"""
+import numpy as np
+import pandas as pd
+
+
+def _unique_rows(rows):
+    """행 위치 배열 정렬 + 중복 제거 (np.unique보다 큰 배열에서 빠름)"""
+    rows = np.sort(rows)
+    return rows[np.concatenate(([True], rows[1:] != rows[:-1]))] if len(rows) else rows
+
+
+def _build_postings(codes, n_keys):
+    """정렬된 code 배열로 CSR 형태의 posting list (offsets, 원소 순서) 생성"""
+    order = np.argsort(codes, kind="stable")
+    offsets = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n_keys), out=offsets[1:])
+    return offsets, order
+
+
+def compute_search_index(df):
+    """
+    SampleID/PatientID 검색 인덱스
+    - exact: 소문자 key -> key id 해시 조회
+    - prefix: 정렬된 key 배열에서 이진 탐색
+    - substring: 3-gram -> key id posting list 교집합 후 확인
+    각 key id는 해당 값을 SampleID 또는 PatientID로 가진 행 위치 목록을 가리킵니다.
+    """
+    n_rows = len(df)
+    values = pd.concat([df["SampleID"], df["PatientID"]], ignore_index=True).astype(str).str.lower()
+    rows = np.concatenate([np.arange(n_rows), np.arange(n_rows)])
+    codes, keys = pd.factorize(values, sort=True)
+    keys = np.asarray(keys, dtype=object)
+    key_offsets, key_order = _build_postings(codes, len(keys))
+
+    # 3-gram posting list: (gram code, key id)를 하나의 int64로 묶어 정렬/중복 제거를 한 번에 처리
+    key_series = pd.Series(keys)
+    key_lengths = key_series.str.len().to_numpy()
+    gram_parts = []
+    gram_key_parts = []
+    for start in range(max(int(key_lengths.max(initial=0)) - 2, 0)):
+        key_ids = np.flatnonzero(key_lengths >= start + 3)
+        gram_parts.append(key_series.iloc[key_ids].str.slice(start, start + 3))
+        gram_key_parts.append(key_ids)
+    if gram_parts:
+        gram_codes, grams = pd.factorize(pd.concat(gram_parts, ignore_index=True))
+        pairs = np.sort(gram_codes.astype(np.int64) * len(keys) + np.concatenate(gram_key_parts))
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+        gram_offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs // len(keys), minlength=len(grams)), out=gram_offsets[1:])
+        gram_key_ids = pairs % len(keys)
+        gram_lookup = {gram: i for i, gram in enumerate(grams)}
+    else:
+        gram_offsets, gram_key_ids, gram_lookup = np.zeros(1, dtype=np.int64), np.array([], dtype=np.int64), {}
+
+    return {
+        "keys": keys,
+        "key_lookup": {key: i for i, key in enumerate(keys)},
+        "key_offsets": key_offsets,
+        "key_rows": rows[key_order],
+        "gram_lookup": gram_lookup,
+        "gram_offsets": gram_offsets,
+        "gram_key_ids": gram_key_ids,
+    }
+
+
+def search_sample_index(index, query, mode="prefix"):
+    """
+    검색어와 일치하는 행 위치 배열을 반환합니다.
+    mode="exact": SampleID/PatientID 완전 일치
+    mode="prefix": 앞부분 일치
+    mode="contains": 부분 문자열 일치 (3글자 미만이면 앞부분 일치로 대체)
+    """
+    query = query.strip().lower()
+    if not query:
+        return np.array([], dtype=np.int64)
+
+    if mode == "exact":
+        key_id = index["key_lookup"].get(query)
+        key_ids = np.array([] if key_id is None else [key_id], dtype=np.int64)
+    elif mode == "contains" and len(query) >= 3:
+        key_ids = None
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        postings = []
+        for gram in grams:
+            gram_id = index["gram_lookup"].get(gram)
+            if gram_id is None:
+                return np.array([], dtype=np.int64)
+            postings.append(index["gram_key_ids"][index["gram_offsets"][gram_id]:index["gram_offsets"][gram_id + 1]])
+        # 짧은 posting list부터 교집합
+        for posting in sorted(postings, key=len):
+            key_ids = posting if key_ids is None else np.intersect1d(key_ids, posting, assume_unique=True)
+            if len(key_ids) == 0:
+                break
+        if len(query) > 3:
+            key_ids = np.array([i for i in key_ids if query in index["keys"][i]], dtype=np.int64)
+    else:
+        # 앞부분이 같은 key는 정렬 배열에서 연속 구간이므로 행 위치도 한 번에 잘라냄
+        start = np.searchsorted(index["keys"], query, side="left")
+        stop = np.searchsorted(index["keys"], query + "\U0010ffff", side="left")
+        offsets = index["key_offsets"]
+        return _unique_rows(index["key_rows"][offsets[start]:offsets[stop]])
+
+    if len(key_ids) == 0:
+        return np.array([], dtype=np.int64)
+    offsets = index["key_offsets"]
+    return _unique_rows(np.concatenate([index["key_rows"][offsets[i]:offsets[i + 1]] for i in key_ids]))
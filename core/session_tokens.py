@@ -0,0 +1,159 @@
+"""
+서명된 세션 토큰
+
+로그인 후 브라우저 URL(쿼리 파라미터)에 보관하는 토큰을 만들고 검증합니다.
+토큰 = base64url(JSON payload) + "." + base64url(HMAC-SHA256 서명)
+payload: {"u": 사용자명, "iat": 발급 시각, "exp": 만료 시각, "jti": 토큰 id, "sid": 로그인 id, "auth": 로그인 시각}
+서명 키는 SESSION_SECRET 환경 변수 또는 키 파일(없으면 임시 파일에 쓴 뒤 링크하여 생성)에서 읽으므로 같은 호스트의 모든 프로세스가 공유합니다.
+
+URL 토큰은 짧게 유효하고 한 번만 사용할 수 있습니다. 사용한 토큰 id와 로그아웃한 로그인 id는 폐기 파일에 기록하며
+(파일 잠금 아래에서 읽고 임시 파일 교체로 저장), 같은 호스트의 모든 프로세스가 같은 파일을 확인하고 재시작 후에도 유지됩니다.
+"""
+import base64
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+# 키 파일의 키 길이 (secrets.token_hex(32))
+SECRET_HEX_LENGTH = 64
+
+
+def load_secret(path):
+    """
+    서명 키. SESSION_SECRET 환경 변수가 없으면 키 파일을 읽고, 파일도 없으면 새로 만듭니다.
+    키 파일이 비어 있거나 키가 짧으면 ValueError (빈 키로 서명하면 토큰을 위조할 수 있음)
+    """
+    env_secret = os.environ.get("SESSION_SECRET")
+    if env_secret:
+        return env_secret.encode()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if not os.path.exists(path):
+        # 임시 파일에 키를 모두 기록한 뒤 링크하므로 다른 프로세스는 완성된 키 파일만 봄.
+        # 여러 프로세스가 동시에 만들어도 링크는 하나만 성공하고 나머지는 그 키를 읽음
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(SECRET_HEX_LENGTH // 2))
+                f.flush()
+                os.fsync(f.fileno())
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+    with open(path, "r") as f:
+        secret = f.read().strip()
+    if len(secret) < SECRET_HEX_LENGTH:
+        raise ValueError(f"세션 키 파일이 비어 있거나 손상되었습니다. 파일을 삭제하면 새 키를 만듭니다: {path}")
+    return secret.encode()
+
+
+def issue_token(secret, username, ttl, session_id=None, auth_time=None):
+    """ttl초 동안 유효한 토큰 발급. 같은 로그인의 토큰을 교체할 때는 session_id와 로그인 시각(auth_time)을 유지"""
+    now = int(time.time())
+    payload = {
+        "u": username, "iat": now, "exp": now + int(ttl), "jti": secrets.token_hex(8),
+        "sid": session_id or secrets.token_hex(8), "auth": int(auth_time or now)
+    }
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    signature = hmac.new(secret, body.encode(), hashlib.sha256).digest()
+    return f"{body}.{_b64encode(signature)}"
+
+
+def verify_token(secret, token):
+    """서명과 만료를 확인하여 payload 반환. 잘못되었거나 만료되었으면 None"""
+    try:
+        body, signature = token.split(".", 1)
+        expected = hmac.new(secret, body.encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return None
+        payload = json.loads(_b64decode(body))
+    except (ValueError, TypeError):
+        return None
+    if payload.get("exp", 0) <= time.time():
+        return None
+    return payload
+
+
+#############################################
+# 폐기 파일 (사용한 토큰, 로그아웃한 로그인)
+#############################################
+@contextlib.contextmanager
+def _store_lock(path):
+    """같은 호스트의 프로세스/스레드 사이에서 폐기 파일 수정을 직렬화하는 파일 잠금 (<path>.lock)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _update_store(path, update):
+    """잠금 안에서 폐기 목록 {"tokens": {jti: 만료}, "sessions": {sid: 만료}}을 읽어 update로 수정하고 저장"""
+    with _store_lock(path):
+        try:
+            with open(path, "r") as f:
+                store = json.load(f)
+        except (OSError, ValueError):
+            store = {}
+        now = time.time()
+        # 만료 시각이 지난 항목은 서명 검증에서 이미 거부되므로 정리
+        store = {kind: {key: until for key, until in store.get(kind, {}).items() if until > now} for kind in ("tokens", "sessions")}
+        result = update(store)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(store, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return result
+
+
+def consume_token(path, payload, session_until):
+    """
+    토큰을 사용 처리합니다. 처음 사용하는 토큰이면 True.
+    이미 사용된 토큰이면 링크가 복사되어 다른 곳에서 쓰인 것이므로 로그인 전체(sid)를 폐기하고 False를 반환합니다.
+    """
+    def update(store):
+        if payload["sid"] in store["sessions"]:
+            return False
+        if payload["jti"] in store["tokens"]:
+            store["sessions"][payload["sid"]] = session_until
+            return False
+        store["tokens"][payload["jti"]] = payload["exp"]
+        return True
+    return _update_store(path, update)
+
+
+def revoke_session(path, payload, session_until):
+    """로그아웃: 같은 로그인(sid)에서 발급된 모든 토큰을 더 이상 받지 않음"""
+    def update(store):
+        store["sessions"][payload["sid"]] = session_until
+    _update_store(path, update)
@@ -0,0 +1,26 @@
+"""
+경로와 설정 상수
+
+app.py, views/*, cli.py와 core 모듈이 같은 경로를 쓰도록 한곳에 모아 둡니다.
+"""
+
+# 설정 및 상수
+CONFIG_FILE = "config.json"
+DATA_FILE = "data/clinical_data.xlsx"
+USER_FILE = "data/users.json"  # 확장자를 .db로 바꾸면 SQLite 저장소 사용
+SESSION_SECRET_FILE = "data/session_secret"
+SESSION_TTL_HOURS = 12  # 로그인 후 새로고침으로 복원할 수 있는 최대 시간
+SESSION_TOKEN_TTL_MINUTES = 15  # URL 토큰 유효 시간 (사용 중에는 자동 교체, 새로고침 시 1회용)
+SESSION_REVOCATION_FILE = "data/session_revocations.json"
+SESSION_PARAM = "session"
+AUDIT_LOG_FILE = "data/audit/audit.jsonl"  # 확장자를 .db로 바꾸면 SQLite에 기록
+TIMING_LOG_FILE = "data/timing/timing.jsonl"  # 처리 단계별 소요 시간 (timing_report.py로 분석)
+SAMPLE_ROOT = "/data"
+EXPORT_DIR = "data/exports"
+SCAN_CACHE_FILE = "data/sample_scan_cache.json"
+EXPORT_CACHE_DIR = "data/export_cache"
+EXPORT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+EXPORT_BUNDLE_DIR = "data/exports/bundles"
+ARTIFACT_DIR = "data/artifacts"
+PRECOMPUTE_TIME = "02:00"
+# 유효성 검사 규칙(Visit/Project/Omics/Tissue, 조합, 중복 키, Biologics 정책)은 CONFIG_FILE에 버전과 함께 저장 (core/validation_rules.py)
@@ -0,0 +1,96 @@
+"""
+처리 단계별 소요 시간 기록 (timing span)
+
+파일 읽기(read), 정리(normalize), 유효성 검사(validate), 집계 테이블/인덱스(cube), Sample ID 피벗(pivot),
+내보내기 인코딩(export) 단계가 끝날 때마다 {ts, stage, ms, rows, session, data_version, ...} 이벤트를 남깁니다.
+이벤트는 감사 로그와 같은 비동기 writer(core.audit_log)의 큐에 넣기만 하고, 백그라운드 스레드가 JSONL 파일에 모아 기록하며
+크기가 커지면 회전합니다. start_timing_log를 호출하기 전에는 기록하지 않습니다 (명령줄 도구 등).
+Streamlit/API 프로세스와 보고서 작업자 프로세스가 모두 같은 파일에 기록하며, 회전과 추가는 core.audit_log의 파일 잠금으로 직렬화되고
+작업자도 부모와 같은 회전 설정(max_bytes, backup_count)을 사용합니다.
+
+세션 ID와 데이터 버전은 bind_context로 지정하며 contextvars로 같은 스레드의 이후 span에 함께 기록됩니다.
+Streamlit은 스크립트 실행마다, 사전 계산은 작업 시작 시 지정합니다. 분석은 timing_report.py를 사용합니다.
+"""
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from datetime import datetime
+
+from core.audit_log import flush_events, log_event, start_audit_writer
+
+_context = contextvars.ContextVar("timing_context", default={})
+_state = {"path": None, "options": {}, "writer": None, "pid": None, "lock": threading.Lock()}
+
+
+def start_timing_log(path, **writer_options):
+    """이 프로세스의 span 기록을 시작하고 writer를 반환합니다 (이미 시작했으면 기존 writer)"""
+    with _state["lock"]:
+        if _state["writer"] is None or _state["path"] != path:
+            _state.update(path=path, options=writer_options, writer=start_audit_writer(path, **writer_options), pid=os.getpid())
+        return _state["writer"]
+
+
+def _get_writer():
+    """(writer, 즉시 기록 여부). 작업자 프로세스는 부모의 기록 스레드가 없으므로 새 writer를 만들고 즉시 기록"""
+    if _state["path"] is None:
+        return None, False
+    if _state["pid"] == os.getpid():
+        return _state["writer"], False
+    with _state["lock"]:
+        if _state["pid"] != os.getpid():
+            _state.update(writer=start_audit_writer(_state["path"], **_state["options"]), pid=os.getpid())
+    return _state["writer"], True
+
+
+def get_worker_initargs():
+    """spawn된 작업자 프로세스에 넘길 (기록 파일, 현재 컨텍스트, writer 설정). ProcessPoolExecutor(initializer=init_worker, initargs=...)"""
+    return _state["path"], dict(_context.get()), dict(_state["options"])
+
+
+def init_worker(path, context, writer_options=None):
+    """작업자 프로세스에서 부모와 같은 파일, 컨텍스트, 회전 설정으로 span을 기록하도록 설정 (첫 span에서 writer 생성, 즉시 기록)"""
+    if path is not None:
+        _state.update(path=path, options=writer_options or {}, writer=None, pid=None)
+    _context.set(context)
+
+
+def bind_context(**fields):
+    """이 스레드(실행 컨텍스트)에서 이후 기록되는 span에 붙일 값 (session, data_version, user 등)"""
+    _context.set({**_context.get(), **fields})
+
+
+@contextlib.contextmanager
+def timing_span(stage, **fields):
+    """
+    블록 실행 시간을 stage 이름으로 기록합니다. 블록 안에서 yield된 dict에 값을 넣으면 함께 기록됩니다.
+        with timing_span("read", source=name) as span:
+            df = ...
+            span["rows"] = len(df)
+    예외가 발생하면 status에 예외 이름을 기록하고 예외는 그대로 전달합니다.
+    """
+    writer, sync = _get_writer()
+    if writer is None:
+        yield fields
+        return
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield fields
+    except BaseException as e:
+        status = type(e).__name__
+        raise
+    finally:
+        log_event(writer, {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "stage": stage,
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            **_context.get(),
+            **fields,
+            "status": status,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+        })
+        if sync:
+            flush_events(writer)
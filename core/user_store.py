@@ -0,0 +1,154 @@
+"""
+사용자 저장소
+
+users.json(기본) 또는 SQLite(경로 확장자가 .db/.sqlite) 파일에 사용자 정보를 저장합니다.
+- 읽기: 파일 (mtime, size)가 바뀌지 않았으면 파싱한 결과를 프로세스 메모리에서 재사용
+- 쓰기: 파일 잠금으로 직렬화하고, JSON은 임시 파일에 쓴 뒤 이름을 바꿔 교체
+- add_user/delete_user는 잠금 안에서 최신 내용을 읽고 수정하므로 동시에 편집해도 변경이 사라지지 않음
+사용자 정보 형식: {username: {"password": sha256 hex, "is_admin": bool}}
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _is_sqlite(path):
+    return path.endswith((".db", ".sqlite"))
+
+
+@contextlib.contextmanager
+def _write_lock(path):
+    """같은 호스트의 프로세스/스레드 사이에서 쓰기를 직렬화하는 파일 잠금 (<path>.lock)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _copy(users):
+    return {username: dict(info) for username, info in users.items()}
+
+
+#############################################
+# 백엔드별 읽기/쓰기
+#############################################
+def _read_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_json(path, users):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(users, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, password TEXT NOT NULL, is_admin INTEGER NOT NULL)")
+    return conn
+
+
+def _read_sqlite(path):
+    with contextlib.closing(_connect(path)) as conn:
+        rows = conn.execute("SELECT username, password, is_admin FROM users ORDER BY rowid").fetchall()
+    return {username: {"password": password, "is_admin": bool(is_admin)} for username, password, is_admin in rows}
+
+
+def _write_sqlite(path, users):
+    with contextlib.closing(_connect(path)) as conn, conn:
+        conn.execute("DELETE FROM users")
+        conn.executemany(
+            "INSERT INTO users (username, password, is_admin) VALUES (?, ?, ?)",
+            [(username, info["password"], int(info["is_admin"])) for username, info in users.items()]
+        )
+
+
+def _read(path):
+    return _read_sqlite(path) if _is_sqlite(path) else _read_json(path)
+
+
+def _write(path, users):
+    if _is_sqlite(path):
+        _write_sqlite(path, users)
+    else:
+        _write_json(path, users)
+
+
+#############################################
+# 공개 함수
+#############################################
+def load_users(path):
+    """사용자 목록 (수정해도 캐시에 영향 없는 복사본). 파일이 없으면 빈 dict"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == key:
+            return _copy(cached[1])
+    users = _read(path)
+    with _cache_lock:
+        _cache[path] = (key, users)
+    return _copy(users)
+
+
+def save_users(path, users):
+    """사용자 목록 전체를 교체"""
+    with _write_lock(path):
+        _write(path, users)
+
+
+def init_users(path, default_users):
+    """저장소가 없으면 기본 사용자로 생성"""
+    with _write_lock(path):
+        if not os.path.exists(path) or (_is_sqlite(path) and not _read_sqlite(path)):
+            _write(path, default_users)
+
+
+def update_users(path, update):
+    """잠금 안에서 최신 사용자 목록을 읽어 update(users)로 수정한 뒤 저장. update의 반환값을 반환"""
+    with _write_lock(path):
+        users = _read(path) if os.path.exists(path) else {}
+        result = update(users)
+        _write(path, users)
+        return result
+
+
+def add_user(path, username, password_hash, is_admin=False):
+    """사용자 추가. 이미 있으면 추가하지 않고 False"""
+    def update(users):
+        if username in users:
+            return False
+        users[username] = {"password": password_hash, "is_admin": bool(is_admin)}
+        return True
+    return update_users(path, update)
+
+
+def delete_user(path, username):
+    """사용자 삭제. 삭제했으면 True"""
+    return update_users(path, lambda users: users.pop(username, None) is not None)
@@ -0,0 +1,236 @@
+"""
+유효성 검사 규칙
+
+Visit/Project/Omics/Tissue 허용 값, Omics-Tissue 조합, 중복 판정 키, Biologics 정책을
+config.json의 "validation_rules" 항목에 버전 번호와 함께 저장하고, 규칙에 따라 데이터를 검사합니다.
+- 읽기: 파일 (mtime, size)가 바뀌지 않았으면 파싱한 결과를 프로세스 메모리에서 재사용
+- 쓰기: 파일 잠금 안에서 최신 내용을 읽고 수정한 뒤 임시 파일 교체 (다른 설정 항목은 보존)
+- 저장할 때마다 version이 1씩 증가하며, rules_key(rules)를 캐시 키/아티팩트 이름에 사용하면
+  규칙이 바뀐 경우 유효성 검사 결과만 다시 계산됩니다.
+"""
+import contextlib
+import copy
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from core.data_loader import REQUIRED_COLUMNS
+from core.timing import timing_span
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+RULES_KEY = "validation_rules"
+
+DEFAULT_RULES = {
+    "version": 0,
+    "visits": ["Visit 1", "Visit 2", "Visit 3", "Visit 4", "Visit 5"],
+    "projects": ["COREA", "PRISM", "PRISMUK"],
+    "omics": ["Bulk Exome RNA-seq", "Bulk Total RNA-seq", "Metabolites", "SNP", "Methylation", "miRNA", "Protein", "scRNA-seq"],
+    "tissues": ["PAXgene", "PBMC", "Bronchial biopsy", "Nasal cell", "Sputum", "Plasma", "Urine", "Whole blood", "Serum", "Bronchial BAL"],
+    "omics_tissue": {
+        "Bulk Exome RNA-seq": ["PAXgene", "PBMC"],
+        "Bulk Total RNA-seq": ["Bronchial biopsy", "Nasal cell", "Sputum"],
+        "Metabolites": ["Plasma", "Urine"],
+        "Methylation": ["Whole blood"],
+        "miRNA": ["Serum"],
+        "Protein": ["Plasma", "Serum"],
+        "scRNA-seq": ["Whole blood", "Bronchial biopsy", "Bronchial BAL"],
+        "SNP": ["Whole blood"]
+    },
+    # 같은 값이면 중복으로 보는 열
+    "duplicate_keys": ["PatientID", "Visit", "Omics", "Tissue"],
+    # 이 프로젝트의 환자는 Biologics 값이 정확히 1개여야 함
+    "biologics_projects": ["PRISM"],
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _write_lock(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _read_config(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_config(path, config):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def update_config(path, update):
+    """잠금 안에서 config.json을 읽어 update(config)로 수정한 뒤 저장. update의 반환값을 반환"""
+    with _write_lock(path):
+        config = _read_config(path)
+        result = update(config)
+        _write_config(path, config)
+        return result
+
+
+def normalize_rules(rules):
+    """
+    규칙 형식을 확인하고 정리한 복사본을 반환합니다 (값 앞뒤 공백/빈 값/중복 제거).
+    Omics-Tissue 조합이 허용 Omics/Tissue 목록에 없거나 중복 키가 데이터 열이 아니면 ValueError
+    """
+    def clean(values):
+        return list(dict.fromkeys(str(v).strip() for v in values if str(v).strip()))
+
+    normalized = {
+        "version": int(rules.get("version", 0)),
+        "visits": clean(rules["visits"]),
+        "projects": clean(rules["projects"]),
+        "omics": clean(rules["omics"]),
+        "tissues": clean(rules["tissues"]),
+        "omics_tissue": {str(omics).strip(): clean(tissues) for omics, tissues in rules["omics_tissue"].items()},
+        "duplicate_keys": clean(rules["duplicate_keys"]),
+        "biologics_projects": clean(rules.get("biologics_projects", [])),
+    }
+    for key in ("visits", "projects", "omics", "tissues", "duplicate_keys"):
+        if not normalized[key]:
+            raise ValueError(f"{key} 값이 비어 있습니다.")
+    for omics, tissues in normalized["omics_tissue"].items():
+        if omics not in normalized["omics"]:
+            raise ValueError(f"Omics-Tissue 조합의 Omics '{omics}'가 허용 Omics 목록에 없습니다.")
+        unknown = [tissue for tissue in tissues if tissue not in normalized["tissues"]]
+        if unknown:
+            raise ValueError(f"Omics '{omics}'의 Tissue {', '.join(unknown)}가 허용 Tissue 목록에 없습니다.")
+    unknown_keys = [key for key in normalized["duplicate_keys"] if key not in REQUIRED_COLUMNS]
+    if unknown_keys:
+        raise ValueError(f"중복 판정 키 {', '.join(unknown_keys)}는 데이터 열이 아닙니다.")
+    return normalized
+
+
+def load_rules(path):
+    """현재 규칙 (수정해도 캐시에 영향 없는 복사본). 저장된 규칙이 없으면 기본 규칙(version 0)"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return copy.deepcopy(DEFAULT_RULES)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == key:
+            return copy.deepcopy(cached[1])
+    try:
+        stored = _read_config(path).get(RULES_KEY)
+        rules = normalize_rules(stored) if stored else copy.deepcopy(DEFAULT_RULES)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        # 손으로 잘못 고친 설정 파일은 기본 규칙으로 대체
+        rules = copy.deepcopy(DEFAULT_RULES)
+    with _cache_lock:
+        _cache[path] = (key, rules)
+    return copy.deepcopy(rules)
+
+
+def save_rules(path, rules, updated_by=None, expected_version=None):
+    """
+    규칙을 저장하고 version을 1 올린 규칙을 반환합니다.
+    expected_version이 주어졌는데 저장된 버전과 다르면(다른 관리자가 먼저 저장) 저장하지 않고 None
+    """
+    rules = normalize_rules(rules)
+
+    def update(config):
+        stored = config.get(RULES_KEY) or DEFAULT_RULES
+        current_version = int(stored.get("version", 0))
+        if expected_version is not None and current_version != expected_version:
+            return None
+        rules["version"] = current_version + 1
+        config[RULES_KEY] = rules
+        config["rules_updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        config["rules_updated_by"] = updated_by
+        return rules
+
+    return update_config(path, update)
+
+
+def rules_key(rules):
+    """캐시 키/아티팩트 이름용 규칙 식별자: 버전 + 내용 해시 (설정 파일을 직접 고쳐도 구분됨)"""
+    body = json.dumps({k: v for k, v in rules.items() if k != "version"}, sort_keys=True, ensure_ascii=False)
+    return f"v{rules['version']}-{hashlib.sha256(body.encode()).hexdigest()[:8]}"
+
+
+#############################################
+# 규칙에 따른 검사
+#############################################
+def _omics_tissue_mask(df, rules):
+    """허용 Omics/Tissue이고 허용된 조합인 행"""
+    allowed = {
+        f"{omics}\x1f{tissue}"
+        for omics, tissues in rules["omics_tissue"].items() if omics in rules["omics"]
+        for tissue in tissues if tissue in rules["tissues"]
+    }
+    pair = df["Omics"].astype("string") + "\x1f" + df["Tissue"].astype("string")
+    return pair.isin(allowed).to_numpy(dtype=bool)
+
+
+def _invalid_biologics(df, rules):
+    target = df[df["Project"].isin(rules["biologics_projects"])]
+    if target.empty:
+        return pd.DataFrame()
+    biologics_per_patient = target.groupby("PatientID")["Biologics"].nunique()
+    invalid_patients = biologics_per_patient.index[biologics_per_patient != 1]
+    if len(invalid_patients) == 0:
+        return pd.DataFrame()
+    return target[target["PatientID"].isin(invalid_patients)]
+
+
+def validate(df, rules):
+    """
+    규칙에 따른 유효성 검사 결과: 항목별 오류 레코드와 유효한 데이터
+    {"invalid_visit", "invalid_omics_tissue", "invalid_project", "duplicate_data", "invalid_biologics", "valid"}
+    """
+    with timing_span("validate", rows=len(df), rules_version=rules["version"]) as span:
+        report = _validate(df, rules)
+        span["valid_rows"] = len(report["valid"])
+    return report
+
+
+def _validate(df, rules):
+    visit_ok = df["Visit"].isin(rules["visits"]).to_numpy(dtype=bool)
+    project_ok = df["Project"].isin(rules["projects"]).to_numpy(dtype=bool)
+    pair_ok = _omics_tissue_mask(df, rules)
+
+    duplicate_keys = rules["duplicate_keys"]
+    duplicate_data = df[df.duplicated(subset=duplicate_keys, keep=False)].sort_values(by=duplicate_keys)
+
+    # 유효 데이터는 중복 키 + Biologics가 같은 행만 하나로 합침 (Biologics가 다르면 보존)
+    valid = df[visit_ok & project_ok & pair_ok]
+    valid = valid.drop_duplicates(subset=list(dict.fromkeys(duplicate_keys + ["Biologics"])), keep="first")
+
+    return {
+        "invalid_visit": df[~visit_ok],
+        "invalid_omics_tissue": df[~pair_ok],
+        "invalid_project": df[~project_ok],
+        "duplicate_data": duplicate_data,
+        "invalid_biologics": _invalid_biologics(df, rules),
+        "valid": valid,
+    }
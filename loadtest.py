@@ -0,0 +1,345 @@
+"""
+동시 세션 부하 테스트: Streamlit AppTest로 여러 가상 세션을 동시에 실행하여 재실행 지연 시간과 메모리 측정
+
+합성 데이터셋으로 임시 작업 디렉토리를 만들고, 세션 수(예: 1, 2, 4, 8)별로 각 세션을 스레드에서 동시에 실행합니다.
+모든 세션이 한 프로세스에서 실행되므로 st.cache_data/st.cache_resource와 디스크 아티팩트를 실제 서버처럼 공유합니다.
+
+세션 흐름 (단계별 재실행 시간 기록):
+  open                 첫 접속 (로그인 화면)
+  login                로그인 → 오믹스 개별 데이터 페이지
+  biologics_on/off     오믹스 개별 데이터의 PRISM Biologics 체크박스 토글
+  page_combination     오믹스 조합 데이터 페이지로 이동
+  add_combination_row  PRISM 조합 행 추가
+  page_sample_ids      샘플 ID 리스트 페이지로 이동
+  export_sample_ids    PRISM Sample ID 다운로드 형식 변경 (파일 생성)
+  page_individual      오믹스 개별 데이터 페이지로 복귀
+프로젝트 전환은 st.tabs로 브라우저에서만 바뀌고 재실행이 없으므로, 페이지를 다시 그릴 때 모든 프로젝트 탭이 함께 측정됩니다.
+사이드바 메뉴(streamlit_option_menu)는 AppTest에서 조작할 수 없어 같은 옵션의 selectbox로 바꿔서 실행합니다.
+결과는 표준 출력에, Streamlit 경고 로그는 표준 오류에 출력됩니다.
+
+사용 예:
+  python loadtest.py --sessions 1,2,4,8 --patients 2000 --rounds 3
+  python loadtest.py --sessions 4 --workdir /tmp/loadtest --json loadtest.json 2>/dev/null
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit import config as st_config
+from streamlit.runtime import Runtime
+from streamlit.testing.v1 import AppTest
+
+from core.reports import get_export_formats
+from core.settings import DATA_FILE
+from core.validation_rules import DEFAULT_RULES
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(PACKAGE_DIR, "app.py")
+BIOLOGICS = ["Mepolizumab", "Benralizumab", "Dupilumab", "Omalizumab", "Tezepelumab"]
+
+# 사이드바 option_menu를 selectbox로 바꾸고 app.py를 실행하는 AppTest 스크립트
+DRIVER_SCRIPT = '''
+import runpy
+import sys
+sys.path.insert(0, {package_dir!r})
+import streamlit as st
+import streamlit_option_menu
+
+
+def _page_menu(menu_title, options, default_index=0, **kwargs):
+    return st.selectbox(menu_title, options, index=default_index, key="loadtest_page")
+
+
+streamlit_option_menu.option_menu = _page_menu
+runpy.run_path({app_file!r}, run_name="__main__")
+'''
+
+
+#############################################
+# 합성 데이터셋
+#############################################
+def make_synthetic_data(n_patients=2000, seed=0, density=0.35, max_visits=4):
+    """
+    유효성 검사 기본 규칙(DEFAULT_RULES)을 만족하는 합성 임상 데이터.
+    환자마다 프로젝트와 방문 수(1~max_visits)를 정하고, 방문마다 Omics-Tissue 조합을 density 확률로 보유합니다.
+    """
+    rng = np.random.default_rng(seed)
+    pairs = [(omics, tissue) for omics, tissues in DEFAULT_RULES["omics_tissue"].items() for tissue in tissues]
+    projects = rng.choice(DEFAULT_RULES["projects"], size=n_patients)
+    patient_ids = np.array([f"{site:02d}-{i + 1:04d}" for i, site in enumerate(rng.integers(1, 20, size=n_patients))])
+    biologics = np.where(projects == "PRISM", rng.choice(BIOLOGICS, size=n_patients), None)
+
+    # (환자, 방문) 행
+    n_visits = rng.integers(1, max_visits + 1, size=n_patients)
+    patient_idx = np.repeat(np.arange(n_patients), n_visits)
+    visit_no = np.concatenate([np.arange(1, n + 1) for n in n_visits])
+
+    # (환자, 방문) x 조합 중 보유한 샘플
+    visit_row, pair_idx = np.nonzero(rng.random((len(patient_idx), len(pairs))) < density)
+    rows = patient_idx[visit_row]
+    return pd.DataFrame({
+        "Project": projects[rows],
+        "PatientID": patient_ids[rows],
+        # 원본 Excel과 같은 표기 (읽을 때 "V1" -> "Visit 1")
+        "Visit": [f"V{v}" for v in visit_no[visit_row]],
+        "Omics": [pairs[i][0] for i in pair_idx],
+        "Tissue": [pairs[i][1] for i in pair_idx],
+        "SampleID": [f"S{i:08d}" for i in range(len(rows))],
+        "Date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 5 * 365, size=len(rows)), unit="D"),
+        "Biologics": biologics[rows],
+    })
+
+
+def prepare_workdir(workdir, n_patients, seed):
+    """작업 디렉토리에 합성 데이터 파일(DATA_FILE)을 만듭니다. 이미 있으면 그대로 사용"""
+    data_path = os.path.join(workdir, DATA_FILE)
+    if not os.path.exists(data_path):
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        df = make_synthetic_data(n_patients, seed)
+        df.to_excel(data_path + ".tmp.xlsx", index=False, engine="xlsxwriter")
+        os.replace(data_path + ".tmp.xlsx", data_path)
+    return data_path
+
+
+#############################################
+# 가상 세션
+#############################################
+def allow_concurrent_runs():
+    """
+    AppTest.run은 실행마다 전역 설정(global.appTest)과 Runtime 인스턴스를 바꿨다가 되돌리므로,
+    여러 스레드에서 동시에 실행하면 먼저 끝난 실행이 아직 실행 중인 세션의 값을 지웁니다 (위젯 KeyError, Runtime 없음 오류).
+    프로세스가 끝날 때까지 두 값을 고정합니다.
+    """
+    st_config.set_option("global.appTest", True)
+    last = {}
+
+    def instance(cls):
+        runtime = cls._instance or last.get("runtime")
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        last["runtime"] = runtime
+        return runtime
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or "runtime" in last)
+
+
+def new_session(timeout=120):
+    """새 브라우저 세션에 해당하는 AppTest (세션 상태는 독립, 캐시는 프로세스 내 공유)"""
+    return AppTest.from_string(DRIVER_SCRIPT.format(package_dir=PACKAGE_DIR, app_file=APP_FILE), default_timeout=timeout)
+
+
+def timed_run(at, step, samples, action=None):
+    """action(at)으로 위젯을 조작한 뒤 재실행하고 (step, 초, 오류) 기록. 예외 요소가 있으면 오류로 기록"""
+    started = time.perf_counter()
+    error = None
+    try:
+        if action is None:
+            at.run()
+        else:
+            action(at).run()
+        if at.exception:
+            error = at.exception[0].message
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    samples.append((step, time.perf_counter() - started, error))
+    return error is None
+
+
+def login(at, username, password, samples):
+    """로그인 화면을 열고 로그인"""
+    if not timed_run(at, "open", samples):
+        return False
+    at.text_input[0].input(username)
+    at.text_input[1].input(password)
+    return timed_run(at, "login", samples, lambda at: at.button(key="login_button").click())
+
+
+def select_page(page):
+    return lambda at: at.sidebar.selectbox(key="loadtest_page").select(page)
+
+
+def select_export_format(key, round_no):
+    """라운드마다 다른 다운로드 형식 선택 (형식별로 처음 한 번은 파일 생성)"""
+    def action(at):
+        selectbox = at.selectbox(key=key)
+        formats = [fmt for fmt in get_export_formats() if fmt != selectbox.value]
+        return selectbox.select(formats[round_no % len(formats)])
+    return action
+
+
+def run_session(username, password, rounds, samples, timeout=120, start_barrier=None, sessions=None):
+    """가상 세션 하나의 흐름. sessions가 주어지면 메모리 측정이 끝날 때까지 AppTest를 보관"""
+    at = new_session(timeout)
+    if sessions is not None:
+        sessions.append(at)
+    if start_barrier is not None:
+        start_barrier.wait()
+    if not login(at, username, password, samples):
+        return
+    for round_no in range(rounds):
+        steps = [
+            ("biologics_on", lambda at: at.checkbox(key="biologics_check").check()),
+            ("biologics_off", lambda at: at.checkbox(key="biologics_check").uncheck()),
+            ("page_combination", select_page("오믹스 조합 데이터")),
+            ("add_combination_row", lambda at: at.button(key="add_row_PRISM").click()),
+            ("page_sample_ids", select_page("샘플 ID 리스트")),
+            ("export_sample_ids", select_export_format("download_sample_id_PRISM_fmt", round_no)),
+            ("page_individual", select_page("오믹스 개별 데이터")),
+        ]
+        for step, action in steps:
+            if not timed_run(at, step, samples, action):
+                return
+
+
+#############################################
+# 측정과 보고
+#############################################
+def rss_mb():
+    """현재 프로세스 RSS (MB). /proc이 없으면 최대 RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def summarize(samples):
+    """단계별 지연 시간 백분위수 (ms)"""
+    steps = {}
+    for step, seconds, error in samples:
+        entry = steps.setdefault(step, {"times": [], "errors": []})
+        entry["times"].append(seconds * 1000)
+        if error is not None:
+            entry["errors"].append(error)
+    total = {
+        "times": [seconds * 1000 for _, seconds, _ in samples],
+        "errors": [error for _, _, error in samples if error is not None],
+    }
+    summary = {}
+    for step, entry in list(steps.items()) + [("(all)", total)]:
+        times = np.array(entry["times"])
+        summary[step] = {
+            "n": len(times),
+            "p50_ms": round(float(np.percentile(times, 50)), 1),
+            "p90_ms": round(float(np.percentile(times, 90)), 1),
+            "p99_ms": round(float(np.percentile(times, 99)), 1),
+            "max_ms": round(float(times.max()), 1),
+            "errors": len(entry["errors"]),
+        }
+        if entry["errors"] and step != "(all)":
+            summary[step]["first_error"] = entry["errors"][0]
+    return summary
+
+
+def run_level(n_sessions, username, password, rounds, timeout):
+    """세션 n개를 동시에 실행하고 단계별 백분위수와 메모리 반환"""
+    gc.collect()
+    rss_before = rss_mb()
+    samples, sessions = [], []
+    barrier = threading.Barrier(n_sessions)
+    threads = [
+        threading.Thread(target=run_session, args=(username, password, rounds, samples, timeout, barrier, sessions))
+        for _ in range(n_sessions)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    # 세션 상태가 살아 있는 동안 측정
+    gc.collect()
+    rss_after = rss_mb()
+    del sessions
+    errors = sum(1 for _, _, error in samples if error is not None)
+    return {
+        "sessions": n_sessions,
+        "requests": len(samples),
+        "errors": errors,
+        "wall_seconds": round(wall, 2),
+        "rss_mb": round(rss_after, 1),
+        "rss_delta_per_session_mb": round((rss_after - rss_before) / n_sessions, 2),
+        "steps": summarize(samples),
+    }
+
+
+def print_report(results):
+    print(f"{'sessions':>8}  {'step':<20} {'n':>4} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>6}")
+    for result in results:
+        for step, stats in result["steps"].items():
+            print(
+                f"{result['sessions']:>8}  {step:<20} {stats['n']:>4} {stats['p50_ms']:>9.1f} {stats['p90_ms']:>9.1f} "
+                f"{stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f} {stats['errors']:>6}"
+            )
+        print(
+            f"{result['sessions']:>8}  wall {result['wall_seconds']}s, RSS {result['rss_mb']} MB "
+            f"({result['rss_delta_per_session_mb']:+} MB/session), errors {result['errors']}"
+        )
+        for step, stats in result["steps"].items():
+            if "first_error" in stats:
+                print(f"{'':>8}  {step}: {stats['first_error']}")
+        print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streamlit AppTest 동시 세션 부하 테스트 (합성 데이터)")
+    parser.add_argument("--sessions", default="1,2,4,8", help="동시 세션 수 목록 (기본: 1,2,4,8)")
+    parser.add_argument("--rounds", type=int, default=3, help="세션마다 흐름 반복 횟수 (기본: 3)")
+    parser.add_argument("--patients", type=int, default=2000, help="합성 데이터 환자 수 (기본: 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드")
+    parser.add_argument("--workdir", help="작업 디렉토리 (기본: 임시 디렉토리, 종료 시 삭제). 있으면 데이터 파일 재사용")
+    parser.add_argument("--username", default="admin", help="로그인 사용자 (기본: 초기 관리자 계정)")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--timeout", type=float, default=120, help="재실행 1회 제한 시간 (초)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+    levels = [int(n) for n in args.sessions.split(",")]
+    allow_concurrent_runs()
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="omics_loadtest_"))
+    os.makedirs(workdir, exist_ok=True)
+    json_path = os.path.abspath(args.json) if args.json else None
+    try:
+        # 앱의 상대 경로(data/, config.json)가 작업 디렉토리를 가리키도록 이동.
+        # 스케줄러 스레드도 같은 상대 경로를 쓰므로 종료할 때까지 원래 디렉토리로 돌아가지 않음
+        os.chdir(workdir)
+        started = time.perf_counter()
+        prepare_workdir(workdir, args.patients, args.seed)
+        print(f"workdir {workdir}, data ready in {time.perf_counter() - started:.1f}s")
+
+        # 워밍업: 스냅샷 게시, 사전 계산, 페이지 import (측정에서 제외)
+        warmup = []
+        started = time.perf_counter()
+        run_session(args.username, args.password, 1, warmup, args.timeout)
+        warmup_errors = [error for _, _, error in warmup if error is not None]
+        print(f"warm-up session {time.perf_counter() - started:.1f}s, RSS {rss_mb():.1f} MB")
+        if warmup_errors:
+            print(f"warm-up failed: {warmup_errors[0]}")
+            return 1
+
+        results = [run_level(n, args.username, args.password, args.rounds, args.timeout) for n in levels]
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print_report(results)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"patients": args.patients, "rounds": args.rounds, "results": results}, f, ensure_ascii=False, indent=2)
+    return 1 if any(result["errors"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
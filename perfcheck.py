@@ -0,0 +1,39 @@
+"""
+화면 조작 지연 시간 회귀 검사 (배포 전 검사용 명령줄 래퍼)
+
+검사 내용, 참조 데이터와 예산(BUDGETS_MS)은 tests/test_perf.py에 있으며 이 스크립트는 pytest로 그 파일만 실행합니다.
+종료 코드는 pytest와 같습니다.
+  0: 모든 조작이 예산 이내
+  1: 예산 초과 또는 실행 오류
+  그 외: pytest 사용 오류, --only로 선택된 조작 없음(5) 등
+
+사용 예:
+  python perfcheck.py
+  python perfcheck.py --repeat 10 --budget add_combination_row=3000 --only add_combination_row
+  python perfcheck.py --junitxml perfcheck.xml    # 나머지 인자는 pytest에 그대로 전달
+"""
+import argparse
+import os
+import sys
+
+import pytest
+
+TEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "test_perf.py")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="위젯 조작별 재실행 시간 회귀 검사 (tests/test_perf.py 실행)")
+    parser.add_argument("--repeat", type=int, default=5, help="조작별 반복 횟수 (워밍업 1회 제외, 기본: 5)")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS", help="조작별 예산 변경 (여러 번 지정 가능)")
+    parser.add_argument("--only", action="append", metavar="NAME", help="지정한 조작만 검사 (tests/test_perf.py의 BUDGETS_MS 이름)")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    options = [TEST_FILE, "-m", "perf", f"--perf-repeat={args.repeat}"]
+    options += [f"--perf-budget={budget}" for budget in args.budget]
+    if args.only:
+        options += ["-k", " or ".join(args.only)]
+    return int(pytest.main(options + pytest_args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(cli.py, api.py, loadtest.py, core, views)을 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "화면 조작 지연 시간 검사 (tests/test_perf.py)")
+    group.addoption("--perf-repeat", type=int, default=5, help="조작별 반복 횟수 (워밍업 1회 제외, 기본: 5)")
+    group.addoption("--perf-budget", action="append", default=[], metavar="NAME=MS", help="조작별 예산 변경 (여러 번 지정 가능)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: 참조 데이터에서의 화면 조작 지연 시간 검사 (-m \"not perf\"로 건너뜀)")
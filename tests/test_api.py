@@ -0,0 +1,123 @@
+"""
+api.py: 합성 데이터로 실제 서버(create_server(port=0))를 띄워 JSON/Arrow 응답과 ETag/304 동작 확인
+"""
+import json
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pyarrow as pa
+import pytest
+
+from api import create_server, main
+from core.settings import DATA_FILE
+from core.validation_rules import DEFAULT_RULES
+from loadtest import make_synthetic_data, prepare_workdir
+
+
+@pytest.fixture(scope="module")
+def base_url(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("api")
+    prepare_workdir(str(workdir), n_patients=200, seed=0)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    server = create_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    os.chdir(cwd)
+
+
+def get(url, headers=None):
+    """(상태 코드, 헤더, 본문 bytes). 4xx/5xx/304도 예외 없이 반환"""
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_version_and_not_modified(base_url):
+    status, headers, body = get(base_url + "/api/version")
+    assert status == 200
+    version = json.loads(body)
+    assert version["rows"] > 0
+    etag = headers["ETag"]
+    assert etag.startswith(f'"{version["data_version"]}-')
+
+    status, headers, body = get(base_url + "/api/version", {"If-None-Match": etag})
+    assert status == 304
+    assert body == b""
+    assert headers["ETag"] == etag
+
+
+def test_counts(base_url):
+    status, headers, body = get(base_url + "/api/counts?kind=cohort&name=PRISM")
+    assert status == 200
+    assert headers["Content-Type"].startswith("application/json")
+    rows = json.loads(body)
+    assert isinstance(rows, list) and rows
+
+    # 파라미터 순서가 달라도 같은 ETag
+    _, headers_a, _ = get(base_url + "/api/counts?kind=cohort&name=PRISM")
+    _, headers_b, _ = get(base_url + "/api/counts?name=PRISM&kind=cohort")
+    assert headers_a["ETag"] == headers_b["ETag"]
+
+
+def test_combination(base_url):
+    omics, tissues = next(iter(DEFAULT_RULES["omics_tissue"].items()))
+    feature = f"{omics} ({tissues[0]})"
+    query = urllib.parse.urlencode({"project": "PRISM", "feature": feature, "patients": "1"})
+    status, _, body = get(f"{base_url}/api/combination?{query}")
+    assert status == 200
+    result = json.loads(body)
+    assert result["total"] == result["by_project"]["PRISM"] == len(result["patients"]) > 0
+
+
+def test_sample_ids_arrow(base_url):
+    status, headers, body = get(base_url + "/api/sample-ids?project=PRISM&format=arrow")
+    assert status == 200
+    assert headers["Content-Type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.num_rows > 0
+    assert "PatientID" in table.column_names
+
+
+def test_errors(base_url):
+    assert get(base_url + "/api/counts?kind=unknown&name=PRISM")[0] == 400
+    assert get(base_url + "/api/counts?kind=cohort&name=PRISM&NoSuchColumn=1")[0] == 400
+    assert get(base_url + "/api/version?format=arrow")[0] == 406
+    assert get(base_url + "/api/unknown")[0] == 404
+
+
+def test_unknown_names_not_found(base_url):
+    assert get(base_url + "/api/counts?kind=cohort&name=NOSUCH")[0] == 404
+    assert get(base_url + "/api/counts?kind=omics&name=PRISM")[0] == 404
+    assert get(base_url + "/api/sample-ids?project=NOSUCH")[0] == 404
+    omics, tissues = next(iter(DEFAULT_RULES["omics_tissue"].items()))
+    query = urllib.parse.urlencode({"project": "NOSUCH", "feature": f"{omics} ({tissues[0]})"})
+    assert get(f"{base_url}/api/combination?{query}")[0] == 404
+
+
+@pytest.mark.parametrize("host", ["0.0.0.0", "192.168.0.10", "example.com", "::"])
+def test_refuses_non_loopback_host(host):
+    with pytest.raises(ValueError):
+        create_server(host=host, port=0)
+    with pytest.raises(SystemExit) as e:
+        main(["--host", host])
+    assert e.value.code == 2
+
+
+def test_etag_changes_with_data(base_url):
+    _, headers, _ = get(base_url + "/api/version")
+    etag = headers["ETag"]
+    make_synthetic_data(n_patients=150, seed=1).to_excel(DATA_FILE, index=False, engine="xlsxwriter")
+
+    status, headers, body = get(base_url + "/api/version", {"If-None-Match": etag})
+    assert status == 200
+    assert headers["ETag"] != etag
+    assert json.loads(body)["data_version"] not in etag
@@ -0,0 +1,31 @@
+"""
+core/audit_log.py: 여러 프로세스가 같은 JSONL 파일에 기록하며 회전해도 이벤트가 빠지지 않는지 확인
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from core.audit_log import flush_events, log_event, read_events, start_audit_writer
+
+N_PROCESSES = 8
+N_EVENTS = 500
+
+
+def write_events(path, worker):
+    """작업자 프로세스: 이벤트마다 바로 기록하여 작은 max_bytes로 자주 회전시키고 (dropped, written) 반환"""
+    writer = start_audit_writer(path, flush_interval=60, max_bytes=2048, backup_count=90)
+    for i in range(N_EVENTS):
+        log_event(writer, {"worker": worker, "seq": i})
+        flush_events(writer)
+    return writer["dropped"], writer["written"]
+
+
+def test_concurrent_rotation_keeps_every_event(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    with ProcessPoolExecutor(max_workers=N_PROCESSES, mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = list(executor.map(write_events, [path] * N_PROCESSES, range(N_PROCESSES)))
+
+    assert all(dropped == 0 and written == N_EVENTS for dropped, written in results)
+    events = read_events(path, limit=N_PROCESSES * N_EVENTS + 1)
+    assert sorted((event["worker"], event["seq"]) for event in events) == [
+        (worker, seq) for worker in range(N_PROCESSES) for seq in range(N_EVENTS)
+    ]
@@ -0,0 +1,93 @@
+"""
+cli.py 종료 코드와 JSON 출력 (실제 프로세스로 실행)
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from loadtest import make_synthetic_data
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cli.py")
+
+
+def run_cli(*args, cwd):
+    proc = subprocess.run([sys.executable, CLI, *args], cwd=cwd, capture_output=True, text=True)
+    return proc.returncode, json.loads(proc.stdout)
+
+
+def test_corrupt_xlsx_returns_json_error(tmp_path):
+    corrupt = tmp_path / "corrupt.xlsx"
+    corrupt.write_bytes(b"PK\x03\x04 not really a workbook")
+    code, result = run_cli("validate", str(corrupt), cwd=tmp_path)
+    assert code == 2
+    assert result["error"]
+    assert result["type"] == "BadZipFile"
+
+
+def test_missing_file_returns_json_error(tmp_path):
+    code, result = run_cli("counts", str(tmp_path / "missing.xlsx"), cwd=tmp_path)
+    assert code == 2
+    assert "error" in result
+
+
+def test_counts(tmp_path):
+    df = make_synthetic_data(n_patients=50, seed=1)
+    data_path = tmp_path / "data.csv"
+    df.to_csv(data_path, index=False)
+    code, result = run_cli("counts", str(data_path), "--kind", "cohort", "--name", "PRISM", cwd=tmp_path)
+    assert code == 0
+    assert "error" not in result
+    assert result["rows"] == len(df)
+
+    # 합성 데이터에서 직접 센 (Omics, Tissue)별 방문별/전체 환자 수와 비교
+    prism = df[df["Project"] == "PRISM"].assign(Visit=lambda d: "Visit " + d["Visit"].str[1:])
+    visits = sorted(prism["Visit"].unique())
+    expected = [
+        {
+            "Omics": omics, "Tissue": tissue,
+            **{visit: int(group.loc[group["Visit"] == visit, "PatientID"].nunique()) for visit in visits},
+            "Total": int(group["PatientID"].nunique()),
+        }
+        for (omics, tissue), group in prism.groupby(["Omics", "Tissue"])
+    ]
+    [table] = result["tables"]
+    assert (table["kind"], table["name"]) == ("cohort", "PRISM")
+    assert table["rows"] == expected
+
+
+def test_validate_reports_invalid_rows(tmp_path):
+    df = make_synthetic_data(n_patients=50, seed=1)
+    row = df.iloc[0]
+    invalid = pd.DataFrame([
+        # 규칙에 없는 방문 2건
+        {**row, "Project": "COREA", "PatientID": "99-9001", "Visit": "V9", "Biologics": None},
+        {**row, "Project": "COREA", "PatientID": "99-9002", "Visit": "V9", "Biologics": None},
+        # 규칙에 없는 프로젝트 1건
+        {**row, "Project": "UNKNOWN", "PatientID": "99-9003", "Biologics": None},
+        # 허용되지 않는 Omics-Tissue 조합 1건
+        {**row, "Project": "COREA", "PatientID": "99-9004", "Omics": "SNP", "Tissue": "Urine", "Biologics": None},
+        # 한 환자에 Biologics 2종 (PRISM) 2건
+        {**row, "Project": "PRISM", "PatientID": "99-9005", "Visit": "V1", "Biologics": "Mepolizumab"},
+        {**row, "Project": "PRISM", "PatientID": "99-9005", "Visit": "V2", "Biologics": "Dupilumab"},
+    ])
+    # 기존 행과 중복 1건 (원본 행과 함께 2건)
+    data = pd.concat([df, invalid, df.iloc[[0]]], ignore_index=True)
+    data_path = tmp_path / "data.csv"
+    data.to_csv(data_path, index=False)
+
+    code, result = run_cli("validate", str(data_path), cwd=tmp_path)
+    assert code == 1
+    assert result["ok"] is False
+    assert result["rows"] == len(data)
+    assert result["checks"] == {
+        "invalid_visit": 2,
+        "invalid_omics_tissue": 1,
+        "invalid_project": 1,
+        "duplicate_data": 2,
+        "invalid_biologics": 2,
+    }
+    # 유효 행: 원본 + Biologics 행 2건 (중복은 하나로 합침)
+    assert result["valid_rows"] == len(df) + 2
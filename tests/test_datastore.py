@@ -0,0 +1,50 @@
+"""
+core/datastore.py: 합성 Excel 파일로 스냅샷 게시와 게시 실패 시 원본 직접 읽기 확인
+"""
+import os
+
+import pytest
+
+from core import datastore
+from core.settings import DATA_FILE
+from loadtest import make_synthetic_data
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """숫자와 문자가 섞인 추가 컬럼(Note)이 있는 데이터 파일을 만들고 그 디렉토리로 이동"""
+    df = make_synthetic_data(50, seed=2)
+    df["Note"] = [12 if i % 3 == 0 else "abc" if i % 3 == 1 else None for i in range(len(df))]
+    os.makedirs(tmp_path / os.path.dirname(DATA_FILE))
+    df.to_excel(tmp_path / DATA_FILE, index=False, engine="xlsxwriter")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(datastore, "_publish_failures", {})
+    return df
+
+
+def test_publish_mixed_type_column(workdir):
+    pointer = datastore.get_current_pointer()
+    assert pointer["data_version"] == datastore.get_data_version()
+
+    df = datastore.load_snapshot(pointer["data_version"], pointer["source_sha256"])
+    assert len(df) == len(workdir)
+    assert df["Note"].iloc[:2].tolist() == ["12", "abc"]
+    assert df["Note"].isna().sum() == workdir["Note"].isna().sum()
+
+
+def test_publish_failure_falls_back_to_source(workdir, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(datastore, "save_artifact", fail)
+    with pytest.raises(datastore.SnapshotPublishError):
+        datastore.get_current_pointer()
+
+    # 잠시 동안은 원본을 다시 파싱하지 않고 바로 실패
+    monkeypatch.setattr(datastore, "publish_data_snapshot", lambda: pytest.fail("다시 게시하면 안 됨"))
+    with pytest.raises(datastore.SnapshotPublishError):
+        datastore.get_current_pointer()
+
+    df, data_version = datastore.read_current_data()
+    assert data_version == datastore.get_data_version()
+    assert len(df) == len(workdir)
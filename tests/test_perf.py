@@ -0,0 +1,120 @@
+"""
+화면 조작 지연 시간 회귀 검사: 참조 합성 데이터에서 위젯 조작별 재실행 시간이 예산 안에 있는지 확인
+
+loadtest.py와 같은 합성 데이터(환자 2000명, 시드 0)와 AppTest 세션으로 아래 조작을 반복 실행합니다.
+조작마다 첫 실행(캐시 생성)은 제외하고 반복 실행 시간의 중앙값을 예산(ms)과 비교합니다.
+  biologics_toggle     오믹스 개별 데이터에서 PRISM Biologics 체크박스 켜기/끄기
+  add_combination_row  오믹스 조합 데이터에서 PRISM 조합 행 추가
+  sample_id_tab        샘플 ID 리스트로 이동하여 PRISM Sample ID 탭 표시
+PRISM 탭 전환 자체는 브라우저에서만 일어나므로(st.tabs) 샘플 ID 리스트 페이지로 이동하는 재실행으로 측정합니다.
+
+perf 마커가 붙어 있으므로 느린 환경에서는 python -m pytest -m "not perf"로 건너뜁니다.
+반복 횟수와 예산은 --perf-repeat, --perf-budget NAME=MS로 바꿀 수 있습니다 (perfcheck.py 참고).
+"""
+import multiprocessing
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from loadtest import login, new_session, prepare_workdir, select_page, timed_run
+
+pytestmark = pytest.mark.perf
+
+# 예산 기준 참조 데이터
+N_PATIENTS = 2000
+SEED = 0
+
+# 참조 데이터에서의 재실행 시간 예산 (중앙값, ms)
+BUDGETS_MS = {
+    "biologics_toggle": 400,
+    "add_combination_row": 2000,  # 행 추가 후 st.rerun으로 페이지가 두 번 실행됨
+    "sample_id_tab": 400,
+}
+
+
+def _toggle_biologics(at):
+    checkbox = at.checkbox(key="biologics_check")
+    return checkbox.uncheck() if checkbox.value else checkbox.check()
+
+
+INTERACTIONS = {
+    # 이름: (준비 조작 목록, 측정할 조작)
+    "biologics_toggle": ([select_page("오믹스 개별 데이터")], _toggle_biologics),
+    "add_combination_row": ([select_page("오믹스 조합 데이터")], lambda at: at.button(key="add_row_PRISM").click()),
+    "sample_id_tab": ([select_page("오믹스 개별 데이터")], select_page("샘플 ID 리스트")),
+}
+
+
+def measure(at, name, repeat):
+    """조작을 1회(워밍업) + repeat회 실행하고 반복 실행 시간(ms) 목록 반환. 실행 오류가 있으면 (None, 오류)"""
+    setup, action = INTERACTIONS[name]
+    times = []
+    for i in range(repeat + 1):
+        samples = []
+        for step in setup:
+            if not timed_run(at, f"{name}_setup", samples, step):
+                return None, samples[-1][2]
+        if not timed_run(at, name, samples, action):
+            return None, samples[-1][2]
+        if i > 0:
+            times.append(samples[-1][1] * 1000)
+    return times, None
+
+
+def get_budgets(config):
+    """BUDGETS_MS에 --perf-budget NAME=MS 값을 반영한 예산"""
+    budgets = dict(BUDGETS_MS)
+    for value in config.getoption("perf_budget"):
+        name, _, ms = value.partition("=")
+        if name not in BUDGETS_MS or not ms:
+            raise pytest.UsageError(f"--perf-budget는 NAME=MS 형식이어야 합니다 (NAME: {', '.join(BUDGETS_MS)})")
+        budgets[name] = float(ms)
+    return budgets
+
+
+# 작업자 프로세스의 로그인된 AppTest 세션 (또는 준비 중 오류)
+_worker = {}
+
+
+def _init_worker(workdir):
+    """
+    작업자 프로세스: 앱의 상대 경로(data/, config.json)가 작업 디렉토리를 가리키도록 이동하고 참조 데이터로 로그인.
+    앱의 스케줄러/사전 계산 스레드는 테스트가 끝난 뒤에도 상대 경로로 기록하므로 별도 프로세스에서 실행하고 종료합니다.
+    """
+    os.chdir(workdir)
+    prepare_workdir(workdir, N_PATIENTS, SEED)
+    at = new_session()
+    samples = []
+    if not login(at, "admin", "admin123", samples):
+        _worker["error"] = f"login: {samples[-1][2]}"
+    elif not at.session_state["authenticated"]:
+        _worker["error"] = "login: 로그인 실패"
+    else:
+        _worker["at"] = at
+
+
+def _measure_in_worker(name, repeat):
+    if "error" in _worker:
+        return None, _worker["error"]
+    return measure(_worker["at"], name, repeat)
+
+
+@pytest.fixture(scope="module")
+def app_worker(tmp_path_factory):
+    """참조 데이터로 로그인한 세션을 가진 작업자 프로세스 (spawn, 모듈 내 조작이 같은 세션과 캐시를 공유)"""
+    workdir = str(tmp_path_factory.mktemp("perf"))
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker, initargs=(workdir,)
+    ) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("name", list(BUDGETS_MS))
+def test_interaction_within_budget(app_worker, name, request):
+    budget = get_budgets(request.config)[name]
+    times, error = app_worker.submit(_measure_in_worker, name, request.config.getoption("perf_repeat")).result()
+    assert error is None, error
+    median = statistics.median(times)
+    assert median <= budget, f"{name}: 중앙값 {median:.1f} ms > 예산 {budget:.1f} ms (최대 {max(times):.1f} ms)"
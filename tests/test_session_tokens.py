@@ -0,0 +1,38 @@
+"""
+core/session_tokens.py: 서명 키 파일 생성과 손상된 키 파일 거부 확인
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.session_tokens import SECRET_HEX_LENGTH, issue_token, load_secret, verify_token
+
+
+@pytest.fixture(autouse=True)
+def no_env_secret(monkeypatch):
+    monkeypatch.delenv("SESSION_SECRET", raising=False)
+
+
+def test_concurrent_create_shares_one_key(tmp_path):
+    path = str(tmp_path / "keys" / "session.key")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        keys = set(executor.map(lambda _: load_secret(path), range(32)))
+    assert len(keys) == 1
+    assert len(keys.pop()) == SECRET_HEX_LENGTH
+    assert os.listdir(tmp_path / "keys") == ["session.key"]
+
+
+@pytest.mark.parametrize("content", ["", "abc\n"])
+def test_short_key_file_is_rejected(tmp_path, content):
+    path = tmp_path / "session.key"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        load_secret(str(path))
+
+
+def test_token_round_trip(tmp_path):
+    secret = load_secret(str(tmp_path / "session.key"))
+    payload = verify_token(secret, issue_token(secret, "alice", ttl=60))
+    assert payload["u"] == "alice"
+    assert verify_token(b"other", issue_token(secret, "alice", ttl=60)) is None
@@ -0,0 +1,46 @@
+"""
+core/timing.py: 부모 프로세스와 spawn된 작업자가 같은 파일에 span을 기록하며 회전해도 모두 읽히는지 확인
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from core import timing
+from core.audit_log import flush_events
+from timing_report import read_spans
+
+N_WORKERS = 4
+N_SPANS = 200
+
+
+def record_spans(worker):
+    """작업자 프로세스: span마다 즉시 기록 (init_worker로 부모의 파일/설정 사용)"""
+    for i in range(N_SPANS):
+        with timing.timing_span("pivot", worker=worker, seq=i):
+            pass
+    return worker
+
+
+def test_worker_spans_share_rotated_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(timing, "_state", {"path": None, "options": {}, "writer": None, "pid": None, "lock": threading.Lock()})
+    path = str(tmp_path / "timing.jsonl")
+    writer = timing.start_timing_log(path, flush_interval=0.01, max_bytes=4096, backup_count=90)
+    timing.bind_context(session="test")
+
+    with ProcessPoolExecutor(
+        max_workers=N_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+        initializer=timing.init_worker, initargs=timing.get_worker_initargs()
+    ) as executor:
+        futures = [executor.submit(record_spans, worker) for worker in range(N_WORKERS)]
+        # 작업자가 기록하는 동안 부모도 같은 파일에 기록
+        for i in range(N_SPANS):
+            with timing.timing_span("export", worker=-1, seq=i):
+                pass
+        assert sorted(future.result() for future in futures) == list(range(N_WORKERS))
+    flush_events(writer)
+
+    spans = read_spans(path)
+    assert writer["dropped"] == 0
+    assert len(spans) == (N_WORKERS + 1) * N_SPANS
+    assert (spans["session"] == "test").all()
+    assert spans.groupby("worker")["seq"].nunique().to_dict() == {worker: N_SPANS for worker in range(-1, N_WORKERS)}
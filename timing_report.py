@@ -0,0 +1,132 @@
+"""
+처리 시간 기록(TIMING_LOG_FILE) 분석: 단계별 소요 시간 합계, 비중, 백분위수
+
+core/timing.py가 기록한 span(read, normalize, validate, cube, pivot, export)을 회전된 파일(.1, .2, ...)까지 읽어
+단계별(또는 단계 x 세션/데이터 버전/테이블 종류 등)로 집계합니다. 앱이 실행 중이어도 읽을 수 있습니다.
+  total_s     합계 시간 (초)        share     전체 span 시간 중 비중 (%)
+  p50/p90/p99/max_ms                    ms_per_1k_rows  입력 1,000행당 시간
+
+사용 예:
+  python timing_report.py
+  python timing_report.py --since 2026-10-01 --by kind
+  python timing_report.py --stage export --by fmt --slowest 10
+  python timing_report.py data/timing/timing.jsonl --by session --json timing_summary.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+from core.settings import TIMING_LOG_FILE
+
+GROUP_FIELDS = ["session", "data_version", "user", "kind", "name", "fmt", "source", "pid"]
+
+
+def read_spans(path):
+    """회전된 파일을 포함한 모든 span을 오래된 순서로 읽어 DataFrame으로 반환 (읽을 수 없는 줄은 건너뜀)"""
+    files = [f"{path}.{i}" for i in range(99, 0, -1) if os.path.exists(f"{path}.{i}")]
+    if os.path.exists(path):
+        files.append(path)
+    spans = []
+    for file_path in files:
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    df = pd.DataFrame(spans)
+    if df.empty:
+        return df
+    df["ts"] = pd.to_datetime(df["ts"], errors="coerce")
+    for column in ["rows", "status"] + GROUP_FIELDS:
+        if column not in df.columns:
+            df[column] = None
+    return df
+
+
+def filter_spans(df, since=None, until=None, stages=None, session=None, data_version=None):
+    if since:
+        df = df[df["ts"] >= pd.Timestamp(since)]
+    if until:
+        df = df[df["ts"] < pd.Timestamp(until)]
+    if stages:
+        df = df[df["stage"].isin(stages)]
+    if session:
+        df = df[df["session"] == session]
+    if data_version:
+        df = df[df["data_version"] == data_version]
+    return df
+
+
+def summarize(df, by=()):
+    """단계(+ by 컬럼)별 횟수, 합계, 비중, 백분위수, 입력 1,000행당 시간. 합계가 큰 순서"""
+    keys = ["stage"] + list(by)
+    work = df.assign(
+        rows=pd.to_numeric(df["rows"], errors="coerce"),
+        error=df["status"].fillna("ok") != "ok",
+    )
+    # groupby는 None 키를 버리므로 빈 값은 "-"로 표시
+    work[keys] = work[keys].astype(object).where(work[keys].notna(), "-").astype(str)
+    grouped = work.groupby(keys)
+    summary = pd.DataFrame({
+        "count": grouped.size(),
+        "total_s": grouped["ms"].sum() / 1000,
+        "p50_ms": grouped["ms"].quantile(0.5),
+        "p90_ms": grouped["ms"].quantile(0.9),
+        "p99_ms": grouped["ms"].quantile(0.99),
+        "max_ms": grouped["ms"].max(),
+        "median_rows": grouped["rows"].median(),
+        "ms_per_1k_rows": grouped["ms"].sum() / grouped["rows"].sum().where(lambda rows: rows > 0) * 1000,
+        "errors": grouped["error"].sum(),
+    })
+    summary.insert(2, "share", summary["total_s"] / summary["total_s"].sum() * 100)
+    return summary.sort_values("total_s", ascending=False).reset_index()
+
+
+def slowest_spans(df, n):
+    columns = [c for c in ["ts", "stage", "ms", "rows", "session", "data_version", "kind", "name", "fmt", "source", "status"] if c in df.columns]
+    return df.nlargest(n, "ms")[columns]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="처리 단계별 소요 시간(span) 로그 분석")
+    parser.add_argument("path", nargs="?", default=TIMING_LOG_FILE, help=f"span 로그 파일 (기본: {TIMING_LOG_FILE})")
+    parser.add_argument("--since", help="이 시각 이후 (예: 2026-10-01 또는 '2026-10-01 09:00')")
+    parser.add_argument("--until", help="이 시각 이전")
+    parser.add_argument("--stage", action="append", help="단계 (여러 번 지정 가능)")
+    parser.add_argument("--session", help="세션 ID (precompute, nightly, api 포함)")
+    parser.add_argument("--data-version", help="데이터 버전")
+    parser.add_argument("--by", action="append", default=[], choices=GROUP_FIELDS, help="단계와 함께 묶을 컬럼 (여러 번 지정 가능)")
+    parser.add_argument("--slowest", type=int, default=0, metavar="N", help="가장 오래 걸린 span N개 표시")
+    parser.add_argument("--json", help="집계 결과를 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+
+    df = read_spans(args.path)
+    if df.empty:
+        print(f"기록된 span이 없습니다: {args.path}")
+        return 1
+    df = filter_spans(df, args.since, args.until, args.stage, args.session, args.data_version)
+    if df.empty:
+        print("조건에 맞는 span이 없습니다.")
+        return 1
+
+    summary = summarize(df, args.by)
+    print(f"{len(df)} spans, {df['ts'].min()} ~ {df['ts'].max()}, sessions {df['session'].nunique()}, "
+          f"data versions {df['data_version'].nunique()}")
+    print()
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.max_rows", 500):
+        print(summary.to_string(index=False, float_format=lambda x: f"{x:,.1f}"))
+        if args.slowest:
+            print()
+            print(slowest_spans(df, args.slowest).to_string(index=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(json.loads(summary.to_json(orient="records", force_ascii=False)), f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""
+Streamlit 페이지 모듈
+
+app.py가 메뉴에서 선택된 페이지의 모듈만 import 합니다 (app.PAGES 참고).
+"""
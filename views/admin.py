@@ -0,0 +1,292 @@
+"""
+관리자 설정 페이지
+"""
+import os
+import re
+import time
+
+import pandas as pd
+import streamlit as st
+
+from core.settings import AUDIT_LOG_FILE, CONFIG_FILE, SAMPLE_ROOT
+from core.data_loader import REQUIRED_COLUMNS
+from core.validation_rules import save_rules
+from core.reports import EXPORT_FORMATS, get_export_formats
+from core.audit_log import flush_events, read_events
+from core.datastore import get_validation_rules
+from core.manifest import MANIFEST_COLUMNS, annotate_disk_status, build_path_manifest, scan_sample_files
+from views.common import (
+    AUDIT_ACTIONS, add_user, audit, delete_user, get_audit_writer, get_bundle_job, get_session_data, load_scan_cache,
+    load_users, render_paginated_table, save_uploaded_file, start_bundle_job
+)
+from views.management import data_validation
+
+
+@st.fragment(run_every=1)
+def render_bundle_progress(data_version, fmt):
+    """전체 내보내기 진행률 (이 블록만 1초마다 다시 실행). 작업이 끝나면 페이지 전체를 한 번 다시 실행해 결과 표시"""
+    job = get_bundle_job(data_version, fmt)
+    if job is None or job["status"] != "running":
+        st.rerun()
+    total = job["total"] or 1
+    st.progress(job["done"] / total, text=f"파일 생성 중... ({job['done']}/{job['total'] or '?'})")
+
+
+def admin_settings():
+    #st.markdown('<div class="sub-header">관리자 설정</div>', unsafe_allow_html=True)
+    st.markdown('<div class="main-header">관리자 설정</div>', unsafe_allow_html=True)
+ 
+    admin_tabs = st.tabs(["데이터 업로드", "사용자 관리", "시스템 설정", "샘플 파일 스캔", "전체 내보내기", "감사 로그"])
+    
+    # 데이터 업로드 탭
+    with admin_tabs[0]:
+        
+        st.markdown("오믹스 샘플 리스트 데이터를 업로드하세요. 업로드 후 자동으로 유효성 검사가 수행됩니다.")
+        
+        uploaded_file = st.file_uploader("Excel 파일 선택", type=["xlsx", "xls"])
+        
+#        if uploaded_file is not None:
+#            if st.button("파일 업로드"):
+#                # 파일 저장
+#                save_uploaded_file(uploaded_file)
+#                st.success(f"파일이 성공적으로 업로드되었습니다: {uploaded_file.name}")
+#                st.divider()
+#                
+#                # 데이터 유효성 검사
+#                st.markdown("#### 업로드된 데이터 유효성 검사")
+#                data_validation()
+        
+        if uploaded_file is not None and st.button("파일 업로드"):
+            save_uploaded_file(uploaded_file)
+            st.success(f"파일이 성공적으로 업로드되었습니다: {uploaded_file.name}")
+
+        st.divider()
+        st.markdown("#### 현재 데이터 유효성 검사 결과")
+        data_validation()
+
+    
+    # 사용자 관리 탭
+    with admin_tabs[1]:
+        st.markdown("#### 사용자 리스트")
+        
+        users = load_users()
+        
+        # 사용자 목록 표시
+        user_data = []
+        for username, user_info in users.items():
+            user_data.append({
+                "사용자명": username,
+                "권한": "관리자" if user_info["is_admin"] else "일반 사용자"
+            })
+        user_df = pd.DataFrame(user_data)
+        st.dataframe(user_df, use_container_width=True)
+        st.divider()
+        
+        # 새 사용자 추가
+        st.markdown("#### 새 사용자 추가")
+        col1, col2 = st.columns(2)
+        with col1:
+            new_username = st.text_input("사용자명")
+        with col2:
+            new_password = st.text_input("비밀번호", type="password")
+        
+        is_admin = st.checkbox("관리자 권한 부여")
+        
+        if st.button("사용자 추가"):
+            if new_username and new_password:
+                if not add_user(new_username, new_password, is_admin):
+                    st.error(f"'{new_username}' 사용자가 이미 존재합니다.")
+                else:
+                    audit("user_add", target_user=new_username, is_admin=is_admin)
+                    st.success(f"사용자 '{new_username}'가 추가되었습니다.")
+                    st.rerun()
+            else:
+                st.warning("사용자명과 비밀번호를 모두 입력해주세요.")
+        st.divider()
+        
+        # 사용자 삭제
+        st.markdown("#### 사용자 삭제")
+        
+        deletable_users = [u for u in users.keys() if u != st.session_state.username]
+        if len(deletable_users) == 0:
+            st.warning("삭제할 수 있는 다른 사용자가 없습니다.")
+        else:
+            user_to_delete = st.selectbox("삭제할 사용자 선택", options=deletable_users)
+            
+            if st.button("사용자 삭제"):
+                if user_to_delete:
+                    if delete_user(user_to_delete):
+                        audit("user_delete", target_user=user_to_delete)
+                    st.success(f"사용자 '{user_to_delete}'가 삭제되었습니다.")
+                    st.rerun()
+    
+    # 시스템 설정 탭
+    with admin_tabs[2]:
+        # st.markdown("### 시스템 설정")
+        
+        # 유효성 검사 규칙 설정 (CONFIG_FILE에 버전과 함께 저장)
+        st.markdown("#### 유효한 값 설정")
+        rules = get_validation_rules()
+        version = rules["version"]
+        st.caption(f"규칙 버전 {version}" + ("" if version else " (기본값)") + " · 저장하면 유효성 검사 결과만 다시 계산됩니다.")
+
+        def parse_values(text):
+            return [value.strip() for value in re.split(r"[,\n]", text) if value.strip()]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Visit 설정**")
+            new_valid_visits = st.text_area("유효한 Visit 값 (쉼표로 구분)", value=", ".join(rules["visits"]), key=f"rules_visits_{version}")
+            st.markdown("**Omics 설정**")
+            new_valid_omics = st.text_area("유효한 Omics 값 (쉼표로 구분)", value=", ".join(rules["omics"]), key=f"rules_omics_{version}")
+        with col2:
+            st.markdown("**Project 설정**")
+            new_valid_projects = st.text_area("유효한 Project 값 (쉼표로 구분)", value=", ".join(rules["projects"]), key=f"rules_projects_{version}")
+            st.markdown("**Tissue 설정**")
+            new_valid_tissues = st.text_area("유효한 Tissue 값 (쉼표로 구분)", value=", ".join(rules["tissues"]), key=f"rules_tissues_{version}")
+
+        st.markdown("**Omics-Tissue 조합 설정**")
+        new_omics_tissue = st.text_area(
+            "한 줄에 하나씩 'Omics: Tissue1, Tissue2' 형식으로 입력",
+            value="\n".join(f"{omics}: {', '.join(tissues)}" for omics, tissues in rules["omics_tissue"].items()),
+            height=220, key=f"rules_omics_tissue_{version}"
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            new_duplicate_keys = st.multiselect("중복 판정 키", options=REQUIRED_COLUMNS, default=rules["duplicate_keys"], key=f"rules_duplicate_keys_{version}")
+        with col2:
+            project_options = list(dict.fromkeys(parse_values(new_valid_projects) + rules["biologics_projects"]))
+            new_biologics_projects = st.multiselect(
+                "환자당 Biologics 값이 1개여야 하는 프로젝트", options=project_options,
+                default=rules["biologics_projects"], key=f"rules_biologics_projects_{version}"
+            )
+
+        if st.button("설정 저장"):
+            try:
+                omics_tissue = {}
+                for line in new_omics_tissue.splitlines():
+                    if not line.strip():
+                        continue
+                    if ":" not in line:
+                        raise ValueError(f"'{line.strip()}' 줄에 ':'가 없습니다.")
+                    omics, tissues = line.split(":", 1)
+                    omics_tissue[omics.strip()] = parse_values(tissues)
+                saved = save_rules(CONFIG_FILE, {
+                    "visits": parse_values(new_valid_visits),
+                    "projects": parse_values(new_valid_projects),
+                    "omics": parse_values(new_valid_omics),
+                    "tissues": parse_values(new_valid_tissues),
+                    "omics_tissue": omics_tissue,
+                    "duplicate_keys": new_duplicate_keys,
+                    "biologics_projects": new_biologics_projects,
+                }, updated_by=st.session_state.username, expected_version=version)
+            except ValueError as e:
+                st.error(f"설정을 저장할 수 없습니다: {e}")
+            else:
+                if saved is None:
+                    st.warning("다른 관리자가 먼저 규칙을 변경했습니다. 화면을 새로고침한 뒤 다시 저장해주세요.")
+                else:
+                    audit("settings", rules_version=saved["version"])
+                    st.success(f"설정이 저장되었습니다. (규칙 버전 {saved['version']})")
+
+    # 샘플 파일 스캔 탭
+    with admin_tabs[3]:
+        st.markdown("#### 샘플 파일 디스크 스캔")
+        st.markdown(f"샘플 경로 규칙(`{SAMPLE_ROOT}/Project/PatientID/Visit/Omics/Tissue/SampleID`)에 따라 실제 파일 존재 여부를 확인합니다. "
+                    "이전 스캔 이후 변경된 디렉토리만 다시 읽습니다.")
+
+        df, _ = get_session_data()
+        if df is None or df.empty:
+            st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        else:
+            scan_cache = load_scan_cache()
+            if scan_cache is not None:
+                st.markdown(f"마지막 스캔: {scan_cache['scanned_at']} (루트: `{scan_cache['root']}`)")
+
+            max_workers = st.number_input("스캔 스레드 수", min_value=1, max_value=64, value=16, key="scan_max_workers")
+            if st.button("스캔 실행", key="scan_run"):
+                progress = st.progress(0.0, text="디렉토리 스캔 중...")
+                started = time.perf_counter()
+                status = scan_sample_files(
+                    build_path_manifest(df),
+                    max_workers=int(max_workers),
+                    progress_callback=lambda done, total: progress.progress(done / total, text=f"디렉토리 스캔 중... ({done:,}/{total:,})")
+                )
+                progress.empty()
+                st.success(f"스캔 완료 ({time.perf_counter() - started:.1f}초, 다시 읽은 디렉토리 {load_scan_cache()['rescanned_directories']:,}개)")
+                scan_cache = load_scan_cache()
+
+            if scan_cache is not None:
+                status = annotate_disk_status(build_path_manifest(df), scan_cache)
+                col1, col2, col3 = st.columns(3)
+                col1.metric("등록 샘플 수", f"{len(status):,}")
+                col2.metric("디스크 보유 샘플 수", f"{int(status['OnDisk'].sum()):,}")
+                col3.metric("누락 샘플 수", f"{int((~status['OnDisk']).sum()):,}")
+
+                st.markdown("**디스크에 없는 샘플**")
+                render_paginated_table(status[~status["OnDisk"]][MANIFEST_COLUMNS + ["Path"]], key="scan_missing")
+
+    # 전체 내보내기 탭
+    with admin_tabs[4]:
+        st.markdown("#### 전체 내보내기")
+        st.markdown("코호트별/오믹스별 환자 수, 오믹스 조합 요약, 프로젝트별 Sample ID 리스트를 모두 생성하여 zip 파일 하나로 묶습니다. "
+                    "작업은 백그라운드에서 실행되므로 다른 페이지로 이동해도 계속 진행됩니다.")
+
+        # 번들 작업 키와 zip 이름에는 이 DataFrame을 읽어 온 버전을 사용
+        df, data_version = get_session_data()
+        if df is None or df.empty:
+            st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        else:
+            fmt = st.selectbox(
+                "파일 형식", options=get_export_formats(), format_func=lambda f: EXPORT_FORMATS[f]["label"], key="bundle_fmt"
+            )
+            job = get_bundle_job(data_version, fmt)
+            if st.button("전체 내보내기 시작", key="bundle_start", disabled=job is not None and job["status"] == "running"):
+                job = start_bundle_job(df, data_version, fmt)
+
+            if job is not None:
+                if job["status"] == "running":
+                    render_bundle_progress(data_version, fmt)
+                elif job["status"] == "error":
+                    st.error(f"내보내기에 실패했습니다: {job['error']}")
+                elif os.path.exists(job["file"]):
+                    with open(job["file"], "rb") as f:
+                        st.download_button(
+                            "📦 전체 내보내기 다운로드",
+                            data=f,
+                            file_name=f"omics_export_{data_version}.zip",
+                            mime="application/zip",
+                            key="bundle_download",
+                            on_click=audit,
+                            args=("export",),
+                            kwargs={"file": f"omics_export_{data_version}.zip", "format": fmt}
+                        )
+
+    # 감사 로그 탭
+    with admin_tabs[5]:
+        st.markdown("#### 감사 로그")
+        writer = get_audit_writer()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("기록 대기", f"{writer['queue'].qsize():,}")
+        col2.metric("기록됨 (이 프로세스)", f"{writer['written']:,}")
+        col3.metric("버려짐", f"{writer['dropped']:,}")
+
+        col1, col2, col3, col4 = st.columns(4)
+        audit_action = col1.selectbox("이벤트", options=["전체"] + AUDIT_ACTIONS, key="audit_action")
+        audit_user = col2.selectbox("사용자", options=["전체"] + sorted(load_users()), key="audit_user")
+        audit_text = col3.text_input("검색어 (프로젝트, 파일명 등)", key="audit_text")
+        audit_limit = col4.number_input("최대 건수", min_value=100, max_value=100000, value=1000, step=100, key="audit_limit")
+
+        # 조회 전에 대기 중인 이벤트를 기록하여 방금 발생한 이벤트도 보이도록 함
+        flush_events(writer)
+        events = read_events(
+            AUDIT_LOG_FILE, limit=int(audit_limit),
+            user=None if audit_user == "전체" else audit_user,
+            action=None if audit_action == "전체" else audit_action,
+            text=audit_text.strip() or None
+        )
+        if events:
+            render_paginated_table(pd.DataFrame(events).fillna("").astype(str), key="audit_events")
+        else:
+            st.info("조건에 해당하는 이벤트가 없습니다.")
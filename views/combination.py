@@ -0,0 +1,322 @@
+"""
+오믹스 조합 현황 페이지
+"""
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+from core.reports import build_sample_id_pivot
+from core.combination import (
+    format_feature, get_scope_mask, get_top_intersections, mask_to_patients, optimize_feature_set,
+    query_combination
+)
+from views.common import (
+    build_combination_index, get_report_table, load_data_with_version, render_download, render_path_manifest_download,
+    render_sample_sheet_download
+)
+
+
+def view_data_comb_dashboard():
+    #st.markdown('<div class="sub-header">오믹스 조합 데이터 현황</div>', unsafe_allow_html=True)
+    st.markdown('<div class="main-header">오믹스 조합 데이터 현황</div>', unsafe_allow_html=True)
+    
+    df, data_version = load_data_with_version()
+    if df is None or df.empty:
+        st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        return
+
+    projects = sorted(df['Project'].unique())
+    if not projects:
+        st.warning("프로젝트 데이터가 없습니다.")
+        return
+        
+    project_tabs = st.tabs(projects + ["통합 분석"])
+
+    # 프로젝트 통합(pooled) 조합 분석
+    with project_tabs[-1]:
+        view_pooled_combination(df, data_version, projects)
+    
+    for i, project in enumerate(projects):
+        with project_tabs[i]:
+            project_df = df[df['Project'] == project]
+            
+            # 1. 오믹스 조합별 환자 수 요약
+            combination_df = get_report_table(df, data_version, "combination", project)
+
+            st.dataframe(combination_df, use_container_width = True, hide_index = True)
+            st.divider()
+
+            # 2. 오믹스-조직 교집합 탐색 (UpSet)
+            st.markdown('<div class="sub-header">오믹스-조직 교집합 탐색</div>', unsafe_allow_html=True)
+            col1, col2, col3 = st.columns(3)
+            upset_mode = col1.radio(
+                "집계 방식",
+                options=["inclusive", "exact"],
+                format_func=lambda x: "포함 (해당 조합을 모두 보유)" if x == "inclusive" else "정확히 일치",
+                key=f"upset_mode_{project}"
+            )
+            upset_top_k = col2.slider("상위 조합 수", min_value=5, max_value=50, value=15, key=f"upset_top_k_{project}")
+            upset_min_degree = col3.slider("최소 조합 크기", min_value=1, max_value=6, value=2, key=f"upset_min_degree_{project}")
+
+            comb_index = build_combination_index(df, data_version)
+            intersections = get_top_intersections(
+                comb_index, project, top_k=upset_top_k, min_degree=upset_min_degree, mode=upset_mode
+            )
+            if intersections:
+                st.plotly_chart(build_upset_figure(intersections, comb_index["features"]), use_container_width=True)
+            else:
+                st.info("조건에 해당하는 조합이 없습니다.")
+            st.divider()
+
+            # 3. 필수 오믹스 조합 최적화
+            st.markdown('<div class="sub-header">필수 오믹스 조합 최적화</div>', unsafe_allow_html=True)
+            project_features = [
+                i for i, mask in enumerate(comb_index["masks"])
+                if mask & comb_index["project_masks"].get(project, 0)
+            ]
+            with st.form(key=f"optimizer_form_{project}"):
+                col1, col2, col3, col4 = st.columns(4)
+                optimizer_k = col1.number_input(
+                    "필수 feature 수 (k)", min_value=1, max_value=max(len(project_features), 1), value=min(2, max(len(project_features), 1)),
+                    key=f"optimizer_k_{project}"
+                )
+                optimizer_top_n = col2.number_input("결과 수", min_value=1, max_value=20, value=5, key=f"optimizer_top_n_{project}")
+                optimizer_time_limit = col3.number_input(
+                    "시간 제한 (초)", min_value=0.1, max_value=30.0, value=2.0, step=0.5, key=f"optimizer_time_limit_{project}"
+                )
+                optimizer_must = col4.multiselect(
+                    "필수 포함 feature",
+                    options=project_features,
+                    format_func=lambda i: format_feature(comb_index["features"][i]),
+                    key=f"optimizer_must_{project}"
+                )
+                submitted = st.form_submit_button("최적 조합 찾기")
+
+            if submitted:
+                if len(optimizer_must) > optimizer_k:
+                    st.warning("필수 포함 feature 수가 k보다 많습니다.")
+                else:
+                    # 결과의 feature 번호는 이 버전의 조합 인덱스 기준이므로 버전과 함께 저장
+                    st.session_state[f"optimizer_result_{project}"] = {
+                        **optimize_feature_set(
+                            comb_index, project, int(optimizer_k), must_include=optimizer_must,
+                            top_n=int(optimizer_top_n), time_limit=float(optimizer_time_limit)
+                        ),
+                        "data_version": data_version
+                    }
+
+            optimizer_result = st.session_state.get(f"optimizer_result_{project}")
+            if optimizer_result is not None and optimizer_result["data_version"] != data_version:
+                # 데이터가 바뀐 뒤의 이전 결과는 다른 feature를 가리킬 수 있으므로 버림
+                del st.session_state[f"optimizer_result_{project}"]
+                optimizer_result = None
+            if optimizer_result is not None:
+                if optimizer_result["results"]:
+                    st.dataframe(pd.DataFrame([
+                        {
+                            "순위": rank,
+                            "오믹스 조합": " + ".join(format_feature(comb_index["features"][i]) for i in members),
+                            "환자 수": count
+                        }
+                        for rank, (count, members) in enumerate(optimizer_result["results"], start=1)
+                    ]), use_container_width=True, hide_index=True)
+                else:
+                    st.info("조건을 만족하는 조합이 없습니다.")
+                if optimizer_result["exact"]:
+                    st.caption(f"정확한 탐색 완료 ({optimizer_result['elapsed']:.2f}초)")
+                else:
+                    st.caption(f"시간 제한 또는 k 크기로 인해 근사 결과입니다 ({optimizer_result['elapsed']:.2f}초)")
+            st.divider()
+
+            # 4. 선택한 오믹스 필터링
+            st.markdown('<div class="sub-header">오믹스 조합 선택</div>', unsafe_allow_html=True)
+
+            valid_omics = sorted(project_df['Omics'].unique())
+            session_key = f"omics_rows_{project}"
+            if session_key not in st.session_state:
+                if valid_omics:
+                    tissue_options = sorted(project_df[project_df['Omics'] == valid_omics[0]]['Tissue'].unique())
+                    default_tissue = tissue_options[0] if tissue_options else ""
+                    st.session_state[session_key] = [{"omics": valid_omics[0], "tissue": default_tissue}]
+                else:
+                    st.session_state[session_key] = []
+
+            for idx, row in enumerate(st.session_state[session_key]):
+                col1, col2 = st.columns(2)
+                selected_omics = col1.selectbox(
+                    f"Omics 선택 {idx+1}",
+                    options=valid_omics,
+                    index=valid_omics.index(row["omics"]) if row["omics"] in valid_omics else 0,
+                    key=f"comb_{project}_omics_{idx}"
+                )
+                # 선택된 omics에 대해 해당 프로젝트에서 나타난 tissue 옵션 추출
+                tissue_options = sorted(project_df[project_df['Omics'] == selected_omics]['Tissue'].unique())
+                selected_tissue = col2.selectbox(
+                    f"Tissue 선택 {idx+1}",
+                    options=tissue_options,
+                    key=f"comb_{project}_tissue_{idx}"
+                )
+                st.session_state[session_key][idx] = {"omics": selected_omics, "tissue": selected_tissue}
+
+            if st.button("행 추가 (+)", key=f"add_row_{project}"):
+                if valid_omics:
+                    tissue_options = sorted(project_df[project_df['Omics'] == valid_omics[0]]['Tissue'].unique())
+                    default_tissue = tissue_options[0] if tissue_options else ""
+                    st.session_state[session_key].append({"omics": valid_omics[0], "tissue": default_tissue})
+                    st.rerun()
+
+            # 선택된 omics/tissue 조합을 모두 가진 환자는 조합 인덱스(bitset)로 계산
+            selected_combinations = {(comb["omics"], comb["tissue"]) for comb in st.session_state[session_key]}
+            feature_ids = {feature: i for i, feature in enumerate(comb_index["features"])}
+            if all(comb in feature_ids for comb in selected_combinations):
+                result = query_combination(comb_index, [feature_ids[comb] for comb in selected_combinations], project)
+                patients_with_all = [patient for _, patient in mask_to_patients(comb_index, result["mask"])]
+            else:
+                patients_with_all = []
+            filtered_df = project_df[project_df['PatientID'].isin(patients_with_all)]
+
+            condition = pd.MultiIndex.from_frame(filtered_df[['Omics', 'Tissue']]).isin(list(selected_combinations))
+            filtered_df2 = filtered_df[condition]
+
+            filtered_df_pivot = build_sample_id_pivot(filtered_df2, ['PatientID', 'Visit'])
+            
+            
+            if filtered_df.empty:
+                st.warning("선택된 조합에 해당하는 데이터가 없습니다.")
+            else:
+                st.markdown("**필터링된 데이터:**")
+                
+                # Visit별 환자 수를 집계한 피벗 테이블 생성
+                visit_list = sorted(filtered_df2['Visit'].unique())
+                if visit_list:
+                    pivot_df = pd.pivot_table(
+                        filtered_df2,
+                        values='PatientID',
+                        index=['Omics', 'Tissue'],
+                        columns=['Visit'],
+                        aggfunc='nunique',
+                        fill_value=0
+                    )
+                    pivot_df = pivot_df.reset_index()
+                    
+                    st.dataframe(pivot_df, use_container_width=True, hide_index = True)
+                    st.dataframe(filtered_df_pivot, use_container_width=True, hide_index = True)
+                    render_download(
+                        filtered_df_pivot, f"{project}_combination_patient_ID", "📊 선택된 오믹스 샘플 리스트 다운로드",
+                        key=f"download_comb_{project}", params=["comb_selection", project, sorted(selected_combinations)]
+                    )
+                    render_path_manifest_download(filtered_df2, f"{project}_combination", key=f"comb_manifest_{project}")
+                    render_sample_sheet_download(filtered_df2, f"{project}_combination", key=f"comb_samplesheet_{project}")
+
+
+def view_pooled_combination(df, data_version, projects):
+    """여러 프로젝트를 묶어 오믹스 조합 환자 수를 한 번에 계산 (프로젝트별 breakdown + 통합 합계)"""
+    st.markdown('<div class="sub-header">프로젝트 통합 조합 분석</div>', unsafe_allow_html=True)
+
+    comb_index = build_combination_index(df, data_version)
+    selected_projects = st.multiselect("프로젝트 선택", options=projects, default=projects, key="pooled_projects")
+    if not selected_projects:
+        st.info("프로젝트를 하나 이상 선택해주세요.")
+        return
+
+    scope = get_scope_mask(comb_index, selected_projects)
+    scope_features = [i for i, mask in enumerate(comb_index["masks"]) if mask & scope]
+    selected_features = st.multiselect(
+        "오믹스 (조직) 선택",
+        options=scope_features,
+        format_func=lambda i: format_feature(comb_index["features"][i]),
+        key="pooled_features"
+    )
+
+    if selected_features:
+        result = query_combination(comb_index, selected_features, selected_projects)
+        summary_rows = [
+            {
+                "Project": project,
+                "전체 환자 수": comb_index["project_masks"][project].bit_count(),
+                "조합 보유 환자 수": count
+            }
+            for project, count in result["by_project"].items()
+        ]
+        summary_rows.append({
+            "Project": "Total",
+            "전체 환자 수": scope.bit_count(),
+            "조합 보유 환자 수": result["total"]
+        })
+        summary_df = pd.DataFrame(summary_rows)
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+
+        patient_df = pd.DataFrame(mask_to_patients(comb_index, result["mask"]), columns=["Project", "PatientID"])
+        render_download(
+            patient_df, f"pooled_{'_'.join(selected_projects)}_combination_patients", "📊 조합 보유 환자 리스트 다운로드",
+            key="download_pooled", params=["pooled_patients", selected_projects, selected_features]
+        )
+        st.divider()
+
+    # 통합 범위 UpSet
+    col1, col2 = st.columns(2)
+    upset_top_k = col1.slider("상위 조합 수", min_value=5, max_value=50, value=15, key="upset_top_k_pooled")
+    upset_min_degree = col2.slider("최소 조합 크기", min_value=1, max_value=6, value=2, key="upset_min_degree_pooled")
+    intersections = get_top_intersections(comb_index, selected_projects, top_k=upset_top_k, min_degree=upset_min_degree)
+    if intersections:
+        st.plotly_chart(build_upset_figure(intersections, comb_index["features"]), use_container_width=True)
+    else:
+        st.info("조건에 해당하는 조합이 없습니다.")
+
+
+def build_upset_figure(intersections, features):
+    """get_top_intersections 결과를 UpSet 형태(상단 막대 + 하단 조합 매트릭스)로 시각화"""
+    used = sorted({i for _, members in intersections for i in members})
+    labels = [format_feature(features[i]) for i in used]
+    row_of = {i: row for row, i in enumerate(used)}
+    x = list(range(len(intersections)))
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.55, 0.45])
+    fig.add_trace(
+        go.Bar(
+            x=x,
+            y=[count for count, _ in intersections],
+            text=[count for count, _ in intersections],
+            textposition="outside",
+            marker_color="#35666A",
+            hovertext=[" + ".join(labels[row_of[i]] for i in members) for _, members in intersections],
+            hoverinfo="text+y",
+        ),
+        row=1, col=1
+    )
+
+    # 배경 점 (미포함 feature)
+    fig.add_trace(
+        go.Scatter(
+            x=[col for col in x for _ in used],
+            y=[row for _ in x for row in range(len(used))],
+            mode="markers",
+            marker=dict(size=10, color="#E5E7EB"),
+            hoverinfo="skip",
+        ),
+        row=2, col=1
+    )
+    # 포함 feature 점과 연결선
+    for col, (_, members) in enumerate(intersections):
+        rows = sorted(row_of[i] for i in members)
+        fig.add_trace(
+            go.Scatter(
+                x=[col] * len(rows),
+                y=rows,
+                mode="markers+lines",
+                marker=dict(size=10, color="#F67E59"),
+                line=dict(color="#F67E59", width=2),
+                hoverinfo="skip",
+            ),
+            row=2, col=1
+        )
+
+    fig.update_layout(showlegend=False, height=300 + 25 * len(used), margin=dict(l=10, r=10, t=30, b=10))
+    fig.update_xaxes(showticklabels=False, showgrid=False, zeroline=False)
+    fig.update_yaxes(title_text="환자 수", row=1, col=1)
+    fig.update_yaxes(
+        tickmode="array", tickvals=list(range(len(used))), ticktext=labels,
+        autorange="reversed", showgrid=False, zeroline=False, row=2, col=1
+    )
+    return fig
@@ -0,0 +1,557 @@
+"""
+여러 페이지가 함께 쓰는 Streamlit 함수
+
+로그인/세션, 감사 로그, 데이터 로딩과 캐시(st.cache_data/st.cache_resource), 백그라운드 작업,
+다운로드 버튼 등 공통 UI 컴포넌트를 모아 둡니다. 데이터 계산 자체는 core 패키지에 있습니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core import user_store
+from core.settings import (
+    AUDIT_LOG_FILE, CONFIG_FILE, DATA_FILE, EXPORT_BUNDLE_DIR, EXPORT_DIR, SCAN_CACHE_FILE,
+    SESSION_PARAM, SESSION_REVOCATION_FILE, SESSION_SECRET_FILE, SESSION_TOKEN_TTL_MINUTES, SESSION_TTL_HOURS,
+    TIMING_LOG_FILE, USER_FILE
+)
+from core.validation_rules import update_config
+from core.reports import EXPORT_FORMATS, build_report_bundle, build_sample_id_pivot, get_export_formats
+from core.sample_sheets import build_sample_sheet_bundle
+from core.session_tokens import consume_token, issue_token, load_secret, revoke_session, verify_token
+from core.audit_log import log_event, start_audit_writer
+from core.datastore import (
+    SnapshotPublishError, compute_validation_report, get_current_pointer, get_data_version, load_or_build_artifact,
+    load_or_build_report_table, load_snapshot, read_current_data, validation_artifact_name
+)
+from core.manifest import build_path_manifest, count_disk_patients, write_path_manifest
+from core.exports import get_bundle_path, get_export_file
+from core.precompute import run_precompute, run_scheduler
+from core.combination import compute_combination_index, mask_to_patients, query_combination
+from core.search import compute_search_index
+from core.timing import bind_context, start_timing_log
+
+
+#############################################
+# 사용자 관리 함수
+#############################################
+def init_users():
+    default_users = {
+        "admin": {
+            "password": hashlib.sha256("admin123".encode()).hexdigest(),
+            "is_admin": True
+        },
+        "user": {
+            "password": hashlib.sha256("user123".encode()).hexdigest(),
+            "is_admin": False
+        }
+    }
+    user_store.init_users(USER_FILE, default_users)
+
+
+def load_users():
+    return user_store.load_users(USER_FILE)
+
+
+def save_users(users):
+    user_store.save_users(USER_FILE, users)
+
+
+def add_user(username, password, is_admin=False):
+    return user_store.add_user(USER_FILE, username, hashlib.sha256(password.encode()).hexdigest(), is_admin)
+
+
+def delete_user(username):
+    return user_store.delete_user(USER_FILE, username)
+
+
+def authenticate(username, password):
+    users = load_users()
+    if username in users:
+        stored_password = users[username]["password"]
+        if stored_password == hashlib.sha256(password.encode()).hexdigest():
+            return True, users[username]["is_admin"]
+    return False, False
+
+
+@st.cache_resource
+def get_session_registry():
+    """
+    세션 토큰 서명 키와 서명 검증 결과 캐시 (프로세스 내 모든 세션이 공유)
+    tokens: {토큰: payload}. 사용/폐기 여부는 프로세스 간에 공유되는 SESSION_REVOCATION_FILE에서 확인
+    """
+    return {"secret": load_secret(SESSION_SECRET_FILE), "lock": threading.Lock(), "tokens": {}}
+
+
+def create_session_token(username, session_id=None, auth_time=None):
+    """
+    SESSION_TOKEN_TTL_MINUTES 동안 유효한 토큰을 발급하고 이 세션의 현재 토큰으로 기록합니다.
+    로그인할 때는 새 로그인 id를, 토큰을 교체할 때는 기존 로그인 id와 로그인 시각을 사용합니다.
+    """
+    registry = get_session_registry()
+    token = issue_token(registry["secret"], username, SESSION_TOKEN_TTL_MINUTES * 60, session_id, auth_time)
+    payload = verify_token(registry["secret"], token)
+    with registry["lock"]:
+        registry["tokens"][token] = payload
+    st.session_state.session_token = payload
+    return token
+
+
+def resolve_session_token(token):
+    """
+    토큰이 유효하면 (사용자명, 관리자 여부, payload), 아니면 None. 로그인 후 SESSION_TTL_HOURS가 지났으면 무효.
+    서명 검증 결과는 캐시하고, 삭제된 사용자와 변경된 권한을 반영하도록 사용자 정보는 매번 확인합니다.
+    """
+    registry = get_session_registry()
+    with registry["lock"]:
+        payload = registry["tokens"].get(token)
+    if payload is None:
+        payload = verify_token(registry["secret"], token)
+        if payload is None or "sid" not in payload:
+            return None
+        with registry["lock"]:
+            # 만료된 토큰 정리
+            now = time.time()
+            registry["tokens"] = {t: p for t, p in registry["tokens"].items() if p["exp"] > now}
+            registry["tokens"][token] = payload
+    now = time.time()
+    if payload["exp"] <= now or payload["auth"] + SESSION_TTL_HOURS * 3600 <= now:
+        return None
+    user = load_users().get(payload["u"])
+    if user is None:
+        return None
+    return payload["u"], user["is_admin"], payload
+
+
+def rotate_session_token(payload):
+    """
+    현재 토큰을 사용 처리하고(모든 프로세스에서 재사용 불가) 같은 로그인의 새 토큰을 URL에 넣습니다.
+    토큰이 이미 사용되었으면 로그인 전체가 폐기되고 False를 반환합니다.
+    """
+    if not consume_token(SESSION_REVOCATION_FILE, payload, payload["auth"] + SESSION_TTL_HOURS * 3600):
+        return False
+    st.query_params[SESSION_PARAM] = create_session_token(payload["u"], payload["sid"], payload["auth"])
+    return True
+
+
+def restore_session():
+    """
+    URL의 세션 토큰으로 로그인 상태를 복원합니다 (새로고침해도 다시 로그인하지 않음).
+    URL의 토큰은 복원에 한 번만 쓰이고 바로 새 토큰으로 교체되므로, 복사된 링크는 잠시 뒤 쓸 수 없게 됩니다.
+    """
+    token = st.query_params.get(SESSION_PARAM)
+    if not token:
+        return
+    resolved = resolve_session_token(token)
+    if resolved is None or not rotate_session_token(resolved[2]):
+        del st.query_params[SESSION_PARAM]
+        return
+    st.session_state.authenticated = True
+    st.session_state.username, st.session_state.is_admin, _ = resolved
+
+
+def refresh_session_token():
+    """로그인 중에는 URL 토큰 유효 시간의 절반이 지나면 새 토큰으로 교체. 다른 곳에서 토큰이 사용되었으면 로그아웃"""
+    payload = st.session_state.get("session_token")
+    if payload is None:
+        return
+    now = time.time()
+    if now < (payload["iat"] + payload["exp"]) / 2 or payload["auth"] + SESSION_TTL_HOURS * 3600 <= now:
+        return
+    if not rotate_session_token(payload):
+        logout()
+
+
+def logout():
+    audit("logout")
+    payload = st.session_state.get("session_token")
+    if payload is not None:
+        revoke_session(SESSION_REVOCATION_FILE, payload, payload["auth"] + SESSION_TTL_HOURS * 3600)
+    if SESSION_PARAM in st.query_params:
+        del st.query_params[SESSION_PARAM]
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    st.rerun()
+
+
+#############################################
+# 감사 로그
+#############################################
+AUDIT_ACTIONS = ["login", "login_failed", "logout", "view", "export", "upload", "user_add", "user_delete", "settings"]
+
+
+@st.cache_resource
+def get_audit_writer():
+    """프로세스당 하나의 감사 로그 기록 스레드"""
+    return start_audit_writer(AUDIT_LOG_FILE)
+
+
+def audit(action, **detail):
+    """감사 로그 이벤트 추가 (큐에 넣기만 하므로 화면 갱신을 지연시키지 않음)"""
+    log_event(get_audit_writer(), {
+        "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "user": st.session_state.get("username"),
+        "action": action,
+        **detail
+    })
+
+
+#############################################
+# 처리 시간 기록
+#############################################
+@st.cache_resource
+def get_timing_writer():
+    """프로세스당 하나의 처리 시간(span) 기록 스레드"""
+    return start_timing_log(TIMING_LOG_FILE)
+
+
+def bind_timing_context(data_version):
+    """이번 스크립트 실행에서 기록되는 span에 세션 ID, 사용자, 데이터 버전을 붙임"""
+    get_timing_writer()
+    ctx = get_script_run_ctx()
+    bind_context(
+        session=ctx.session_id if ctx is not None else None,
+        user=st.session_state.get("username"),
+        data_version=data_version
+    )
+
+
+#############################################
+# 데이터 로딩 및 처리 함수
+#############################################
+@st.cache_resource(show_spinner=False, max_entries=2)
+def open_data_snapshot(data_version, source_sha256):
+    """
+    게시된 스냅샷을 메모리 매핑으로 엽니다 (버전별로 프로세스 내 1회, 모든 세션이 같은 객체를 공유).
+    호스트의 모든 프로세스가 같은 파일을 매핑하므로 물리 메모리에는 한 벌만 올라갑니다.
+    반환된 DataFrame은 공유 객체이므로 수정하지 않습니다.
+    """
+    return load_snapshot(data_version, source_sha256)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def read_unpublished_data(data_version):
+    """스냅샷을 게시하지 못했을 때 원본을 직접 읽은 결과 (버전별로 프로세스 내 1회)"""
+    return read_current_data()
+
+
+def load_data_with_version():
+    """(현재 게시된 스냅샷, 그 스냅샷의 데이터 버전). 데이터가 없거나 읽을 수 없으면 (None, None)"""
+    try:
+        try:
+            pointer = get_current_pointer()
+        except SnapshotPublishError:
+            # 원본은 읽었지만 스냅샷 저장만 실패한 경우에는 원본을 직접 읽어 사용
+            return read_unpublished_data(get_data_version())
+    except ValueError as e:
+        st.error(str(e))
+        return None, None
+    except Exception as e:
+        st.error(f"데이터 로딩 중 오류가 발생했습니다: {e}")
+        return None, None
+    if pointer is None:
+        return None, None
+    return open_data_snapshot(pointer["data_version"], pointer["source_sha256"]), pointer["data_version"]
+
+
+def load_data():
+    return load_data_with_version()[0]
+
+
+def get_session_data():
+    """
+    이 세션의 데이터와 그 데이터 버전. 다른 세션이나 프로세스가 데이터 파일을 바꿨으면 새 버전으로 다시 엽니다.
+    캐시 키로 쓰는 버전은 항상 DataFrame과 함께 가져온 값을 사용합니다 (이전 데이터로 새 버전 캐시를 채우지 않도록).
+    """
+    if "data" not in st.session_state or st.session_state.get("data_version") != get_data_version():
+        st.session_state["data"], st.session_state["data_version"] = load_data_with_version()
+    return st.session_state["data"], st.session_state["data_version"]
+
+
+@st.cache_data(ttl=None, show_spinner=False, max_entries=8)
+def get_validation_report(_df, data_version, rules_version_key, _rules):
+    """유효성 검사 결과 ((data_version, 규칙 식별자) 기준 캐시, 디스크 아티팩트 재사용)"""
+    return load_or_build_artifact(data_version, validation_artifact_name(_rules), lambda: compute_validation_report(_df, _rules))
+
+
+def save_uploaded_file(uploaded_file):
+    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
+    with open(DATA_FILE, "wb") as f:
+        f.write(uploaded_file.getbuffer())
+    
+    # 설정 파일 업데이트 (유효성 검사 규칙 등 다른 항목은 보존)
+    update_config(CONFIG_FILE, lambda config: config.update(
+        last_update=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        last_updated_by=st.session_state.username
+    ))
+
+    st.cache_data.clear()
+    st.session_state["data"], st.session_state["data_version"] = load_data_with_version()
+    audit("upload", file=uploaded_file.name, size=uploaded_file.size, data_version=st.session_state["data_version"])
+
+    # 새 데이터 버전의 대시보드 테이블과 내보내기 파일을 백그라운드에서 미리 생성
+    trigger_precompute()
+
+
+#############################################
+# 샘플 파일 디스크 스캔
+#############################################
+@st.cache_data(ttl=None, show_spinner=False, max_entries=2)
+def _load_scan_cache(path, mtime_ns):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def load_scan_cache():
+    """마지막 스캔 결과 (파일 mtime 기준으로 메모리 캐시). 스캔한 적이 없으면 None"""
+    if not os.path.exists(SCAN_CACHE_FILE):
+        return None
+    return _load_scan_cache(SCAN_CACHE_FILE, os.stat(SCAN_CACHE_FILE).st_mtime_ns)
+
+
+@st.cache_data(ttl=None, show_spinner=False, max_entries=4)
+def get_disk_patient_counts(_df, data_version, scan_version, with_biologics=False):
+    """(Project, Omics, Tissue[, Biologics])별 디스크에 파일이 있는 환자 수 ((data_version, scan_version) 기준 캐시)"""
+    return count_disk_patients(_df, load_scan_cache(), with_biologics=with_biologics)
+
+
+#############################################
+# 전체 내보내기 (백그라운드 작업)
+#############################################
+@st.cache_resource
+def get_bundle_jobs():
+    """모든 세션이 공유하는 전체 내보내기 작업 목록: {(data_version, 형식): 작업 상태}"""
+    return {"lock": threading.Lock(), "jobs": {}}
+
+
+def _run_bundle_job(job, df, fmt, data_version):
+    """백그라운드 스레드: 작업자 프로세스로 묶음 파일을 만들고 작업 상태 갱신"""
+    def on_progress(done, total):
+        job["done"], job["total"] = done, total
+    try:
+        build_report_bundle(df, job["file"], fmt=fmt, data_version=data_version, progress_callback=on_progress)
+        job["status"] = "done"
+    except Exception as e:
+        job["status"] = "error"
+        job["error"] = str(e)
+    job["finished_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def get_bundle_job(data_version, fmt):
+    """현재 작업 상태. 이전에 만든 파일이 디스크에 있으면 완료된 작업으로 간주"""
+    registry = get_bundle_jobs()
+    with registry["lock"]:
+        job = registry["jobs"].get((data_version, fmt))
+        if job is None and os.path.exists(get_bundle_path(data_version, fmt)):
+            job = {"status": "done", "done": 0, "total": 0, "file": get_bundle_path(data_version, fmt), "error": None}
+            registry["jobs"][(data_version, fmt)] = job
+        return job
+
+
+def start_bundle_job(df, data_version, fmt):
+    """같은 (data_version, 형식) 작업이 실행 중이거나 완료되어 있으면 재사용하고, 아니면 새로 시작"""
+    registry = get_bundle_jobs()
+    with registry["lock"]:
+        job = registry["jobs"].get((data_version, fmt))
+        if job is not None and (job["status"] == "running" or os.path.exists(job["file"])):
+            return job
+        os.makedirs(EXPORT_BUNDLE_DIR, exist_ok=True)
+        job = {
+            "status": "running", "done": 0, "total": 0, "error": None,
+            "file": get_bundle_path(data_version, fmt),
+            "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        registry["jobs"][(data_version, fmt)] = job
+    threading.Thread(target=_run_bundle_job, args=(job, df, fmt, data_version), daemon=True).start()
+    return job
+
+
+#############################################
+# 사전 계산 (데이터 변경 시 및 야간 작업)
+#############################################
+@st.cache_resource
+def get_precompute_state():
+    """프로세스 전체에서 공유하는 사전 계산 상태 (동시 실행 방지 잠금, 마지막으로 확인한 파일 정보)"""
+    return {"lock": threading.Lock(), "source_stat": None, "data_version": None, "finished_at": None, "error": None}
+
+
+def trigger_precompute():
+    """데이터 업로드 직후 등 즉시 사전 계산을 백그라운드로 시작"""
+    threading.Thread(target=run_precompute, args=(get_precompute_state(),), daemon=True).start()
+
+
+@st.cache_resource
+def start_background_jobs():
+    """프로세스당 한 번만 스케줄러 스레드를 시작하고, 시작 직후 사전 계산을 한 번 실행"""
+    state = get_precompute_state()
+    threading.Thread(target=run_scheduler, args=(state,), daemon=True).start()
+    threading.Thread(target=run_precompute, args=(state,), daemon=True).start()
+    return True
+
+
+@st.cache_data(ttl=None, show_spinner=False, max_entries=256)
+def get_report_table(_df, data_version, kind, name):
+    """대시보드 테이블 (data_version, kind, name 기준 캐시). 사전 계산 결과가 있으면 읽고, 없으면 계산"""
+    return load_or_build_report_table(_df, data_version, kind, name)
+
+
+#############################################
+# 캐시된 인덱스와 테이블
+#############################################
+@st.cache_resource(show_spinner=False, max_entries=2)
+def build_combination_index(_df, data_version):
+    """조합 인덱스 (data_version 기준으로 프로세스 내 1회 로드, 모든 세션이 공유. 디스크 아티팩트 재사용)"""
+    return load_or_build_artifact(data_version, "combination_index", lambda: compute_combination_index(_df))
+
+
+@st.cache_data(ttl=None, show_spinner=False, max_entries=32)
+def get_sample_id_pivot(_df, data_version, project):
+    """프로젝트별 샘플 ID wide 테이블 (data_version, project 기준 캐시). 화면 표시와 다운로드에 함께 사용"""
+    return get_report_table(_df, data_version, "sample_id", project)
+
+
+@st.cache_data(ttl=None, show_spinner=False, max_entries=32)
+def get_pooled_sample_id_pivot(_df, data_version, projects, feature_ids):
+    """
+    여러 프로젝트를 묶은 샘플 ID wide 테이블 (data_version, projects, feature_ids 기준 캐시).
+    feature_ids를 모두 가진 환자는 조합 인덱스로 한 번에 계산하고, 해당 환자의 행만 골라 피벗합니다.
+    반환값: (pivot, query_combination 결과)
+    """
+    comb_index = build_combination_index(_df, data_version)
+    result = query_combination(comb_index, list(feature_ids), list(projects))
+    patients = mask_to_patients(comb_index, result["mask"])
+    patients = pd.MultiIndex.from_arrays([[project for project, _ in patients], [patient for _, patient in patients]])
+    rows = _df[pd.MultiIndex.from_frame(_df[["Project", "PatientID"]]).isin(patients)]
+    # PatientID 앞부분 검색(이진 탐색)을 위해 PatientID 기준으로 정렬하고 Project 컬럼만 앞으로 이동
+    pivot = build_sample_id_pivot(rows, ["PatientID", "Project", "Visit"])
+    pivot = pivot[["Project"] + [col for col in pivot.columns if col != "Project"]].rename_axis(columns=None)
+    return pivot, result
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def build_search_index(_df, data_version):
+    """
+    검색 인덱스 (data_version 기준으로 프로세스 내 1회 로드, 모든 세션이 공유).
+    정수 배열(posting list)은 디스크 아티팩트를 메모리 매핑하여 프로세스 간에 공유하고, 키 사전은 프로세스마다 읽습니다.
+    """
+    return load_or_build_artifact(data_version, "search_index", lambda: compute_search_index(_df))
+
+
+#############################################
+# 공통 UI 컴포넌트
+#############################################
+def render_paginated_table(df, key, page_sizes=(50, 100, 200, 500)):
+    """전체 결과 중 현재 페이지의 행만 잘라서 st.dataframe으로 전송하고, 표시한 페이지를 반환"""
+    total = len(df)
+    col1, col2, col3 = st.columns([1, 1, 2])
+    page_size = col1.selectbox("페이지당 행 수", options=page_sizes, key=f"{key}_size")
+    n_pages = max((total + page_size - 1) // page_size, 1)
+
+    # 필터 변경으로 페이지 수가 줄어든 경우 마지막 페이지로 이동
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = col2.number_input("페이지", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    start = (int(page) - 1) * page_size
+    stop = min(start + page_size, total)
+    col3.markdown(
+        f"<br>{start + 1 if total else 0:,} - {stop:,} / 전체 {total:,}행 ({int(page)} / {n_pages} 페이지)",
+        unsafe_allow_html=True
+    )
+    page_df = df.iloc[start:stop]
+    st.dataframe(page_df, use_container_width=True, hide_index=True)
+    return page_df
+
+
+def render_download(df, file_stem, label, key, params):
+    """형식 선택 + 다운로드 버튼. 파일은 get_export_file의 디스크 캐시에서 제공"""
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.selectbox(
+        "파일 형식",
+        options=get_export_formats(),
+        format_func=lambda f: EXPORT_FORMATS[f]["label"],
+        key=f"{key}_fmt",
+        label_visibility="collapsed"
+    )
+    file_path = get_export_file(df, fmt, params)
+    file_name = f"{file_stem}.{EXPORT_FORMATS[fmt]['ext']}"
+    with open(file_path, "rb") as f:
+        col2.download_button(
+            label,
+            data=f,
+            file_name=file_name,
+            mime=EXPORT_FORMATS[fmt]["mime"],
+            key=f"{key}_button",
+            on_click=audit,
+            args=("export",),
+            kwargs={"file": file_name, "rows": len(df), "params": params}
+        )
+
+
+def render_path_manifest_download(selection_df, name, key):
+    """선택된 샘플의 파일 경로 매니페스트(TSV/JSON)를 생성하고 다운로드 버튼 표시"""
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.radio("매니페스트 형식", options=["tsv", "json"], format_func=str.upper, horizontal=True, key=f"{key}_fmt")
+    if col2.button("📁 샘플 경로 매니페스트 생성", key=f"{key}_build"):
+        manifest = build_path_manifest(selection_df)
+        digest = hashlib.sha256(pd.util.hash_pandas_object(manifest, index=False).to_numpy().tobytes()).hexdigest()[:12]
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        file_path = os.path.join(EXPORT_DIR, f"{name}_manifest_{digest}.{fmt}")
+        if not os.path.exists(file_path):
+            # 여러 세션이 같은 매니페스트를 동시에 만들 수 있으므로 임시 파일 이름은 프로세스/스레드별로 구분
+            tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                write_path_manifest(manifest, tmp_path, fmt=fmt)
+                os.replace(tmp_path, file_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        st.session_state[f"{key}_file"] = file_path
+
+    file_path = st.session_state.get(f"{key}_file")
+    if file_path and os.path.exists(file_path):
+        with open(file_path, "rb") as f:
+            st.download_button(
+                "📥 매니페스트 다운로드",
+                data=f,
+                file_name=f"{name}_manifest.{file_path.rsplit('.', 1)[-1]}",
+                mime="application/json" if file_path.endswith(".json") else "text/tab-separated-values",
+                key=f"{key}_download",
+                on_click=audit,
+                args=("export",),
+                kwargs={"file": f"{name}_manifest.{file_path.rsplit('.', 1)[-1]}", "rows": len(selection_df)}
+            )
+
+
+def render_sample_sheet_download(selection_df, name, key):
+    """선택된 샘플로 오믹스별 파이프라인 샘플시트를 병렬 생성하여 zip 다운로드 버튼 표시"""
+    if st.button("🧪 파이프라인 샘플시트 생성 (zip)", key=f"{key}_build"):
+        manifest = build_path_manifest(selection_df)
+        digest = hashlib.sha256(pd.util.hash_pandas_object(manifest, index=False).to_numpy().tobytes()).hexdigest()[:12]
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        zip_path = os.path.join(EXPORT_DIR, f"{name}_samplesheets_{digest}.zip")
+        if not os.path.exists(zip_path):
+            with st.spinner("샘플시트 생성 중..."):
+                build_sample_sheet_bundle(manifest, zip_path)
+        st.session_state[f"{key}_file"] = zip_path
+
+    zip_path = st.session_state.get(f"{key}_file")
+    if zip_path and os.path.exists(zip_path):
+        with open(zip_path, "rb") as f:
+            st.download_button(
+                "📥 샘플시트 다운로드",
+                data=f,
+                file_name=f"{name}_samplesheets.zip",
+                mime="application/zip",
+                key=f"{key}_download",
+                on_click=audit,
+                args=("export",),
+                kwargs={"file": f"{name}_samplesheets.zip", "rows": len(selection_df)}
+            )
@@ -0,0 +1,277 @@
+"""
+데이터 현황(대시보드) 페이지
+"""
+import pandas as pd
+import streamlit as st
+
+from core.manifest import build_path_manifest
+from views.common import load_data, render_download, render_paginated_table, render_path_manifest_download
+
+
+def view_data_dashboard():
+    st.markdown('<div class="sub-header">데이터 현황 대시보드</div>', unsafe_allow_html=True)
+    
+    df = load_data()
+    if df is None:
+        st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        return
+    
+    # 데이터 요약 정보
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("총 환자 수", df['PatientID'].nunique())
+    with col2:
+        st.metric("총 샘플 수", len(df))
+    with col3:
+        st.metric("프로젝트 수", df['Project'].nunique())
+    with col4:
+        max_date = df['Date'].max()
+        st.metric("최근 샘플 날짜", max_date.strftime('%Y-%m-%d') if pd.notna(max_date) else "N/A")
+    
+    # 탭 구성
+    dashboard_tabs = st.tabs([
+        "코호트별 환자수", 
+        "오믹스별 환자수", 
+        "오믹스 조합별 환자수"
+    ])
+    
+    # 페이지 1: 코호트별(프로젝트별) 환자수
+    with dashboard_tabs[0]:
+        st.markdown('<div class="sub-header">코호트별 - 오믹스별 - Visit별 환자수</div>', unsafe_allow_html=True)
+        
+        projects = sorted(df['Project'].unique())
+        project_tabs = st.tabs(projects)
+        
+        for i, project in enumerate(projects):
+            with project_tabs[i]:
+                project_df = df[df['Project'] == project]
+                
+                # 오믹스별 Visit별 환자수 계산
+                omics_list = sorted(project_df['Omics'].unique())
+                visit_list = sorted(project_df['Visit'].unique())
+                
+                # 데이터 준비
+                result_data = []
+                for omics in omics_list:
+                    row_data = {'Omics': omics}
+                    for visit in visit_list:
+                        patient_count = project_df[
+                            (project_df['Omics'] == omics) & 
+                            (project_df['Visit'] == visit)
+                        ]['PatientID'].nunique()
+                        row_data[visit] = patient_count
+                    # 전체 Visit에 대한 환자수 (중복 제거)
+                    row_data['Total'] = project_df[project_df['Omics'] == omics]['PatientID'].nunique()
+                    result_data.append(row_data)
+                
+                # 전체 오믹스에 대한 행 추가
+                total_row = {'Omics': 'Total'}
+                for visit in visit_list:
+                    total_row[visit] = project_df[project_df['Visit'] == visit]['PatientID'].nunique()
+                total_row['Total'] = project_df['PatientID'].nunique()
+                result_data.append(total_row)
+                
+                result_df = pd.DataFrame(result_data)
+                
+                # 데이터 표시
+                st.dataframe(result_df, use_container_width=True)
+                
+                # 다운로드 버튼
+                render_download(
+                    result_df, f"cohort_{project}_patient_counts", "📊 환자수 데이터 다운로드",
+                    key=f"download_legacy_cohort_{project}", params=["legacy_cohort", project]
+                )
+    
+    # 페이지 2: 오믹스별 환자수
+    with dashboard_tabs[1]:
+        st.markdown('<div class="sub-header">오믹스별 - 코호트별 - Visit별 환자수</div>', unsafe_allow_html=True)
+        
+        omics_list = sorted(df['Omics'].unique())
+        omics_tabs = st.tabs(omics_list)
+        
+        for i, omics in enumerate(omics_list):
+            with omics_tabs[i]:
+                omics_df = df[df['Omics'] == omics]
+                
+                # 코호트별(프로젝트별) Visit별 환자수 계산
+                projects = sorted(omics_df['Project'].unique())
+                visit_list = sorted(omics_df['Visit'].unique())
+                
+                # 데이터 준비
+                result_data = []
+                for project in projects:
+                    row_data = {'Project': project}
+                    for visit in visit_list:
+                        patient_count = omics_df[
+                            (omics_df['Project'] == project) & 
+                            (omics_df['Visit'] == visit)
+                        ]['PatientID'].nunique()
+                        row_data[visit] = patient_count
+                    # 전체 Visit에 대한 환자수
+                    row_data['Total'] = omics_df[omics_df['Project'] == project]['PatientID'].nunique()
+                    result_data.append(row_data)
+                
+                # 전체 코호트에 대한 행 추가
+                total_row = {'Project': 'Total'}
+                for visit in visit_list:
+                    total_row[visit] = omics_df[omics_df['Visit'] == visit]['PatientID'].nunique()
+                total_row['Total'] = omics_df['PatientID'].nunique()
+                result_data.append(total_row)
+                
+                result_df = pd.DataFrame(result_data)
+                
+                # 데이터 표시
+                st.dataframe(result_df, use_container_width=True)
+                
+                # 다운로드 버튼
+                render_download(
+                    result_df, f"omics_{omics}_patient_counts", "📊 환자수 데이터 다운로드",
+                    key=f"download_legacy_omics_{omics}", params=["legacy_omics", omics]
+                )
+    
+    # 페이지 3: 오믹스 조합별 환자수
+    with dashboard_tabs[2]:
+        st.markdown('<div class="sub-header">코호트별 오믹스 조합 및 샘플 선택</div>', unsafe_allow_html=True)
+        
+        projects = sorted(df['Project'].unique())
+        project_tabs = st.tabs(projects)
+        
+        for i, project in enumerate(projects):
+            with project_tabs[i]:
+                project_df = df[df['Project'] == project]
+                
+                # 1. 오믹스 조합별 환자수 요약
+                st.markdown('<div class="sub-header">오믹스 조합별 환자 요약</div>', unsafe_allow_html=True)
+                
+                # 각 환자별로 가진 오믹스 종류 파악
+                patient_omics = {}
+                for patient_id in project_df['PatientID'].unique():
+                    patient_data = project_df[project_df['PatientID'] == patient_id]
+                    patient_omics[patient_id] = sorted(patient_data['Omics'].unique())
+                
+                # 오믹스 조합별 환자수 계산
+                omics_combinations = {}
+                for patient_id, omics_list in patient_omics.items():
+                    combination = " + ".join(omics_list)
+                    if combination in omics_combinations:
+                        omics_combinations[combination] += 1
+                    else:
+                        omics_combinations[combination] = 1
+                
+                # 결과 데이터프레임 변환
+                combinations_df = pd.DataFrame([
+                    {"오믹스 조합": combo, "환자수": count}
+                    for combo, count in omics_combinations.items()
+                ]).sort_values(by="환자수", ascending=False)
+                
+                st.dataframe(combinations_df, use_container_width=True)
+                
+                # 2. 오믹스 및 조직 선택 UI
+                st.markdown('<div class="sub-header">오믹스 및 조직 선택</div>', unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    available_omics = sorted(project_df['Omics'].unique())
+                    selected_omics = st.multiselect(
+                        "오믹스 선택",
+                        options=available_omics,
+                        default=available_omics[0] if available_omics else None
+                    )
+                
+                with col2:
+                    if selected_omics:
+                        available_tissues = sorted(project_df[project_df['Omics'].isin(selected_omics)]['Tissue'].unique())
+                        selected_tissues = st.multiselect(
+                            "조직 선택",
+                            options=available_tissues,
+                            default=available_tissues[0] if available_tissues else None
+                        )
+                    else:
+                        available_tissues = []
+                        selected_tissues = []
+                        st.text("먼저 오믹스를 선택해주세요")
+                
+                # 선택된 조건에 맞는 환자 및 샘플 표시
+                if selected_omics and selected_tissues:
+                    filtered_df = project_df[
+                        (project_df['Omics'].isin(selected_omics)) & 
+                        (project_df['Tissue'].isin(selected_tissues))
+                    ]
+                    
+                    # 환자 수 계산
+                    patient_count = filtered_df['PatientID'].nunique()
+                    st.markdown(f"**선택된 조건에 맞는 환자수:** {patient_count}")
+                    
+                    # Visit별, 오믹스별, 조직별 환자수 계산
+                    st.markdown('<div class="sub-header">Visit별 환자수</div>', unsafe_allow_html=True)
+                    
+                    pivot_df = pd.pivot_table(
+                        filtered_df,
+                        values='PatientID',
+                        index=['Visit'],
+                        columns=['Omics', 'Tissue'],
+                        aggfunc=lambda x: len(pd.unique(x)),
+                        fill_value=0
+                    )
+                    
+                    st.dataframe(pivot_df, use_container_width=True)
+                    
+                    # 환자별 샘플 ID 데이터 생성
+                    st.markdown('<div class="sub-header">환자별 샘플 ID</div>', unsafe_allow_html=True)
+                    
+                    sample_data = []
+                    for pid in sorted(filtered_df['PatientID'].unique()):
+                        visits_for_pid = sorted(filtered_df[filtered_df['PatientID'] == pid]['Visit'].unique())
+                        for visit in visits_for_pid:
+                            patient_visit_data = filtered_df[
+                                (filtered_df['PatientID'] == pid) & 
+                                (filtered_df['Visit'] == visit)
+                            ]
+                            row_data = {
+                                'PatientID': pid,
+                                'Visit': visit,
+                                'Date': patient_visit_data['Date'].min()
+                            }
+                            
+                            # 각 오믹스-조직 조합별 샘플 ID 추가
+                            for omics in selected_omics:
+                                for tissue in selected_tissues:
+                                    sample = patient_visit_data[
+                                        (patient_visit_data['Omics'] == omics) & 
+                                        (patient_visit_data['Tissue'] == tissue)
+                                    ]
+                                    if not sample.empty:
+                                        row_data[f"{omics}_{tissue}_SampleID"] = sample['SampleID'].values[0]
+                                    else:
+                                        row_data[f"{omics}_{tissue}_SampleID"] = None
+                            
+                            sample_data.append(row_data)
+                    
+                    sample_df = pd.DataFrame(sample_data)
+                    
+                    st.dataframe(sample_df, use_container_width=True)
+                    
+                    # 샘플 데이터 다운로드
+                    render_download(
+                        sample_df, f"project_{project}_samples", "📥 선택된 샘플 데이터 다운로드",
+                        key=f"download_legacy_samples_{project}", params=["legacy_samples", project, selected_omics, selected_tissues]
+                    )
+                    
+                    # 샘플 파일 경로 표시
+                    if not sample_df.empty:
+                        st.markdown('<div class="sub-header">샘플 파일 경로</div>', unsafe_allow_html=True)
+                        st.info("아래는 선택한 샘플의 파일 경로입니다. 표에서 셀을 선택해 복사하거나, 현재 페이지 경로를 한 번에 복사할 수 있습니다.")
+                        render_path_manifest_download(filtered_df, f"project_{project}", key=f"dashboard_manifest_{project}")
+                        
+                        # 경로 목록은 하나의 표 위젯으로 표시하고 현재 페이지 행만 전송
+                        path_df = build_path_manifest(filtered_df).sort_values(["PatientID", "Visit", "Omics", "Tissue"])
+                        path_filter = st.text_input("경로 필터 (부분 일치)", key=f"dashboard_path_filter_{project}").strip()
+                        if path_filter:
+                            path_df = path_df[path_df["Path"].str.contains(path_filter, case=False, regex=False)]
+                        page_df = render_paginated_table(
+                            path_df[["PatientID", "Visit", "Omics", "Tissue", "SampleID", "Path"]],
+                            key=f"dashboard_paths_{project}"
+                        )
+                        with st.expander("현재 페이지 경로 복사"):
+                            st.code("\n".join(page_df["Path"]), language=None)
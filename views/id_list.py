@@ -0,0 +1,100 @@
+"""
+Sample ID list 페이지
+"""
+import pandas as pd
+import streamlit as st
+
+from core.reports import filter_sample_id_pivot, get_sample_id_index_cols
+from core.combination import format_feature, get_scope_mask
+from views.common import (
+    build_combination_index, get_pooled_sample_id_pivot, get_sample_id_pivot, load_data_with_version, render_download,
+    render_paginated_table, render_sample_sheet_download
+)
+
+
+def view_data_id_list():
+    #st.markdown('<div class="sub-header">샘플 ID List</div>', unsafe_allow_html=True)
+    st.markdown('<div class="main-header">샘플 ID List</div>', unsafe_allow_html=True)
+
+    df, data_version = load_data_with_version()
+    if df is None or df.empty:
+        st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        return
+
+    projects = sorted(df['Project'].unique())
+    if not projects:
+        st.warning("프로젝트 데이터가 없습니다.")
+        return
+        
+    project_tabs = st.tabs(projects + ["통합"])
+
+    # 프로젝트 통합(pooled) 샘플 ID 리스트
+    with project_tabs[-1]:
+        view_pooled_id_list(df, data_version, projects)
+
+    for i, project in enumerate(projects):
+        with project_tabs[i]:
+            df_pivot = get_sample_id_pivot(df, data_version, project)
+            index_cols = get_sample_id_index_cols(project)
+
+            # 서버 측 필터링 + 페이지 단위 표시
+            col1, col2, col3 = st.columns([1, 1, 2])
+            patient_prefix = col1.text_input("PatientID 검색 (앞부분 일치)", key=f"id_prefix_{project}").strip()
+            selected_visits = col2.multiselect(
+                "Visit 선택", options=sorted(df_pivot["Visit"].unique()), key=f"id_visits_{project}"
+            )
+            selected_columns = col3.multiselect(
+                "Omics (Tissue) 컬럼 선택",
+                options=[col for col in df_pivot.columns if col not in index_cols],
+                key=f"id_columns_{project}"
+            )
+            filtered_pivot = filter_sample_id_pivot(df_pivot, index_cols, patient_prefix, selected_visits, selected_columns)
+            render_paginated_table(filtered_pivot, key=f"id_list_{project}")
+
+            render_download(
+                df_pivot, f"{project}_Sample_ID", "📊 오믹스 샘플 ID 다운로드",
+                key=f"download_sample_id_{project}", params=["sample_id", project]
+            )
+            render_sample_sheet_download(df[df['Project'] == project], f"{project}", key=f"id_samplesheet_{project}")
+
+
+def view_pooled_id_list(df, data_version, projects):
+    """여러 프로젝트를 묶어 선택한 오믹스 조합을 모두 가진 환자의 샘플 ID를 한 번에 조회 (프로젝트별 환자 수 + 통합 합계)"""
+    comb_index = build_combination_index(df, data_version)
+    col1, col2 = st.columns(2)
+    selected_projects = col1.multiselect("프로젝트 선택", options=projects, default=projects, key="id_pooled_projects")
+    if not selected_projects:
+        st.info("프로젝트를 하나 이상 선택해주세요.")
+        return
+    scope = get_scope_mask(comb_index, selected_projects)
+    selected_features = col2.multiselect(
+        "필수 오믹스 (조직) 선택",
+        options=[i for i, mask in enumerate(comb_index["masks"]) if mask & scope],
+        format_func=lambda i: format_feature(comb_index["features"][i]),
+        key="id_pooled_features"
+    )
+
+    df_pivot, result = get_pooled_sample_id_pivot(df, data_version, tuple(selected_projects), tuple(sorted(selected_features)))
+    summary_rows = [
+        {"Project": project, "전체 환자 수": comb_index["project_masks"][project].bit_count(), "조건 환자 수": count}
+        for project, count in result["by_project"].items()
+    ]
+    summary_rows.append({"Project": "Total", "전체 환자 수": scope.bit_count(), "조건 환자 수": result["total"]})
+    st.dataframe(pd.DataFrame(summary_rows), use_container_width=True, hide_index=True)
+
+    index_cols = ["Project", "PatientID", "Visit"]
+    col1, col2, col3 = st.columns([1, 1, 2])
+    patient_prefix = col1.text_input("PatientID 검색 (앞부분 일치)", key="id_prefix_pooled").strip()
+    selected_visits = col2.multiselect("Visit 선택", options=sorted(df_pivot["Visit"].unique()), key="id_visits_pooled")
+    selected_columns = col3.multiselect(
+        "Omics (Tissue) 컬럼 선택",
+        options=[col for col in df_pivot.columns if col not in index_cols],
+        key="id_columns_pooled"
+    )
+    filtered_pivot = filter_sample_id_pivot(df_pivot, index_cols, patient_prefix, selected_visits, selected_columns)
+    render_paginated_table(filtered_pivot, key="id_list_pooled")
+
+    render_download(
+        df_pivot, f"pooled_{'_'.join(selected_projects)}_Sample_ID", "📊 통합 샘플 ID 다운로드",
+        key="download_sample_id_pooled", params=["pooled_sample_id", selected_projects, sorted(selected_features)]
+    )
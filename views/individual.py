@@ -0,0 +1,89 @@
+"""
+오믹스 개별 현황 페이지
+"""
+import streamlit as st
+
+from core.manifest import add_disk_count_column, get_scan_version
+from views.common import get_disk_patient_counts, get_report_table, get_session_data, render_download
+
+
+def view_data_ind_dashboard():
+    #st.markdown('<div class="sub-header">오믹스 개별 데이터 현황</div>', unsafe_allow_html=True)
+    st.markdown('<div class="main-header">오믹스 개별 데이터 현황</div>', unsafe_allow_html=True)
+
+    df, data_version = get_session_data()
+    if df is None or df.empty:
+        st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        return
+
+    # 디스크 스캔 결과가 있으면 On disk 환자 수 표시
+    scan_version = get_scan_version()
+
+    dashboard_tabs = st.tabs(["코호트별 현황", "오믹스별 현황"])
+    with dashboard_tabs[0]:
+        projects = sorted(df['Project'].unique())
+        if not projects:
+            st.warnings("데이터가 없습니다.")
+            return
+
+        project_tabs = st.tabs(projects)
+        for i, project in enumerate(projects):
+            with project_tabs[i]:
+                project_df = df[df['Project'] == project]
+
+                omics_list = sorted(project_df['Omics'].unique())
+                visit_list = sorted(project_df['Visit'].unique())
+
+                if not omics_list or not visit_list:
+                    st.warning("데이터가 없습니다.")
+                    continue
+
+                # PRISM 프로젝트에 대해서만 Biologics 옵션 제공
+                show_biologics = False
+                if project == "PRISM":
+                    show_biologics = st.checkbox(f"Biologics 정보 포함", key = f"biologics_check")  
+                
+                result_df = get_report_table(df, data_version, "cohort_biologics" if show_biologics else "cohort", project)
+                if scan_version is not None:
+                    result_df = add_disk_count_column(
+                        result_df,
+                        get_disk_patient_counts(df, data_version, scan_version, with_biologics=show_biologics),
+                        Project=project
+                    )
+                
+                st.dataframe(result_df, use_container_width=True, hide_index = True) 
+                
+                render_download(
+                    result_df, f"Proejcts_{project}_patient_counts", "📊 코호트별 환자수 데이터 다운로드",
+                    key=f"download_ind_project_{project}", params=["ind_project", project, show_biologics, scan_version]
+                )
+
+    
+    with dashboard_tabs[1]:
+        omics = sorted(df['Omics'].unique())
+        if not omics:
+            st.warnings("데이터가 없습니다.")
+            return
+
+        omics_tabs = st.tabs(omics)
+        for i, omic in enumerate(omics):
+            with omics_tabs[i]:
+                omics_df = df[df['Omics'] == omic]
+
+                visit_list = sorted(omics_df['Visit'].unique())
+                if not visit_list:
+                    st.warning("데이터가 없습니다.")
+                    continue
+
+                result_df = get_report_table(df, data_version, "omics", omic)
+                if scan_version is not None:
+                    result_df = add_disk_count_column(
+                        result_df, get_disk_patient_counts(df, data_version, scan_version), Omics=omic
+                    )
+                
+                st.dataframe(result_df, use_container_width=True, hide_index = True)
+
+                render_download(
+                    result_df, f"Omics_{omic}_patient_counts", "📊 오믹스별 환자수 데이터 다운로드",
+                    key=f"download_ind_omics_{omic}", params=["ind_omics", omic, scan_version]
+                )
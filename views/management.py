@@ -0,0 +1,163 @@
+"""
+데이터 관리 페이지 (전체 데이터 다운로드, 유효성 검사 결과)
+"""
+import pandas as pd
+import streamlit as st
+
+from core.validation_rules import rules_key
+from core.datastore import get_validation_rules
+from views.common import get_session_data, get_validation_report, load_data, render_download
+
+
+def view_data_management():
+    st.markdown('<div class="sub-header">데이터 관리</div>', unsafe_allow_html=True)
+    
+    # 전체 데이터 다운로드 버튼
+    df = load_data()
+    if df is not None:
+        render_download(
+            df, "clinical_data_full", "📥 전체 데이터 엑셀 다운로드",
+            key="download_full_data", params=["full_data"]
+        )
+    
+    # 데이터 유효성 검사 결과
+    data_validation()
+
+
+def data_validation():
+    st.markdown('<div class="sub-header">데이터 유효성 검사</div>', unsafe_allow_html=True)
+    df, data_version = get_session_data()
+    if df is None:
+        st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        return
+    
+    # 유효성 검사 실행 (규칙이 바뀌면 이 결과만 다시 계산)
+    rules = get_validation_rules()
+    report = get_validation_report(df, data_version, rules_key(rules), rules)
+    invalid_visit, invalid_omics_tissue, invalid_project, duplicate_data, invalid_biologics = (
+        report[key] for key in ["invalid_visit", "invalid_omics_tissue", "invalid_project", "duplicate_data", "invalid_biologics"]
+    )
+    valid_df = report["valid"]
+    
+    # 유효성 검사 결과 요약
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        is_valid_visit = (len(invalid_visit) == 0)
+        st.markdown(
+            f"""
+            <div class="{'success-box' if is_valid_visit else 'error-box'}">
+                <h4>Visit 체크</h4>
+                <p>{'정상' if is_valid_visit else f'오류 발견 ({len(invalid_visit)}건)'}</p>
+                <p>{'모든 Visit 값이 V1-V5 범위 내에 있습니다' if is_valid_visit else f'{len(invalid_visit)}개 레코드에 문제가 있습니다.'}</p>
+            </div>
+            """, unsafe_allow_html=True
+        )
+        
+    with col2:
+        if invalid_omics_tissue is not None and not invalid_omics_tissue.empty:
+            is_valid_omics_tissue = False
+        else:
+            is_valid_omics_tissue = True
+        
+        st.markdown(
+            f"""
+            <div class="{'success-box' if is_valid_omics_tissue else 'error-box'}">
+                <h4>Omics-Tissue 체크</h4>
+                <p>{'정상' if is_valid_omics_tissue else f'오류 발견 ({len(invalid_omics_tissue)}건)'}</p>
+                <p>{'모든 Omics-Tissue 조합이 유효합니다' if is_valid_omics_tissue else f'{len(invalid_omics_tissue)}개 레코드에 문제가 있습니다.'}</p>
+            </div>
+            """, unsafe_allow_html=True
+        )
+        
+    with col3:
+        is_valid_project = (len(invalid_project) == 0)
+        st.markdown(
+            f"""
+            <div class="{'success-box' if is_valid_project else 'error-box'}">
+                <h4>Project 체크</h4>
+                <p>{'정상' if is_valid_project else f'오류 발견 ({len(invalid_project)}건)'}</p>
+                <p>{'모든 Project 값이 유효합니다' if is_valid_project else f'{len(invalid_project)}개 레코드에 문제가 있습니다.'}</p>
+            </div>
+            """, unsafe_allow_html=True
+        )
+
+    with col4:
+        is_valid_bioloigcis = (len(invalid_biologics) == 0)
+        st.markdown(
+            f"""
+            <div class="{'success-box' if is_valid_bioloigcis else 'error-box'}">
+                <h4>Biologics 체크</h4>
+                <p>{'정상' if is_valid_bioloigcis else f'오류 발견 ({len(invalid_biologics)}건)'}</p>
+                <p>{'모든 Biologics 값이 유효합니다' if is_valid_bioloigcis else f'{len(invalid_biologics)}개 레코드에 문제가 있습니다.'}</p>
+            </div>
+            """, unsafe_allow_html=True
+        )
+        
+    with col5:
+        is_valid_duplicate = (len(duplicate_data) == 0)
+        st.markdown(
+            f"""
+            <div class="{'success-box' if is_valid_duplicate else 'error-box'}">
+                <h4>중복 체크</h4>
+                <p>{'정상' if is_valid_duplicate else f'오류 발견 ({len(duplicate_data)}건)'}</p>
+                <p>{'중복 레코드가 없습니다' if is_valid_duplicate else f'{len(duplicate_data)}개 레코드가 중복되었습니다.'}</p>
+            </div>
+            """, unsafe_allow_html=True
+        )
+
+
+    # 추가 유효성 통계
+    col6, col7 = st.columns(2)
+    with col6:
+        total_records = len(df)
+        valid_records = len(valid_df) if valid_df is not None else 0
+        st.metric("유효한 레코드 / 전체 레코드", f"{valid_records} / {total_records}")
+    with col7:
+        valid_percent = (valid_records / total_records * 100) if total_records > 0 else 0
+        st.metric("데이터 유효성 비율", f"{valid_percent:.1f}%")
+    
+    # 상세 검사 결과 탭
+    st.markdown("### 상세 검사 결과")
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Visit 체크", "Omics-Tissue 체크", "Project 체크", "Biologics 체크", "중복 체크"])
+    
+    with tab1:
+        st.info(f"유효한 Visit 값: {', '.join(rules['visits'])}")
+        if len(invalid_visit) > 0:
+            st.dataframe(invalid_visit, use_container_width=True)
+        else:
+            st.success("모든 Visit 값이 유효합니다.")
+    
+    with tab2:
+        st.info("유효한 Omics-Tissue 조합:")
+        valid_combinations = []
+        for omics, tissues in rules["omics_tissue"].items():
+            for tissue in tissues:
+                valid_combinations.append({"Omics": omics, "Tissue": tissue})
+        st.dataframe(pd.DataFrame(valid_combinations), use_container_width=True)
+        
+        if invalid_omics_tissue is not None and not invalid_omics_tissue.empty:
+            st.error("유효하지 않은 Omics-Tissue 조합:")
+            st.dataframe(invalid_omics_tissue, use_container_width=True)
+        else:
+            st.success("모든 Omics-Tissue 조합이 유효합니다.")
+    
+    with tab3:
+        st.info(f"유효한 Project 값: {', '.join(rules['projects'])}")
+        if len(invalid_project) > 0:
+            st.dataframe(invalid_project, use_container_width=True)
+        else:
+            st.success("모든 Project 값이 유효합니다.")
+    
+    with tab4:
+        st.info(f"다음 프로젝트의 환자는 Biologics 값이 정확히 1개여야 합니다: {', '.join(rules['biologics_projects']) or '없음'}")
+        if len(invalid_biologics) > 0:
+            st.dataframe(invalid_biologics, use_container_width=True)
+        else:
+            st.success("모든 Biologics 값이 유효합니다.")
+    
+    with tab5:
+        st.info(f"동일한 ({', '.join(rules['duplicate_keys'])}) 조합은 중복입니다.")
+        if len(duplicate_data) > 0:
+            st.dataframe(duplicate_data, use_container_width=True)
+        else:
+            st.success("중복 레코드가 없습니다.")
@@ -0,0 +1,44 @@
+"""
+샘플 검색 페이지
+"""
+import time
+
+import streamlit as st
+
+from core.search import search_sample_index
+from views.common import build_search_index, load_data_with_version, render_paginated_table
+
+
+def view_sample_search():
+    st.markdown('<div class="main-header">샘플 검색</div>', unsafe_allow_html=True)
+
+    df, data_version = load_data_with_version()
+    if df is None or df.empty:
+        st.warning("데이터가 없습니다. 먼저 Excel 파일을 업로드해주세요.")
+        return
+
+    search_index = build_search_index(df, data_version)
+
+    col1, col2 = st.columns([3, 1])
+    query = col1.text_input("SampleID 또는 PatientID", key="sample_search_query")
+    search_mode = col2.selectbox(
+        "검색 방식",
+        options=["prefix", "exact", "contains"],
+        format_func=lambda x: {"prefix": "앞부분 일치", "exact": "완전 일치", "contains": "부분 일치"}[x],
+        key="sample_search_mode"
+    )
+    if not query.strip():
+        st.info("모든 프로젝트에서 SampleID/PatientID를 검색합니다.")
+        return
+
+    started = time.perf_counter()
+    rows = search_sample_index(search_index, query, mode=search_mode)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    st.caption(f"{len(rows):,}건 ({elapsed_ms:.1f} ms)")
+    if len(rows) == 0:
+        st.warning("검색 결과가 없습니다.")
+        return
+
+    result_df = df.iloc[rows][["Project", "PatientID", "Biologics", "Visit", "Omics", "Tissue", "SampleID", "Date"]]
+    render_paginated_table(result_df, key="sample_search_result")